@@ -1,68 +1,147 @@
-from ._types import (
-    Method as Method,
-    ModelInfo as ModelInfo,
-    MethodInfo as MethodInfo,
-    RenderOutput as RenderOutput,
-    RenderOutputType as RenderOutputType,
-    RenderOptions as RenderOptions,
-    OptimizeEmbeddingOutput as OptimizeEmbeddingOutput,
-    Cameras as Cameras,
-    ColorSpace as ColorSpace,
-    CameraModel as CameraModel,
-    DatasetFeature as DatasetFeature,
-    camera_model_to_int as camera_model_to_int,
-    camera_model_from_int as camera_model_from_int,
-    GenericCameras as GenericCameras,
-    Cameras as Cameras,
-    new_cameras as new_cameras,
-    UnloadedDataset as UnloadedDataset,
-    Dataset as Dataset,
-    EvaluationProtocol as EvaluationProtocol,
-    LicenseSpec as LicenseSpec,
-    DatasetLoaderSpec as DatasetLoaderSpec,
-    DatasetSpecMetadata as DatasetSpecMetadata,
-    LoadDatasetFunction as LoadDatasetFunction,
-    DownloadDatasetFunction as DownloadDatasetFunction,
-    TrajectoryFrameAppearance as TrajectoryFrameAppearance,
-    TrajectoryFrame as TrajectoryFrame,
-    TrajectoryKeyframe as TrajectoryKeyframe,
-    TrajectoryInterpolationType as TrajectoryInterpolationType,
-    ImageSetInterpolationSource as ImageSetInterpolationSource,
-    KochanekBartelsInterpolationSource as KochanekBartelsInterpolationSource,
-    TrajectoryInterpolationSource as TrajectoryInterpolationSource,
-    Trajectory as Trajectory,
-    LoggerEvent as LoggerEvent,
-    Logger as Logger,
-    OutputArtifact as OutputArtifact,
-    ImplementationStatus as ImplementationStatus,
-    MethodSpec as MethodSpec,
-    DatasetSpec as DatasetSpec,
-    LoggerSpec as LoggerSpec,
-    EvaluationProtocolSpec as EvaluationProtocolSpec,
-    BackendName as BackendName,
-    DatasetNotFoundError as DatasetNotFoundError,
-    new_dataset as new_dataset,
-)
+from typing import TYPE_CHECKING
 from ._constants import (
     NB_PREFIX as NB_PREFIX,
 )
-from ._registry import (
-    register as register,
-    get_method_spec as get_method_spec,
-    get_dataset_spec as get_dataset_spec,
-    get_logger_spec as get_logger_spec,
-    get_evaluation_protocol_spec as get_evaluation_protocol_spec,
-    get_dataset_loader_spec as get_dataset_loader_spec,
-    get_supported_methods as get_supported_methods,
-    get_supported_datasets as get_supported_datasets,
-    get_supported_loggers as get_supported_loggers,
-    get_supported_evaluation_protocols as get_supported_evaluation_protocols,
-    get_supported_dataset_loaders as get_supported_dataset_loaders,
-)
-from ._method_utils import (
-    build_method_class as build_method_class,
-    load_checkpoint as load_checkpoint,
-)
 
 # We require the __version__ import - the package needs to be installed
 from ._version import __version__  # noqa
+
+
+# Public names are resolved lazily (PEP 562) so that `import nerfbaselines`
+# does not pull in numpy and the method registry.
+_LAZY_ATTRIBUTES = {
+    "Method": "._types",
+    "ModelInfo": "._types",
+    "MethodInfo": "._types",
+    "RenderOutput": "._types",
+    "RenderOutputType": "._types",
+    "RenderOptions": "._types",
+    "OptimizeEmbeddingOutput": "._types",
+    "Cameras": "._types",
+    "ColorSpace": "._types",
+    "CameraModel": "._types",
+    "DatasetFeature": "._types",
+    "camera_model_to_int": "._types",
+    "camera_model_from_int": "._types",
+    "GenericCameras": "._types",
+    "new_cameras": "._types",
+    "UnloadedDataset": "._types",
+    "Dataset": "._types",
+    "EvaluationProtocol": "._types",
+    "LicenseSpec": "._types",
+    "DatasetLoaderSpec": "._types",
+    "DatasetSpecMetadata": "._types",
+    "LoadDatasetFunction": "._types",
+    "DownloadDatasetFunction": "._types",
+    "TrajectoryFrameAppearance": "._types",
+    "TrajectoryFrame": "._types",
+    "TrajectoryKeyframe": "._types",
+    "TrajectoryInterpolationType": "._types",
+    "ImageSetInterpolationSource": "._types",
+    "KochanekBartelsInterpolationSource": "._types",
+    "TrajectoryInterpolationSource": "._types",
+    "Trajectory": "._types",
+    "LoggerEvent": "._types",
+    "Logger": "._types",
+    "OutputArtifact": "._types",
+    "ImplementationStatus": "._types",
+    "MethodSpec": "._types",
+    "DatasetSpec": "._types",
+    "LoggerSpec": "._types",
+    "EvaluationProtocolSpec": "._types",
+    "BackendName": "._types",
+    "DatasetNotFoundError": "._types",
+    "new_dataset": "._types",
+    "register": "._registry",
+    "get_method_spec": "._registry",
+    "get_dataset_spec": "._registry",
+    "get_logger_spec": "._registry",
+    "get_evaluation_protocol_spec": "._registry",
+    "get_dataset_loader_spec": "._registry",
+    "get_supported_methods": "._registry",
+    "get_supported_datasets": "._registry",
+    "get_supported_loggers": "._registry",
+    "get_supported_evaluation_protocols": "._registry",
+    "get_supported_dataset_loaders": "._registry",
+    "build_method_class": "._method_utils",
+    "load_checkpoint": "._method_utils",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(_LAZY_ATTRIBUTES.keys()))
+
+
+if TYPE_CHECKING:
+    from ._types import (
+        Method as Method,
+        ModelInfo as ModelInfo,
+        MethodInfo as MethodInfo,
+        RenderOutput as RenderOutput,
+        RenderOutputType as RenderOutputType,
+        RenderOptions as RenderOptions,
+        OptimizeEmbeddingOutput as OptimizeEmbeddingOutput,
+        Cameras as Cameras,
+        ColorSpace as ColorSpace,
+        CameraModel as CameraModel,
+        DatasetFeature as DatasetFeature,
+        camera_model_to_int as camera_model_to_int,
+        camera_model_from_int as camera_model_from_int,
+        GenericCameras as GenericCameras,
+        Cameras as Cameras,
+        new_cameras as new_cameras,
+        UnloadedDataset as UnloadedDataset,
+        Dataset as Dataset,
+        EvaluationProtocol as EvaluationProtocol,
+        LicenseSpec as LicenseSpec,
+        DatasetLoaderSpec as DatasetLoaderSpec,
+        DatasetSpecMetadata as DatasetSpecMetadata,
+        LoadDatasetFunction as LoadDatasetFunction,
+        DownloadDatasetFunction as DownloadDatasetFunction,
+        TrajectoryFrameAppearance as TrajectoryFrameAppearance,
+        TrajectoryFrame as TrajectoryFrame,
+        TrajectoryKeyframe as TrajectoryKeyframe,
+        TrajectoryInterpolationType as TrajectoryInterpolationType,
+        ImageSetInterpolationSource as ImageSetInterpolationSource,
+        KochanekBartelsInterpolationSource as KochanekBartelsInterpolationSource,
+        TrajectoryInterpolationSource as TrajectoryInterpolationSource,
+        Trajectory as Trajectory,
+        LoggerEvent as LoggerEvent,
+        Logger as Logger,
+        OutputArtifact as OutputArtifact,
+        ImplementationStatus as ImplementationStatus,
+        MethodSpec as MethodSpec,
+        DatasetSpec as DatasetSpec,
+        LoggerSpec as LoggerSpec,
+        EvaluationProtocolSpec as EvaluationProtocolSpec,
+        BackendName as BackendName,
+        DatasetNotFoundError as DatasetNotFoundError,
+        new_dataset as new_dataset,
+    )
+    from ._registry import (
+        register as register,
+        get_method_spec as get_method_spec,
+        get_dataset_spec as get_dataset_spec,
+        get_logger_spec as get_logger_spec,
+        get_evaluation_protocol_spec as get_evaluation_protocol_spec,
+        get_dataset_loader_spec as get_dataset_loader_spec,
+        get_supported_methods as get_supported_methods,
+        get_supported_datasets as get_supported_datasets,
+        get_supported_loggers as get_supported_loggers,
+        get_supported_evaluation_protocols as get_supported_evaluation_protocols,
+        get_supported_dataset_loaders as get_supported_dataset_loaders,
+    )
+    from ._method_utils import (
+        build_method_class as build_method_class,
+        load_checkpoint as load_checkpoint,
+    )
@@ -6,16 +6,13 @@ import inspect
 import os
 import importlib
 import contextlib
-from typing import Optional, Dict, List, cast, Union, TypeVar, FrozenSet
+import json
+from typing import Optional, Dict, List, cast, Union, TypeVar, FrozenSet, Any
 from . import MethodSpec, DatasetSpec, EvaluationProtocolSpec, BackendName, LoggerSpec, DatasetLoaderSpec
 try:
     from typing import Literal
 except ImportError:
     from typing_extensions import Literal
-if sys.version_info < (3, 10):
-    from importlib_metadata import entry_points
-else:
-    from importlib.metadata import entry_points
 
 T = TypeVar("T")
 METHOD_SPECS_PATH = os.path.join(os.path.expanduser("~/.config/nerfbaselines/specs"))
@@ -120,6 +117,15 @@ def _load_specs_from_environment() -> List[MethodSpec]:
     return output
 
 
+def entry_points(group: str):
+    # importlib.metadata is slow to import, we only load it when needed
+    if sys.version_info < (3, 10):
+        from importlib_metadata import entry_points as _entry_points
+    else:
+        from importlib.metadata import entry_points as _entry_points
+    return _entry_points(group=group)
+
+
 def _load_specs_from_entrypoints() -> List[MethodSpec]:
     output = []
     discovered_entry_points = entry_points(group="nerfbaselines.specs")
@@ -206,39 +212,164 @@ def _is_registered(spec):
         raise ValueError(f"Could not determine type of object {spec}")
 
 
+_REGISTRY_INDEX_VERSION = 1
+
+
+def _get_registry_index_path() -> Optional[str]:
+    # An empty string disables the cache
+    from ._constants import NB_PREFIX
+    path = os.environ.get("NERFBASELINES_REGISTRY_CACHE", os.path.join(NB_PREFIX, "registry-index.json"))
+    return path or None
+
+
+def _get_registry_fingerprint() -> Dict[str, Any]:
+    """
+    Returns a cheap-to-compute fingerprint of all registry sources. If the fingerprint
+    does not change, the specs do not have to be executed again.
+    """
+    from . import __version__
+
+    def stat_files(path, suffix):
+        if not os.path.isdir(path):
+            return []
+        out = []
+        for file in sorted(os.listdir(path)):
+            if file.endswith(suffix):
+                stat = os.stat(os.path.join(path, file))
+                out.append([file, stat.st_size, stat.st_mtime_ns])
+        return out
+
+    def stat_file(path):
+        if not os.path.isfile(path):
+            return [path, None, None]
+        stat = os.stat(path)
+        return [path, stat.st_size, stat.st_mtime_ns]
+
+    nb_path = os.path.dirname(os.path.abspath(__file__))
+    separator = ";" if os.name == "nt" else ":"
+    discovered_entry_points = entry_points(group="nerfbaselines.specs")
+    return {
+        "index_version": _REGISTRY_INDEX_VERSION,
+        "nerfbaselines_version": __version__,
+        "python": list(sys.version_info[:2]),
+        "nerfbaselines_path": nb_path,
+        "methods": stat_files(os.path.join(nb_path, "methods"), "_spec.py"),
+        "datasets": stat_files(os.path.join(nb_path, "datasets"), "_spec.py"),
+        "environment": [stat_file(x.strip()) for x in os.environ.get("NERFBASELINES_REGISTER", "").split(separator) if x.strip()],
+        "entrypoints": sorted([
+            ep.name, ep.value, getattr(getattr(ep, "dist", None), "version", None)
+        ] for ep in discovered_entry_points),
+        "local": [METHOD_SPECS_PATH] + stat_files(METHOD_SPECS_PATH, ".py"),
+    }
+
+
+def _encode_index_value(value):
+    # JSON does not distinguish lists and tuples, we preserve tuples
+    if isinstance(value, tuple):
+        return {"@tuple": [_encode_index_value(x) for x in value]}
+    if isinstance(value, list):
+        return [_encode_index_value(x) for x in value]
+    if isinstance(value, dict):
+        return {k: _encode_index_value(v) for k, v in value.items()}
+    return value
+
+
+def _decode_index_object(value):
+    if len(value) == 1 and "@tuple" in value:
+        return tuple(value["@tuple"])
+    return value
+
+
+def _load_registry_index(fingerprint) -> Optional[Dict[str, List[AnySpec]]]:
+    path = _get_registry_index_path()
+    if path is None or not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf8") as f:
+            index = json.load(f, object_hook=_decode_index_object)
+        if index.get("fingerprint") != fingerprint:
+            return None
+        return index["specs"]
+    except Exception as e:
+        logging.debug(f"Could not load registry index {path}: {e}")
+        return None
+
+
+def _save_registry_index(fingerprint, specs: Dict[str, List[AnySpec]]) -> None:
+    path = _get_registry_index_path()
+    if path is None:
+        return
+    index = {"fingerprint": fingerprint, "specs": specs}
+    try:
+        # Only cache specs which survive the JSON round-trip unchanged
+        data = json.dumps(_encode_index_value(index), indent=1)
+        if json.loads(data, object_hook=_decode_index_object) != index:
+            logging.debug("Not caching the registry index, specs are not JSON serializable")
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        logging.debug(f"Could not save registry index {path}: {e}")
+
+
+def _load_builtin_specs() -> List[AnySpec]:
+    global _registration_fastpath
+    nb_path = os.path.dirname(os.path.abspath(__file__))
+
+    assert __package__ is not None, "Package must be set"
+    output: List[AnySpec] = []
+    with collect_register_calls(output):
+        try:
+            # Method registration
+            _registration_fastpath = __package__ + ".methods"
+            for package in sorted(os.listdir(os.path.join(nb_path, "methods"))):
+                if package.endswith("_spec.py") and not package.startswith("_"):
+                    package = package[:-3]
+                    module_spec = importlib.util.find_spec(f"nerfbaselines.methods.{package}", __package__)
+                    assert module_spec is not None and module_spec.loader is not None, f"Could not find spec for {package}"
+                    cfg = importlib.util.module_from_spec(module_spec)
+                    module_spec.loader.exec_module(cfg)
+
+            # Dataset registration
+            _registration_fastpath = __package__ + ".datasets"
+            for package in sorted(os.listdir(os.path.join(nb_path, "datasets"))):
+                if package.endswith("_spec.py") and not package.startswith("_"):
+                    package = package[:-3]
+                    module_spec = importlib.util.find_spec(f"nerfbaselines.datasets.{package}", __package__)
+                    assert module_spec is not None and module_spec.loader is not None, f"Could not find spec for {package}"
+                    cfg = importlib.util.module_from_spec(module_spec)
+                    module_spec.loader.exec_module(cfg)
+        finally:
+            # Reset the fastpath since we will be loading modules dynamically now
+            _registration_fastpath = None
+    return output
+
+
 def _auto_register(force=False):
     global _auto_register_completed
-    global _registration_fastpath
     if _auto_register_completed and not force:
         return
-    nb_path = os.path.dirname(os.path.abspath(__file__))
 
-    assert __package__ is not None, "Package must be set"
-    # Method registration
-    _registration_fastpath = __package__ + ".methods"
-    for package in os.listdir(os.path.join(nb_path, "methods")):
-        if package.endswith("_spec.py") and not package.startswith("_"):
-            package = package[:-3]
-            module_spec = importlib.util.find_spec(f"nerfbaselines.methods.{package}", __package__)
-            assert module_spec is not None and module_spec.loader is not None, f"Could not find spec for {package}"
-            cfg = importlib.util.module_from_spec(module_spec)
-            module_spec.loader.exec_module(cfg)
-
-    # Dataset registration
-    _registration_fastpath = __package__ + ".datasets"
-    for package in os.listdir(os.path.join(nb_path, "datasets")):
-        if package.endswith("_spec.py") and not package.startswith("_"):
-            package = package[:-3]
-            module_spec = importlib.util.find_spec(f"nerfbaselines.datasets.{package}", __package__)
-            assert module_spec is not None and module_spec.loader is not None, f"Could not find spec for {package}"
-            cfg = importlib.util.module_from_spec(module_spec)
-            module_spec.loader.exec_module(cfg)
-
-    # Reset the fastpath since we will be loading modules dynamically now
-    _registration_fastpath = None
+    # The specs are cached in a registry index, which is invalidated
+    # when any of the sources change. With a valid index, no spec
+    # modules have to be executed.
+    fingerprint = _get_registry_fingerprint()
+    specs = _load_registry_index(fingerprint)
+    if specs is None:
+        specs = {
+            "builtin": _load_builtin_specs(),
+            "external": _discover_specs(),
+        }
+        _save_registry_index(fingerprint, specs)
+
+    for spec in specs["builtin"]:
+        register(spec)
 
     # Register all external methods
-    for spec in _discover_specs():
+    for spec in specs["external"]:
         if _is_registered(spec):
             logging.warning(f"Skipping registration of {spec['id']} as it would overwrite an existing NerfBaselines object")
             continue
@@ -0,0 +1,356 @@
+"""
+Vectorized Kochanek-Bartels splines used to interpolate camera paths.
+
+The curves are equivalent to ``splines.KochanekBartels`` and
+``splines.quaternion.KochanekBartels`` (with the uniform grid), but all
+parameter values are evaluated in a single NumPy pass. Quaternions use
+the ``wxyz`` convention (scalar first).
+"""
+from typing import Optional, Tuple, Dict, Any
+import numpy as np
+
+
+def quaternion_multiply(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    aw, ax, ay, az = np.moveaxis(a, -1, 0)
+    bw, bx, by, bz = np.moveaxis(b, -1, 0)
+    return np.stack([
+        aw*bw - ax*bx - ay*by - az*bz,
+        aw*bx + ax*bw + ay*bz - az*by,
+        aw*by - ax*bz + ay*bw + az*bx,
+        aw*bz + ax*by - ay*bx + az*bw,
+    ], -1)
+
+
+def quaternion_conjugate(q: np.ndarray) -> np.ndarray:
+    return q * np.array([1, -1, -1, -1], dtype=q.dtype)
+
+
+def quaternion_log(q: np.ndarray) -> np.ndarray:
+    """Logarithmic map from unit quaternions to the tangent space at the identity (R^3)."""
+    w = q[..., 0]
+    norm = np.sqrt(np.maximum(1 - w**2, 0))
+    half_angle = np.arccos(np.clip(w, -1.0, 1.0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = q[..., 1:] / norm[..., None] * half_angle[..., None]
+    return np.where((w >= 1)[..., None], 0.0, out)
+
+
+def quaternion_exp(v: np.ndarray) -> np.ndarray:
+    """Exponential map from R^3 to unit quaternions (inverse of :func:`quaternion_log`)."""
+    norm = np.linalg.norm(v, axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        s = np.where(norm == 0, 0.0, np.sin(norm) / norm)
+    return np.concatenate([np.cos(norm)[..., None], s[..., None] * v], -1)
+
+
+def quaternion_power(q: np.ndarray, alpha) -> np.ndarray:
+    out = quaternion_exp(np.asarray(alpha)[..., None] * quaternion_log(q))
+    return np.where((np.abs(q[..., :1]) >= 1), q, out)
+
+
+def quaternion_slerp(one: np.ndarray, two: np.ndarray, t) -> np.ndarray:
+    """Spherical linear interpolation between quaternions ``one`` and ``two``."""
+    return quaternion_multiply(quaternion_power(quaternion_multiply(two, quaternion_conjugate(one)), t), one)
+
+
+def quaternion_canonicalize(quaternions: np.ndarray) -> np.ndarray:
+    """Flips the signs of a sequence of quaternions such that consecutive quaternions have a non-negative dot product."""
+    dots = np.concatenate([quaternions[:1, 0], np.sum(quaternions[1:] * quaternions[:-1], -1)])
+    signs = np.cumprod(np.where(dots < 0, -1.0, 1.0))
+    return quaternions * signs[:, None]
+
+
+def quaternion_to_rotation_matrix(q: np.ndarray) -> np.ndarray:
+    w, x, y, z = np.moveaxis(q, -1, 0)
+    return np.stack([
+        np.stack([1 - 2 * y**2 - 2 * z**2, 2 * x * y - 2 * w * z, 2 * z * x + 2 * w * y], -1),
+        np.stack([2 * x * y + 2 * w * z, 1 - 2 * x**2 - 2 * z**2, 2 * y * z - 2 * w * x], -1),
+        np.stack([2 * z * x - 2 * w * y, 2 * y * z + 2 * w * x, 1 - 2 * x**2 - 2 * y**2], -1),
+    ], -2)
+
+
+def rotation_matrix_to_quaternion(R: np.ndarray) -> np.ndarray:
+    """Batched version of ``rotmat2qvec`` (the scalar part of the output is non-negative)."""
+    Rxx, Ryx, Rzx = R[..., 0, 0], R[..., 0, 1], R[..., 0, 2]
+    Rxy, Ryy, Rzy = R[..., 1, 0], R[..., 1, 1], R[..., 1, 2]
+    Rxz, Ryz, Rzz = R[..., 2, 0], R[..., 2, 1], R[..., 2, 2]
+    zero = np.zeros_like(Rxx)
+    K = np.stack([
+        np.stack([Rxx - Ryy - Rzz, zero, zero, zero], -1),
+        np.stack([Ryx + Rxy, Ryy - Rxx - Rzz, zero, zero], -1),
+        np.stack([Rzx + Rxz, Rzy + Ryz, Rzz - Rxx - Ryy, zero], -1),
+        np.stack([Ryz - Rzy, Rzx - Rxz, Rxy - Ryx, Rxx + Ryy + Rzz], -1),
+    ], -2) / 3.0
+    eigvals, eigvecs = np.linalg.eigh(K)
+    qvec = np.take_along_axis(eigvecs, np.argmax(eigvals, -1)[..., None, None], -1)[..., 0]
+    qvec = qvec[..., [3, 0, 1, 2]]
+    return qvec * np.where(qvec[..., :1] < 0, -1.0, 1.0)
+
+
+def _tcb_weights(tcb):
+    T, C, B = tcb
+    a = (1 - T) * (1 + C) * (1 + B)
+    b = (1 - T) * (1 - C) * (1 - B)
+    c = (1 - T) * (1 - C) * (1 + B)
+    d = (1 - T) * (1 + C) * (1 - B)
+    return a, b, c, d
+
+
+def _segment_index(t: np.ndarray, num_segments: int) -> Tuple[np.ndarray, np.ndarray]:
+    # Uniform grid, the last value belongs to the last segment
+    if np.any(t < 0) or np.any(t > num_segments):
+        raise ValueError(f"Parameter values must be in the range [0, {num_segments}]")
+    index = np.minimum(np.floor(t).astype(np.int64), num_segments - 1)
+    return index, t - index
+
+
+class KochanekBartelsSpline:
+    """
+    Kochanek-Bartels spline through a sequence of vertices (vectors or unit quaternions)
+    parametrized by a uniform grid (vertex ``i`` is at ``t=i``).
+
+    The spline supports incremental updates: :meth:`update` returns the indices
+    of the segments affected by the changed vertices, so that only the values
+    in these segments need to be re-evaluated.
+
+    Args:
+        vertices: Array of vertices [N, D]. For rotation splines, the vertices are unit quaternions (wxyz).
+        tcb: Tension, continuity and bias.
+        closed: Whether the curve is closed (the first vertex is re-used as the last one).
+        rotation: Whether the vertices are rotations (unit quaternions).
+    """
+    def __init__(self, vertices: np.ndarray, *, tcb=(0.0, 0.0, 0.0), closed: bool = False, rotation: bool = False):
+        self.tcb = tuple(float(x) for x in tcb)
+        self.closed = closed
+        self.rotation = rotation
+        self.vertices = np.array(vertices, dtype=np.float64)
+        if len(self.vertices) < 2:
+            raise ValueError("At least two vertices are required")
+        self.control_points = self._compute_control_points(self._prepare_vertices(self.vertices))
+
+    @property
+    def num_segments(self) -> int:
+        return len(self.vertices) if self.closed else len(self.vertices) - 1
+
+    def _prepare_vertices(self, vertices):
+        if self.closed:
+            vertices = np.concatenate([vertices, vertices[:1]], 0)
+        if self.rotation:
+            vertices = quaternion_canonicalize(vertices)
+        return vertices
+
+    def _compute_control_points(self, vertices):
+        """Returns control points [num_segments, 4, D] in the Bezier form (for rotations) or the Hermite form (x0, x1, v0, v1)."""
+        n = len(vertices)
+        if self.closed:
+            # Vertices already contain the first vertex at the end
+            prefix, suffix = vertices[-2], vertices[1]
+            if self.rotation:
+                if np.dot(prefix, vertices[0]) < 0:
+                    prefix = -prefix
+                if np.dot(vertices[-1], suffix) < 0:
+                    suffix = -suffix
+            padded = np.concatenate([prefix[None], vertices, suffix[None]], 0)
+            centers = np.arange(1, n + 1)
+        else:
+            padded = vertices
+            centers = np.arange(1, n - 1)
+        x_1, x0, x1 = padded[centers - 1], padded[centers], padded[centers + 1]
+        a, b, c, d = _tcb_weights(self.tcb)
+
+        if not self.rotation:
+            # Uniform grid, all deltas are 1
+            v_1 = x0 - x_1
+            v0 = x1 - x0
+            incoming = (c * v_1 + d * v0) / 2
+            outgoing = (a * v_1 + b * v0) / 2
+            if self.closed:
+                # Segment i uses the outgoing tangent of vertex i and the incoming tangent of vertex i + 1
+                starts, ends = outgoing[:-1], incoming[1:]
+            elif n == 2:
+                starts = ends = (vertices[1:] - vertices[:1])
+            else:
+                start = 3 * (vertices[1] - vertices[0]) / 2 - incoming[0] / 2
+                end = 3 * (vertices[-1] - vertices[-2]) / 2 - outgoing[-1] / 2
+                starts = np.concatenate([start[None], outgoing], 0)
+                ends = np.concatenate([incoming, end[None]], 0)
+            return np.stack([vertices[:-1], vertices[1:], starts, ends], 1)
+
+        q_in = quaternion_multiply(x0, quaternion_conjugate(x_1))
+        q_out = quaternion_multiply(x1, quaternion_conjugate(x0))
+        rho_in = quaternion_log(q_in)
+        rho_out = quaternion_log(q_out)
+        before = quaternion_multiply(quaternion_exp(-(c * rho_in + d * rho_out) / 2 / 3), x0)
+        after = quaternion_multiply(quaternion_exp((a * rho_in + b * rho_out) / 2 / 3), x0)
+        if self.closed:
+            # Segment i: [q_i, after_i, before_{i+1}, q_{i+1}]
+            afters, befores = after[:-1], before[1:]
+        elif n == 2:
+            offset = quaternion_power(quaternion_multiply(vertices[1], quaternion_conjugate(vertices[0])), 1 / 3)
+            afters = quaternion_multiply(offset, vertices[0])[None]
+            befores = quaternion_multiply(quaternion_conjugate(offset), vertices[1])[None]
+        else:
+            # Natural end conditions (as implemented in the splines package)
+            start = quaternion_multiply(quaternion_power(quaternion_multiply(vertices[1], quaternion_conjugate(vertices[0])), 0.5), vertices[0])
+            end = quaternion_multiply(quaternion_power(quaternion_multiply(vertices[-2], quaternion_conjugate(vertices[-1])), 0.5), vertices[-1])
+            afters = np.concatenate([start[None], after], 0)
+            befores = np.concatenate([before, end[None]], 0)
+        return np.stack([vertices[:-1], afters, befores, vertices[1:]], 1)
+
+    def update(self, vertices: np.ndarray) -> np.ndarray:
+        """
+        Updates the vertices of the spline (the number of vertices must stay the same).
+
+        Returns:
+            Sorted indices of the segments which changed.
+        """
+        vertices = np.array(vertices, dtype=np.float64)
+        if vertices.shape != self.vertices.shape:
+            raise ValueError("The number of vertices cannot change in an incremental update")
+        self.vertices = vertices
+        # Recomputing the control points is O(N) and cheap compared to the
+        # evaluation, only the segments with changed control points are reported.
+        control_points = self._compute_control_points(self._prepare_vertices(vertices))
+        segments = np.nonzero(np.any(control_points != self.control_points, axis=(1, 2)))[0]
+        self.control_points = control_points
+        return segments
+
+    def evaluate(self, t) -> np.ndarray:
+        """
+        Evaluates the spline at parameter values ``t`` (in the range [0, num_segments]).
+        """
+        t = np.asarray(t, dtype=np.float64)
+        index, u = _segment_index(t, self.num_segments)
+        cp = self.control_points[index]
+        if not self.rotation:
+            x0, x1, v0, v1 = np.moveaxis(cp, 1, 0)
+            u = u[..., None]
+            u2, u3 = u * u, u * u * u
+            return ((2 * u3 - 3 * u2 + 1) * x0 +
+                    (-2 * u3 + 3 * u2) * x1 +
+                    (u3 - 2 * u2 + u) * v0 +
+                    (u3 - u2) * v1)
+
+        # De Casteljau's algorithm with slerp
+        points = [cp[..., i, :] for i in range(4)]
+        while len(points) > 2:
+            points = [quaternion_slerp(one, two, u) for one, two in zip(points, points[1:])]
+        return quaternion_slerp(points[0], points[1], u)
+
+
+def _get_spline_times(transition_durations: np.ndarray, is_cycle: bool, framerate: float) -> Optional[np.ndarray]:
+    from scipy import interpolate
+
+    # Compute transition times cumsum
+    times = np.asarray(transition_durations, dtype=np.float32)
+    transition_times_cumsum = np.cumsum(np.roll(times, -1)) if is_cycle else np.cumsum(times[:-1])
+    transition_times_cumsum = np.insert(transition_times_cumsum, 0, 0.0)
+
+    num_frames = int(transition_times_cumsum[-1] * framerate)
+    if num_frames <= 0:
+        return None
+
+    # Get time splines
+    spline_indices = np.arange(transition_times_cumsum.shape[0])
+    gtime = np.linspace(0, transition_times_cumsum[-1], num_frames)
+    if is_cycle:
+        # In the case of a loop, we pad the spline to match the start/end
+        # slopes.
+        interpolator = interpolate.PchipInterpolator(
+            x=np.concatenate(
+                [
+                    [-(transition_times_cumsum[-1] - transition_times_cumsum[-2])],
+                    transition_times_cumsum,
+                    transition_times_cumsum[-1:] + transition_times_cumsum[1:2],
+                ],
+                axis=0,
+            ),
+            y=np.concatenate([[-1], spline_indices, [spline_indices[-1] + 1]], axis=0),
+        )
+    else:
+        interpolator = interpolate.PchipInterpolator(x=transition_times_cumsum, y=spline_indices)
+    return np.clip(interpolator(gtime), 0, spline_indices[-1])
+
+
+class KochanekBartelsCameraPath:
+    """
+    Interpolates camera keyframes (positions, wxyz rotations, fovs and appearance weights)
+    using Kochanek-Bartels splines.
+
+    The object keeps the last result. When only the keyframe values change
+    (e.g., a keyframe is moved in the viewer), only the frames in the affected
+    spline segments are re-evaluated.
+    """
+    def __init__(self):
+        self._state: Optional[Dict[str, Any]] = None
+
+    def __call__(self,
+                 positions: np.ndarray,
+                 wxyz: np.ndarray,
+                 fovs: np.ndarray,
+                 transition_durations: np.ndarray, *,
+                 tension: float = 0.0,
+                 is_cycle: bool = False,
+                 framerate: float = 30.0) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Args:
+            positions: Keyframe positions [N, 3].
+            wxyz: Keyframe rotations as unit quaternions [N, 4].
+            fovs: Keyframe fovs [N].
+            transition_durations: Transition duration after each keyframe [N].
+            tension: Tension of the spline.
+            is_cycle: Whether the camera path is closed.
+            framerate: Frames per second.
+
+        Returns:
+            A tuple (positions, wxyz, fovs, weights) with the values for all frames,
+            where weights are the keyframe (appearance) interpolation weights [F, N],
+            or None if there are no frames.
+        """
+        num_keyframes = len(positions)
+        if num_keyframes < 2:
+            self._state = None
+            return None
+        values = np.concatenate([
+            np.asarray(positions, dtype=np.float64).reshape(num_keyframes, 3),
+            np.asarray(fovs, dtype=np.float64).reshape(num_keyframes, 1),
+            np.eye(num_keyframes, dtype=np.float64),
+        ], -1)
+        wxyz = np.asarray(wxyz, dtype=np.float64).reshape(num_keyframes, 4)
+        key = (num_keyframes, float(tension), bool(is_cycle), float(framerate), np.asarray(transition_durations, dtype=np.float32).tobytes())
+        state = self._state
+        if state is not None and state["key"] == key:
+            if state["times"] is None:
+                return None
+            changed = np.union1d(state["values"].update(values), state["rotations"].update(wxyz))
+            if len(changed) > 0:
+                mask = np.isin(state["segments"], changed)
+                state["outputs"][0][mask] = state["values"].evaluate(state["times"][mask])
+                state["outputs"][1][mask] = state["rotations"].evaluate(state["times"][mask])
+            return self._format_outputs(state["outputs"])
+
+        times = _get_spline_times(np.asarray(transition_durations), is_cycle, framerate)
+        tcb = (tension, 0.0, 0.0)
+        state = self._state = {
+            "key": key,
+            "times": times,
+            "values": KochanekBartelsSpline(values, tcb=tcb, closed=is_cycle),
+            "rotations": KochanekBartelsSpline(wxyz, tcb=tcb, closed=is_cycle, rotation=True),
+        }
+        if times is None:
+            return None
+        state["segments"] = _segment_index(times, state["values"].num_segments)[0]
+        state["outputs"] = (state["values"].evaluate(times), state["rotations"].evaluate(times))
+        return self._format_outputs(state["outputs"])
+
+    @staticmethod
+    def _format_outputs(outputs):
+        values, rotations = outputs
+        return (values[:, :3].copy(), rotations.copy(), values[:, 3].copy(), values[:, 4:].copy())
+
+
+def interpolate_kochanek_bartels_camera_path(positions, wxyz, fovs, transition_durations, *, tension=0.0, is_cycle=False, framerate=30.0):
+    """
+    Interpolates camera keyframes using Kochanek-Bartels splines. See :class:`KochanekBartelsCameraPath`.
+    """
+    return KochanekBartelsCameraPath()(positions, wxyz, fovs, transition_durations, tension=tension, is_cycle=is_cycle, framerate=framerate)
@@ -295,7 +295,7 @@ class UnloadedDataset(_IncompleteDataset):
 
 
 class Dataset(_IncompleteDataset):
-    images: Union[np.ndarray, List[np.ndarray]]  # [N][H, W, 3]
+    images: Union[np.ndarray, List[np.ndarray], Sequence[np.ndarray]]  # [N][H, W, 3] (Sequence for lazily loaded images)
 
 
 @overload
@@ -1,5 +1,7 @@
 import sys
-from typing import Tuple, Dict, cast, Any, TYPE_CHECKING, Optional
+import threading
+from collections import OrderedDict
+from typing import Tuple, Dict, List, cast, Any, TYPE_CHECKING, Optional
 import numpy as np
 from .utils import padded_stack, convert_image_dtype
 from . import CameraModel, camera_model_to_int, Cameras, GenericCameras
@@ -43,7 +45,7 @@ class _DistortionFunction(Protocol):
         ...
 
 
-def _iterative_undistortion(distortion: _DistortionFunction, uv: TTensor, params: TTensor, num_iterations: int = 100, **kwargs) -> TTensor:
+def _iterative_undistortion(distortion: _DistortionFunction, uv: TTensor, params: TTensor, num_iterations: int = 100, compaction_interval: Optional[int] = 5, **kwargs) -> TTensor:
     xnp = _get_xnp(uv) if TYPE_CHECKING else kwargs["xnp"]
     # Source: https://github.com/colmap/colmap/blob/a6352b20a04ff8b426e9f591c31f5c3e8a46fa3f/src/colmap/sensor/models.h#L547
     # Parameters for Newton iteration using numerical differentiation with
@@ -57,8 +59,20 @@ def _iterative_undistortion(distortion: _DistortionFunction, uv: TTensor, params
     new_uv_shape = tuple(map(max, uv.shape[:-1], params.shape[:-1])) + (2,)
     if uv.shape != new_uv_shape:
         uv = xnp.broadcast_to(uv, new_uv_shape)
-    x = _xnp_copy(uv, xnp=xnp)
-    # xout, mask = x, None
+
+    # We flatten the points, such that unconverged points can be selected
+    # Params can be broadcastable to uv. If there is a single set of params,
+    # we keep it that way so that we do not expand used memory.
+    uv = xnp.reshape(uv, (-1, 2))
+    if int(np.prod(params.shape[:-1])) == 1:
+        params = xnp.reshape(params, (1, params.shape[-1]))
+    else:
+        params = xnp.reshape(xnp.broadcast_to(params, new_uv_shape[:-1] + params.shape[-1:]), (-1, params.shape[-1]))
+    x = xout = _xnp_copy(uv, xnp=xnp)
+    mask = None
+    if xnp.__name__.startswith("jax"):
+        # Jax arrays do not support item assignment needed for the compaction
+        compaction_interval = None
 
     for i in range(num_iterations):
         step = xnp.abs(rel_step_size * x).clip(eps, None)
@@ -67,56 +81,129 @@ def _iterative_undistortion(distortion: _DistortionFunction, uv: TTensor, params
         dx_0f = distortion(params, xnp.stack((x[..., 0] + step[..., 0], x[..., 1]), -1), xnp=xnp)
         dx_1b = distortion(params, xnp.stack((x[..., 0], x[..., 1] - step[..., 1]), -1), xnp=xnp)
         dx_1f = distortion(params, xnp.stack((x[..., 0], x[..., 1] + step[..., 1]), -1), xnp=xnp)
-        J = xnp.stack(
-            (
-                1 + (dx_0f[..., 0] - dx_0b[..., 0]) / (2 * step[..., 0]),
-                (dx_1f[..., 0] - dx_1b[..., 0]) / (2 * step[..., 1]),
-                (dx_0f[..., 1] - dx_0b[..., 1]) / (2 * step[..., 0]),
-                1 + (dx_1f[..., 1] - dx_1b[..., 1]) / (2 * step[..., 1]),
-            ),
-            -1,
-        ).reshape((*dx.shape, 2))
-        step_x = np.linalg.solve(J, (x + dx - uv)[..., None]).squeeze(-1)
+        J00 = 1 + (dx_0f[..., 0] - dx_0b[..., 0]) / (2 * step[..., 0])
+        J01 = (dx_1f[..., 0] - dx_1b[..., 0]) / (2 * step[..., 1])
+        J10 = (dx_0f[..., 1] - dx_0b[..., 1]) / (2 * step[..., 0])
+        J11 = 1 + (dx_1f[..., 1] - dx_1b[..., 1]) / (2 * step[..., 1])
+
+        # Closed-form solution of the 2x2 system J @ step_x = x + dx - uv
+        residual = x + dx - uv
+        det = J00 * J11 - J01 * J10
+        step_x = xnp.stack((
+            (J11 * residual[..., 0] - J01 * residual[..., 1]) / det,
+            (J00 * residual[..., 1] - J10 * residual[..., 0]) / det,
+        ), -1)
         x -= step_x
         local_mask = (step_x**2).sum(-1) >= max_step_norm
 
         if not xnp.any(local_mask):
             break
 
-    # NOTE: We might consider adding this speedup in future.
-    #     # Mask here is to speedup the computation by only computing on
-    #     # unconverged points. The gather/scatter is costly so we do it
-    #     # only once every 10 steps.
-    #     # This optimization can be removed without loss of correctness
-    #     if i % 10 == 0 and i >= 30 and not xnp.all(local_mask):
-    #         # Update mask once every 10 steps
-
-    #         # Write out old values
-    #         if mask is not None:
-    #             xout[mask] = x
-
-    #         # Update mask
-    #         if mask is None:
-    #             mask = local_mask
-    #         else:
-    #             mask[mask] = local_mask
-    #
-    #         # Params can be broadcastable to uv
-    #         # We want to keep it that way so that we do not
-    #         # expand used memory
-    #         if params.size == params.shape[-1]:
-    #             params = xnp.reshape(params, (1, params.shape[-1]))
-    #         elif len(params.shape) > 2:
-    #             params = xnp.broadcast_to(params, (*x.shape[:-1], *params.shape[-1:]))
-    #             params = params[local_mask]
-    #         else:
-    #             params = params[local_mask]
-    #         uv = uv[local_mask]
-    #         x = x[local_mask]
-    # if mask is not None:
-    #     xout[mask] = x
-    # return xout
-    return cast(TTensor, x)
+        # Mask here is to speedup the computation by only computing on
+        # unconverged points. The gather/scatter is costly so we do it
+        # only once every few steps.
+        # This optimization can be removed without loss of correctness
+        if compaction_interval is not None and (i + 1) % compaction_interval == 0 and not xnp.all(local_mask):
+            # Write out old values
+            if mask is not None:
+                xout[mask] = x
+
+            # Update mask
+            if mask is None:
+                mask = local_mask
+            else:
+                mask[mask] = local_mask
+            if params.shape[0] > 1:
+                params = params[local_mask]
+            uv = uv[local_mask]
+            x = x[local_mask]
+    if mask is not None:
+        xout[mask] = x
+    else:
+        # The update of x is not in-place for jax
+        xout = x
+    return cast(TTensor, xnp.reshape(xout, new_uv_shape))
+
+
+def _newton_radial_undistortion(f_df, rd: TTensor, num_iterations: int = 100, **kwargs) -> TTensor:
+    """
+    Solves f(r) = rd for r using the Newton method, where f_df(r) returns the
+    function value and its derivative.
+    """
+    xnp = _get_xnp(rd) if TYPE_CHECKING else kwargs["xnp"]
+    max_step_norm = 1e-10
+    r = _xnp_copy(rd, xnp=xnp)
+    for _ in range(num_iterations):
+        f, df = f_df(r)
+        step = (f - rd) / df
+        r = r - step
+        if not xnp.any(step**2 >= max_step_norm):
+            break
+    return r
+
+
+def _radial_undistort_opencv(distortion_params: TTensor, rd: TTensor, **kwargs) -> TTensor:
+    k1 = distortion_params[..., 0]
+    k2 = distortion_params[..., 1]
+
+    def f_df(r):
+        r2 = r * r
+        r4 = r2 * r2
+        return r * (1 + k1 * r2 + k2 * r4), 1 + 3 * k1 * r2 + 5 * k2 * r4
+    return _newton_radial_undistortion(f_df, rd, **kwargs)
+
+
+def _radial_undistort_full_opencv(distortion_params: TTensor, rd: TTensor, **kwargs) -> TTensor:
+    k1 = distortion_params[..., 0]
+    k2 = distortion_params[..., 1]
+    k3 = distortion_params[..., 4]
+    k4 = distortion_params[..., 5]
+    k5 = distortion_params[..., 6]
+    k6 = distortion_params[..., 7]
+
+    def f_df(r):
+        r2 = r * r
+        r4 = r2 * r2
+        num = 1 + k1 * r2 + k2 * r4 + k3 * r4 * r2
+        den = 1 + k4 * r2 + k5 * r4 + k6 * r4 * r2
+        dnum = k1 + 2 * k2 * r2 + 3 * k3 * r4
+        dden = k4 + 2 * k5 * r2 + 3 * k6 * r4
+        radial = num / den
+        dradial = (dnum * den - num * dden) / (den * den)
+        return r * radial, radial + 2 * r2 * dradial
+    return _newton_radial_undistortion(f_df, rd, **kwargs)
+
+
+def _radial_undistort_opencv_fisheye(distortion_params: TTensor, rd: TTensor, **kwargs) -> TTensor:
+    xnp = _get_xnp(rd) if TYPE_CHECKING else kwargs["xnp"]
+    k1 = distortion_params[..., 0]
+    k2 = distortion_params[..., 1]
+    k3 = distortion_params[..., 4]
+    k4 = distortion_params[..., 5]
+
+    def f_df(theta):
+        theta2 = theta * theta
+        theta4 = theta2 * theta2
+        theta6 = theta4 * theta2
+        theta8 = theta4 * theta4
+        return (
+            theta * (1 + k1 * theta2 + k2 * theta4 + k3 * theta6 + k4 * theta8),
+            1 + 3 * k1 * theta2 + 5 * k2 * theta4 + 7 * k3 * theta6 + 9 * k4 * theta8,
+        )
+    return xnp.tan(_newton_radial_undistortion(f_df, rd, **kwargs))
+
+
+def _radial_undistortion(radial_undistortion, uv: TTensor, params: TTensor, **kwargs) -> TTensor:
+    """
+    Undistortion for radially symmetric distortions. Instead of solving the 2D problem,
+    only the 1D polynomial (rational) radial function is inverted using analytical derivatives.
+    """
+    xnp = _get_xnp(uv) if TYPE_CHECKING else kwargs["xnp"]
+    eps = float(xnp.finfo(uv.dtype).eps)  # type: ignore
+    rd = xnp.sqrt(uv[..., 0] * uv[..., 0] + uv[..., 1] * uv[..., 1])
+    r = radial_undistortion(params, rd, **kwargs)
+    scale = xnp.where(rd > eps, r / rd.clip(eps, None), xnp.ones_like(rd))
+    return uv * scale[..., None]
 
 
 def _distort_opencv(distortion_params: TTensor, uv: TTensor, **kwargs) -> TTensor:
@@ -221,18 +308,33 @@ def _distort(camera_models, distortion_params, uv, xnp: Any = np):
     return out
 
 
+# Fast paths used when the distortion is radially symmetric (no tangential distortion)
+_RADIAL_UNDISTORTIONS: Dict[CameraModel, Any] = {
+    "opencv": _radial_undistort_opencv,
+    "opencv_fisheye": _radial_undistort_opencv_fisheye,
+    "full_opencv": _radial_undistort_full_opencv,
+}
+
+
+def _undistort_camera_model(camera_model: CameraModel, uv: TTensor, distortion_params: TTensor, xnp: Any = np, **kwargs) -> TTensor:
+    # OpenCV fisheye model does not use the tangential distortion parameters
+    if camera_model == "opencv_fisheye" or not xnp.any(distortion_params[..., 2:4] != 0):
+        return _radial_undistortion(_RADIAL_UNDISTORTIONS[camera_model], uv, distortion_params, xnp=xnp, **kwargs)
+    return _iterative_undistortion(_DISTORTIONS[camera_model], uv, distortion_params, xnp=xnp, **kwargs)
+
+
 def _undistort(camera_models: TTensor, distortion_params: TTensor, uv: TTensor, xnp: Any = np, **kwargs) -> TTensor:
     pinhole_mask = camera_models == camera_model_to_int("pinhole")
     if xnp.all(pinhole_mask):
         return uv
     out: Optional[TTensor] = None
-    for cam, distortion in _DISTORTIONS.items():
+    for cam in _DISTORTIONS.keys():
         mask = camera_models == camera_model_to_int(cam)
         if xnp.any(mask):
             if xnp.all(mask):
-                return _iterative_undistortion(distortion, uv, distortion_params, xnp=xnp, **kwargs)
+                return _undistort_camera_model(cam, uv, distortion_params, xnp=xnp, **kwargs)
             else:
-                out_update = cast(TTensor, _iterative_undistortion(distortion, uv[mask], distortion_params[mask], xnp=xnp, **kwargs))  # type: ignore
+                out_update = cast(TTensor, _undistort_camera_model(cam, uv[mask], distortion_params[mask], xnp=xnp, **kwargs))  # type: ignore
                 if xnp.__name__.startswith("jax"):
                     _old_out = uv if out is None else out
                     _old_out.at[mask].set(out_update)  # type: ignore
@@ -263,6 +365,15 @@ def get_image_pixels(image_sizes: TTensor) -> TTensor:
         if xnp.__name__ == "torch" and not TYPE_CHECKING:
             options = {**options, "device": image_sizes.device}
         return xnp.stack(xnp.meshgrid(xnp.arange(w, **options), xnp.arange(h, **options), indexing="xy"), -1).reshape(-1, 2)
+    image_sizes = xnp.reshape(image_sizes, (-1, 2))
+    if len(image_sizes) > 0 and xnp.all(image_sizes == image_sizes[:1]):
+        # All images have the same size, the grid is computed only once
+        return xnp.concatenate([get_image_pixels(image_sizes[0])] * len(image_sizes))
+    if xnp is np:
+        counts = np.prod(image_sizes.astype(np.int64), -1)
+        widths = np.repeat(image_sizes[:, 0].astype(np.int64), counts)
+        local_index = np.arange(counts.sum(), dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.stack((local_index % widths, local_index // widths), -1).astype(image_sizes.dtype)
     return xnp.concatenate([get_image_pixels(s) for s in image_sizes])
 
 
@@ -411,7 +522,6 @@ def interpolate_bilinear(image: TTensor, xy: TTensor) -> TTensor:
     y0 = _xnp_astype(xnp.floor(y), xnp.int32, xnp=xnp)
     y1 = y0 + 1
 
-    image = _xnp_astype(image, xnp.float32, xnp=xnp)
     mask = xnp.logical_and(
         xnp.logical_and(
             x0 >= 0,
@@ -434,27 +544,152 @@ def interpolate_bilinear(image: TTensor, xy: TTensor) -> TTensor:
     dx_1 = 1 - dx
     dy_1 = 1 - dy
 
+    # Only the sampled pixels are converted to float32 (not the full image)
+    def gather(yy, xx):
+        return _xnp_astype(image[yy, xx], xnp.float32, xnp=xnp)
+
     # Top row, column-wise linear interpolation.
     shape = x.shape + tuple(1 for _ in image.shape[2:])
-    v0 = xnp.reshape(dx_1, shape) * image[y0, x0] + xnp.reshape(dx, shape) * image[y0, x1]
+    v0 = xnp.reshape(dx_1, shape) * gather(y0, x0) + xnp.reshape(dx, shape) * gather(y0, x1)
     # Bottom row, column-wise linear interpolation.
-    v1 = xnp.reshape(dx_1, shape) * image[y1, x0] + xnp.reshape(dx, shape) * image[y1, x1]
+    v1 = xnp.reshape(dx_1, shape) * gather(y1, x0) + xnp.reshape(dx, shape) * gather(y1, x1)
 
     # Row-wise linear interpolation.
     kwargs = {}
     if xnp.__name__ == "torch" and not TYPE_CHECKING:
         kwargs = {"device": image.device}
-    output = xnp.zeros(original_shape[:-1] + image.shape[2:], dtype=cast(Any, image.dtype), **kwargs)
+    output = xnp.zeros(original_shape[:-1] + image.shape[2:], dtype=xnp.float32, **kwargs)
     output_slice = xnp.reshape(dy_1, shape) * v0 + xnp.reshape(dy, shape) * v1
-    output[mask] = _xnp_astype(output_slice, image.dtype, xnp=xnp)
+    output[mask] = _xnp_astype(output_slice, xnp.float32, xnp=xnp)
     return output
 
 
-def warp_image_between_cameras(cameras1: GenericCameras[np.ndarray], 
-                               cameras2: GenericCameras[np.ndarray],
-                               images: np.ndarray):
+# Remap tables are shared between images with the same source and target cameras
+# (most datasets have only a few distinct sets of intrinsics).
+_REMAP_CACHE_SIZE = 8
+_remap_cache: "OrderedDict[Any, Tuple[np.ndarray, ...]]" = OrderedDict()
+_remap_cache_lock = threading.Lock()
+
+
+def _get_remap_cache_key(camera: GenericCameras[np.ndarray]) -> Tuple:
+    assert camera.image_sizes is not None, "camera must have image sizes"
+    return (
+        int(camera.camera_models),
+        camera.intrinsics.dtype.str, camera.intrinsics.tobytes(),
+        camera.distortion_parameters.dtype.str, camera.distortion_parameters.tobytes(),
+        tuple(int(x) for x in camera.image_sizes),
+    )
+
+
+def _compute_remap_tables(cams1: GenericCameras[np.ndarray], cams2: GenericCameras[np.ndarray], source_shape: Tuple[int, int]) -> List[Tuple[np.ndarray, ...]]:
+    # NOTE: pyright workaround
+    assert cams2.image_sizes is not None
+    assert np.all(cams2.image_sizes == cams2.image_sizes[:1]), "All target cameras must have the same image size"
+
+    # The pixel grid is shared by all cameras
+    xy = get_image_pixels(cams2.image_sizes[0])
+    # Camera models assume that the upper left pixel center is (0.5, 0.5).
+    xy = xy.astype(np.float32) + 0.5
+
+    # Replace poses with empty poses
+    empty_poses = np.broadcast_to(np.eye(4, dtype=cams2.poses.dtype)[:3, :4], cams2.poses.shape)
+    cams2 = cams2.replace(poses=empty_poses)
+    cams1 = cams1.replace(poses=empty_poses)
+
+    # Unproject and reproject back (for all cameras at once)
+    _, cam_point = unproject(cams2[:, None], xy[None])
+    source_point = project(cams1[:, None], cam_point)
+
+    # Undo 0.5 offset
+    source_point -= 0.5
+
+    # Same as interpolate_bilinear, but the indices and weights are stored
+    height, width = source_shape
+    tables = []
+    for x, y in zip(source_point[..., 0], source_point[..., 1]):
+        x0 = np.floor(x).astype(np.int32)
+        y0 = np.floor(y).astype(np.int32)
+        mask = (x0 >= 0) & (x0 + 1 < width) & (y0 >= 0) & (y0 + 1 < height)
+        x0, y0, x, y = x0[mask], y0[mask], x[mask], y[mask]
+        tables.append((
+            np.nonzero(mask)[0],
+            y0.astype(np.int64) * width + x0,
+            x - x0,
+            y - y0,
+        ))
+    return tables
+
+
+def _get_remap_tables(cams1: GenericCameras[np.ndarray], cams2: GenericCameras[np.ndarray], source_shape: Tuple[int, int]) -> List[Tuple[np.ndarray, ...]]:
+    """
+    Returns (cached) tables mapping pixels of cams2 to pixels of cams1 (batched cameras with the same target image size).
+    Each table contains the indices of valid output pixels, the flat indices of the top-left
+    source pixels, and the bilinear interpolation weights.
+    """
+    keys = [(_get_remap_cache_key(cam1), _get_remap_cache_key(cam2), tuple(source_shape)) for cam1, cam2 in zip(cams1, cams2)]
+    tables: List[Any] = [None] * len(keys)
+    with _remap_cache_lock:
+        for i, key in enumerate(keys):
+            tables[i] = _remap_cache.get(key)
+            if tables[i] is not None:
+                _remap_cache.move_to_end(key)
+
+    # Compute all missing tables in a single call
+    missing: Dict[Any, int] = {}
+    for i, key in enumerate(keys):
+        if tables[i] is None and key not in missing:
+            missing[key] = i
+    if missing:
+        indices = np.array(list(missing.values()), dtype=np.int64)
+        computed = dict(zip(missing.keys(), _compute_remap_tables(cams1[indices], cams2[indices], source_shape)))
+        with _remap_cache_lock:
+            for key, table in computed.items():
+                _remap_cache[key] = table
+            while len(_remap_cache) > _REMAP_CACHE_SIZE:
+                _remap_cache.popitem(last=False)
+        tables = [table if table is not None else computed[key] for key, table in zip(keys, tables)]
+    return tables
+
+
+def _remap_images(table: Tuple[np.ndarray, ...], images: np.ndarray, output_size: Tuple[int, int]) -> np.ndarray:
+    """
+    Applies a remap table to a batch of images [B, H, W, ...]. Returns float32 images [B, h, w, C].
+    """
+    indices, source_indices, dx, dy = table
+    w, h = output_size
+    batch_size, height, width = images.shape[:3]
+    images = np.reshape(images, (batch_size, height * width, -1))
+    dx, dy = dx[:, None], dy[:, None]
+    dx_1, dy_1 = 1 - dx, 1 - dy
+
+    # Only the sampled pixels are converted to float32
+    def gather(index):
+        return convert_image_dtype(images[:, index], np.float32)
+
+    # Top row, column-wise linear interpolation.
+    v0 = dx_1 * gather(source_indices) + dx * gather(source_indices + 1)
+    # Bottom row, column-wise linear interpolation.
+    v1 = dx_1 * gather(source_indices + width) + dx * gather(source_indices + width + 1)
+    # Row-wise linear interpolation.
+    output = np.zeros((batch_size, h * w, images.shape[-1]), dtype=np.float32)
+    output[:, indices] = (dy_1 * v0 + dy * v1).astype(np.float32)
+    return np.reshape(output, (batch_size, h, w, -1))
+
+
+def _to_numpy(tensor: Any) -> np.ndarray:
+    if isinstance(tensor, np.ndarray):
+        return tensor
+    if _get_xnp(tensor).__name__ == "torch":
+        return tensor.detach().cpu().numpy()
+    return np.asarray(tensor)
+
+
+def warp_image_between_cameras(cameras1: GenericCameras[TTensor], 
+                               cameras2: GenericCameras[TTensor],
+                               images: TTensor) -> TTensor:
     """
     Warp an image from cameras1 to cameras2 by mapping pixels from cameras2 to cameras1.
+    NumPy, torch and JAX tensors are supported.
 
     Args:
         cameras1: Cameras
@@ -462,61 +697,53 @@ def warp_image_between_cameras(cameras1: GenericCameras[np.ndarray],
         images: Images tensor
     
     Returns:
-        Warped images
+        Warped images (of the same type and device as ``images``)
     """
-
     xnp = _get_xnp(images)
+    if xnp is not np or not isinstance(cameras1.poses, np.ndarray) or not isinstance(cameras2.poses, np.ndarray):
+        # The remap tables are computed (and cached) with NumPy, other tensors are converted at the boundary
+        out = warp_image_between_cameras(
+            cameras1.apply(lambda x, _: _to_numpy(x)), 
+            cameras2.apply(lambda x, _: _to_numpy(x)), 
+            _to_numpy(images))
+        if xnp.__name__ == "torch":
+            return cast(TTensor, xnp.from_numpy(np.ascontiguousarray(out)).to(images.device))  # type: ignore
+        return cast(TTensor, xnp.asarray(out))
+
     assert cameras1.image_sizes is not None, "cameras1 must have image sizes"
     assert cameras2.image_sizes is not None, "cameras2 must have image sizes"
     assert cameras1.image_sizes.shape == cameras2.image_sizes.shape, "Camera shapes must be the same"
 
-    if len(cameras1.intrinsics.shape) == 2:
-        out_image_list = []
-        for cam1, cam2, image in zip(cameras1, cameras2, images):
-            out_image_list.append(warp_image_between_cameras(cam1, cam2, image))
-        return padded_stack(out_image_list)
-
-    cam1 = cameras1
-    cam2 = cameras2
-
-    # NOTE: pyright workaround
-    assert cam1.image_sizes is not None
-    assert cam2.image_sizes is not None
-
-    image = images
-
     # TODO: Fix aliasing issue
     # To avoid aliasing we rescale the output camera to input resolution and rescale images later
     # new_size = cam2.image_sizes
     # cam2 = dataclasses.replace(cam2, image_sizes=cam1.image_sizes)
 
-    w, h = cam2.image_sizes
-    xy = get_image_pixels(cam2.image_sizes)
-
-    # Camera models assume that the upper left pixel center is (0.5, 0.5).
-    xy = xy.astype(xnp.float32) + 0.5
-
-    # Replace poses with empty poses
-    empty_poses = xnp.eye(4, dtype=cam2.poses.dtype)[:3, :4]
-    cam2 = cam2.replace(poses=empty_poses)
-    cam1 = cam1.replace(poses=empty_poses)
-    
-    # Unproject and reproject back
-    _, cam_point = unproject(cam2[None], xy)
-    source_point = project(cam1[None], cam_point)
-
-    # Undo 0.5 offset
-    source_point -= 0.5
-
-    # Interpolate bilinear to obtain the image
-    out_image = interpolate_bilinear(convert_image_dtype(image, xnp.float32), source_point)
-    out_image = xnp.reshape(out_image, (h, w, -1))
-
-    # TODO: Resize image
-
-    # Cast image to original dtype
-    out_image = convert_image_dtype(out_image, images.dtype)
-    return out_image
+    if len(cameras1.intrinsics.shape) == 1:
+        return warp_image_between_cameras(cameras1[None], cameras2[None], images[None])[0]
+
+    # Cameras with the same target size share the pixel grid and are processed together.
+    # Images with the same cameras share the remap table and are gathered together.
+    source_shape = images.shape[1:3]
+    sizes = cameras2.image_sizes
+    out_images: List[Any] = [None] * len(images)
+    for size in np.unique(sizes, axis=0):
+        group = np.nonzero(np.all(sizes == size, -1))[0]
+        tables = _get_remap_tables(cameras1[group], cameras2[group], source_shape)
+        table_groups: Dict[int, Tuple[Any, List[int]]] = {}
+        for i, table in zip(group, tables):
+            table_groups.setdefault(id(table), (table, []))[1].append(i)
+        for table, indices in table_groups.values():
+            # NOTE: Slicing avoids copying the image if there is a single image in the group
+            batch = images[indices[0]:indices[0] + 1] if len(indices) == 1 else images[indices]
+            warped = _remap_images(table, batch, (int(size[0]), int(size[1])))
+            # Cast image to original dtype
+            warped = convert_image_dtype(warped, images.dtype)
+            for i, image in zip(indices, warped):
+                out_images[i] = image
+    if len(out_images) == 0:
+        return images
+    return padded_stack(out_images)
 
 
 def undistort_camera(camera: Cameras):
@@ -624,7 +851,7 @@ def undistort_camera(camera: Cameras):
         intrinsics[mask] = undistorted_intrinsics
         image_sizes[mask] = undistorted_image_sizes
 
-    out = vars(original_camera)
+    out = dict(vars(original_camera))
     out.update(dict(
         camera_models=np.full_like(original_camera.camera_models, camera_model_to_int("pinhole")),
         distortion_parameters=np.zeros_like(original_camera.distortion_parameters),
@@ -73,6 +73,7 @@ main.add_lazy_command("nerfbaselines.cli._export_mesh:export_mesh_command", "exp
 main.add_lazy_command("nerfbaselines.cli._test_method", "test-method")
 main.add_lazy_command("nerfbaselines.cli._render:render_command", "render")
 main.add_lazy_command("nerfbaselines.cli._render:render_trajectory_command", "render-trajectory")
+main.add_lazy_command("nerfbaselines.cli._render:merge_frames_command", "merge-frames")
 main.add_lazy_command("nerfbaselines.cli._generate_dataset_results:main", "generate-dataset-results")
 main.add_lazy_command("nerfbaselines.cli._fix_checkpoint:main", "fix-checkpoint")
 # nerfbaselines install-method is deprecated, but we keep it for compatibility
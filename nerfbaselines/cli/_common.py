@@ -15,7 +15,6 @@ import itertools
 import numpy as np
 import pprint
 import json
-from PIL import Image
 from nerfbaselines import BackendName
 from nerfbaselines.backends import run_on_host
 from nerfbaselines.utils import Indices
@@ -276,6 +275,8 @@ class ChangesTracker:
                 both_shas = False
             change = sha1 != sha2 if both_shas else data1 != data2
             if change and extension in (".jpg", ".jpeg", ".png"):
+                from PIL import Image
+
                 im1 = np.array(Image.open(file1)) / 255.
                 im2 = np.array(Image.open(file2)) / 255.
                 if im1.shape != im2.shape:
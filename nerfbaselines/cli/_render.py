@@ -1,6 +1,7 @@
+import re
 import sys
 from contextlib import ExitStack
-from typing import Union, Tuple
+from typing import Union, Tuple, Optional, List
 import logging
 from pathlib import Path
 import os
@@ -11,6 +12,7 @@ from nerfbaselines.datasets import load_dataset
 from nerfbaselines import Method, get_method_spec, build_method_class
 from nerfbaselines import backends
 from nerfbaselines.evaluation import render_all_images, render_frames, trajectory_get_embeddings, trajectory_get_cameras
+from nerfbaselines.evaluation import merge_frames, path_is_video
 from nerfbaselines.io import open_any_directory, deserialize_nb_info, load_trajectory, open_any
 from ._common import handle_cli_error, click_backend_option, NerfBaselinesCliCommand
 
@@ -73,6 +75,20 @@ def render_command(checkpoint: str, data: str, output: str, split: str, backend_
             pass
 
 
+def _parse_frames(frames: str, num_frames: int) -> List[int]:
+    # Parses the 'start:end' frame range (start or end can be omitted)
+    match = re.fullmatch(r"(\d*):(\d*)", frames.strip())
+    if match is None:
+        raise ValueError(f"Invalid frame range '{frames}'. Use the 'start:end' format (e.g., 0:500).")
+    start = int(match.group(1)) if match.group(1) else 0
+    end = int(match.group(2)) if match.group(2) else num_frames
+    if end > num_frames:
+        raise ValueError(f"Invalid frame range '{frames}'. The trajectory has only {num_frames} frames.")
+    if start >= end:
+        raise ValueError(f"Invalid frame range '{frames}'. The range is empty.")
+    return list(range(start, end))
+
+
 @click.command("render-trajectory", cls=NerfBaselinesCliCommand, short_help="Render images from a trained model for a trajectory", help=(
     "Render images from a trained model for a trajectory. "
     "The trajectory should be a JSON file obtained from the viewer (`nerfbaselines viewer`). "
@@ -86,6 +102,9 @@ def render_command(checkpoint: str, data: str, output: str, split: str, backend_
 @click.option("--output", type=click.Path(path_type=str), default=None, help="Output a mp4/directory/tar.gz file. Use '{output}' as a placeholder for output name.")
 @click.option("--resolution", type=str, default=None, help="Override the resolution of the output. Use 'widthxheight' format (e.g., 1920x1080). If one of the dimensions is negative, the aspect ratio will be preserved and the dimension will be rounded to the nearest multiple of the absolute value of the dimension.")
 @click.option("--output-names", type=str, default="color", help="Comma separated list of output types (e.g. color,depth,accumulation). See the method's `get_info()['supported_outputs']` for supported outputs.")
+@click.option("--num-workers", type=int, default=4, show_default=True, help="Number of worker threads used to post-process and encode frames while the next frames are being rendered. Use 0 to render, post-process and write frames sequentially.")
+@click.option("--frames", type=str, default=None, help="Render only a range of frames in the 'start:end' format (e.g., 0:500). The output frames keep their index in the trajectory, so that shards rendered on different machines can be assembled with `nerfbaselines merge-frames`.")
+@click.option("--resume", is_flag=True, default=False, help="Resume an interrupted render. Frames already present in the output folder/zip archive are skipped.")
 @click_backend_option()
 @handle_cli_error
 def render_trajectory_command(checkpoint: Union[str, Path], 
@@ -93,7 +112,10 @@ def render_trajectory_command(checkpoint: Union[str, Path],
                               output: Union[str, Path], 
                               output_names: Union[Tuple[str, ...], str], 
                               backend_name, 
-                              resolution=None):
+                              resolution=None,
+                              num_workers: int = 4,
+                              frames: Optional[str] = None,
+                              resume: bool = False):
     checkpoint = str(checkpoint)
     output = str(output)
     if isinstance(output_names, str):
@@ -101,8 +123,8 @@ def render_trajectory_command(checkpoint: Union[str, Path],
 
     for output_name in output_names:
         loutput = output.format(output=output_name)
-        if os.path.exists(loutput):
-            logging.critical(f"Output path {loutput} already exists")
+        if os.path.exists(loutput) and not resume:
+            logging.critical(f"Output path {loutput} already exists. Use --resume to continue an interrupted render.")
             sys.exit(1)
 
     # Parse trajectory
@@ -110,6 +132,15 @@ def render_trajectory_command(checkpoint: Union[str, Path],
         _trajectory = load_trajectory(f)
     cameras = trajectory_get_cameras(_trajectory)
 
+    frame_indices = None
+    if frames is not None:
+        try:
+            frame_indices = _parse_frames(frames, len(cameras))
+        except ValueError as e:
+            logging.critical(str(e))
+            sys.exit(1)
+        logging.info(f"Rendering {len(frame_indices)} frames ({frames}) out of {len(cameras)}")
+
     # Override resolution
     if resolution is not None:
         w, h = tuple(map(int, resolution.split("x")))
@@ -160,6 +191,36 @@ def render_trajectory_command(checkpoint: Union[str, Path],
                       output=output, 
                       output_names=output_names, 
                       nb_info=nb_info, 
-                      fps=_trajectory["fps"])
+                      fps=_trajectory["fps"],
+                      num_workers=num_workers,
+                      frames=frame_indices,
+                      resume=resume)
         logging.info(f"Output saved to {output}")
 
+
+@click.command("merge-frames", cls=NerfBaselinesCliCommand, short_help="Merge frames rendered in shards into a single output", help=(
+    "Merge frames rendered by (possibly multiple) `nerfbaselines render-trajectory --frames start:end` runs into a single output. "
+    "The inputs must be folders or zip archives and together they must contain all frames of the trajectory. "
+    "The output can be a video, a directory or a zip/tar.gz archive. If the inputs contain multiple outputs (e.g., color, depth), "
+    "the `--output` argument can contain a placeholder `{output}` which will be replaced with the output name."))
+@click.argument("inputs", type=str, nargs=-1, required=True)
+@click.option("--output", type=click.Path(path_type=str), required=True, help="Output mp4/directory/zip/tar.gz file. Use '{output}' as a placeholder for output name.")
+@click.option("--fps", type=float, default=None, help="Frames per second of the output video. Either --fps or --trajectory must be specified for video outputs.")
+@click.option("--trajectory", type=str, default=None, help="Path to the trajectory JSON file (used to get the fps and to check that all frames are present).")
+@handle_cli_error
+def merge_frames_command(inputs: Tuple[str, ...], output: str, fps: Optional[float] = None, trajectory: Optional[str] = None):
+    num_frames = None
+    if trajectory is not None:
+        with open_any(trajectory, "r") as f:
+            _trajectory = load_trajectory(f)
+        num_frames = len(_trajectory["frames"])
+        if fps is None:
+            fps = _trajectory["fps"]
+    if fps is None:
+        if path_is_video(output):
+            logging.critical("Either --fps or --trajectory must be specified for video outputs")
+            sys.exit(1)
+        fps = 30.0
+    merge_frames(inputs, output, fps=fps, num_frames=num_frames)
+    logging.info(f"Output saved to {output}")
+
@@ -9,7 +9,7 @@ from contextlib import ExitStack
 from nerfbaselines import (
     build_method_class,
 )
-from nerfbaselines.datasets import load_dataset
+from nerfbaselines.datasets import load_dataset_splits
 from nerfbaselines.training import (
     Trainer, Indices, build_logger,
     get_presets_and_config_overrides,
@@ -38,6 +38,9 @@ from ._common import SetParamOptionType, TupleClickType, IndicesClickType, handl
 @click.option("--presets", type=TupleClickType(), default=None, help=(
     "Apply a comma-separated list of preset to the method. If no `--presets` is supplied, or if a special `@auto` preset is present (default if no presets are specified),"
     " the method's default presets are applied (based on the dataset metadata)."))
+@click.option("--lazy-images", is_flag=True, default=False, help=(
+    "Decode the dataset images on first access instead of loading all of them into memory before training. "
+    "Only a bounded number of decoded images is kept in memory (`NERFBASELINES_LAZY_IMAGES_CACHE_SIZE`)."))
 @click_backend_option()
 @handle_cli_error
 def train_command(
@@ -53,6 +56,7 @@ def train_command(
     logger="none",
     config_overrides=None,
     presets=None,
+    lazy_images=False,
 ):
     if config_overrides is None:
         config_overrides = {}
@@ -96,25 +100,19 @@ def train_command(
         method_spec = nerfbaselines.get_method_spec(method_name)
         method_cls = stack.enter_context(build_method_class(method_spec, backend_name))
 
-        # Load train dataset
-        logging.info("Loading train dataset")
+        # Load train and eval datasets
+        logging.info("Loading train and eval datasets")
         method_info = method_cls.get_method_info()
         required_features = method_info.get("required_features", frozenset())
         supported_camera_models = method_info.get("supported_camera_models", frozenset(("pinhole",)))
-        train_dataset = load_dataset(_data, 
-                                     split="train", 
-                                     features=required_features, 
-                                     supported_camera_models=supported_camera_models, 
-                                     load_features=True)
+        datasets = load_dataset_splits(_data, 
+                                       splits=("train", "test"), 
+                                       features=required_features, 
+                                       supported_camera_models=supported_camera_models, 
+                                       load_features=True,
+                                       lazy_images=lazy_images)
+        train_dataset, test_dataset = datasets["train"], datasets["test"]
         assert train_dataset["cameras"].image_sizes is not None, "image sizes must be specified"
-
-        # Load eval dataset
-        logging.info("Loading eval dataset")
-        test_dataset = load_dataset(_data, 
-                                    split="test", 
-                                    features=required_features, 
-                                    supported_camera_models=supported_camera_models, 
-                                    load_features=True)
         test_dataset["metadata"]["expected_scene_scale"] = train_dataset["metadata"].get("expected_scene_scale")
 
         # Apply config overrides for the train dataset
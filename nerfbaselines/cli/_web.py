@@ -1,5 +1,4 @@
 import click
-from nerfbaselines.web import start_dev_server, build
 from ._common import NerfBaselinesCliCommand
 
 
@@ -23,6 +22,8 @@ def _(data_path, datasets, include_docs=None):
     datasets = datasets.split(",") if datasets else None
     if include_docs == "none":
         include_docs = None
+    from nerfbaselines.web import start_dev_server
+
     start_dev_server(data=data_path, datasets=datasets, include_docs=include_docs)
 
 
@@ -38,8 +39,11 @@ def _(data_path, datasets, include_docs=None):
               default="none", 
               show_default=True,
               help="Whether to include the documentation page for all versions, the latest, or none.")
-def _(output, data_path, datasets, base_path, include_docs=None):
+@click.option("--incremental", is_flag=True, help="Update an existing output directory and only re-render pages whose inputs changed.")
+def _(output, data_path, datasets, base_path, include_docs=None, incremental=False):
     if include_docs == "none":
         include_docs = None
     datasets = datasets.split(",") if datasets else None
-    build(output, data=data_path, datasets=datasets, include_docs=include_docs, base_path=base_path)
+    from nerfbaselines.web import build
+
+    build(output, data=data_path, datasets=datasets, include_docs=include_docs, base_path=base_path, incremental=incremental)
@@ -1,4 +1,6 @@
 from ._common import dataset_load_features as dataset_load_features
 from ._common import dataset_index_select as dataset_index_select
 from ._common import load_dataset as load_dataset
+from ._common import load_dataset_splits as load_dataset_splits
 from ._common import download_dataset as download_dataset
+from ._common import LazyImages as LazyImages
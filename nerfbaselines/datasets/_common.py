@@ -2,12 +2,19 @@ from datetime import datetime
 import time
 import re
 import json
+import copy
+import contextlib
 import importlib
 import shutil
 from pathlib import Path
 import warnings
 import gc
 import functools
+import hashlib
+import base64
+import io
+import threading
+from collections import OrderedDict
 import logging
 import os
 import struct
@@ -16,10 +23,9 @@ import numpy as np
 import PIL.Image
 import PIL.ExifTags
 from tqdm import tqdm
-import requests
 from typing import (
     Optional, TypeVar, Tuple, Union, List, Dict, Any, 
-    FrozenSet, Iterable,
+    FrozenSet, Iterable, Sequence,
     overload, cast,
 )
 from nerfbaselines import (
@@ -51,6 +57,40 @@ def _import_type(name: str) -> Any:
     return obj
 
 
+_parse_cache = threading.local()
+
+
+@contextlib.contextmanager
+def _parse_cache_scope():
+    """
+    Within the scope, ``cached_parse`` memoizes the parsed files such that the scene
+    description is parsed only once when multiple splits are loaded.
+    """
+    if getattr(_parse_cache, "entries", None) is not None:
+        yield
+        return
+    _parse_cache.entries = {}
+    try:
+        yield
+    finally:
+        _parse_cache.entries = None
+
+
+def cached_parse(parse_fn, path: Union[Path, str]):
+    """
+    Calls ``parse_fn(path)``. Inside ``_parse_cache_scope``, the result is cached
+    (keyed by the function and the file path and mtime). The parsed object is shared
+    and must not be modified by the caller.
+    """
+    entries = getattr(_parse_cache, "entries", None)
+    if entries is None:
+        return parse_fn(path)
+    key = (parse_fn, os.path.abspath(path), os.path.getmtime(path))
+    if key not in entries:
+        entries[key] = parse_fn(path)
+    return entries[key]
+
+
 def experimental_parse_dataset_path(path: str) -> Tuple[str, Dict[str, Any]]:
     # NOTE: This is an experimental feature likely to change
     kwargs: Dict[str, Any] = {}
@@ -216,7 +256,162 @@ def get_default_viewer_transform(poses, dataset_type: Optional[str]) -> Tuple[np
         raise ValueError(f"Dataset type {dataset_type} is not supported")
 
 
-def _dataset_undistort_unsupported(dataset: Dataset, supported_camera_models):
+_UNDISTORTED_CACHE_SIZE = 4 * 1024 ** 3  # 4 GiB
+
+
+def _get_undistorted_cache_dir() -> Optional[str]:
+    # An empty string (or a zero cache size) disables the cache
+    path = os.environ.get("NERFBASELINES_UNDISTORTED_CACHE", os.path.join(NB_PREFIX, "undistorted"))
+    if _get_undistorted_cache_size() <= 0:
+        return None
+    return path or None
+
+
+def _get_undistorted_cache_size() -> int:
+    # Maximum size of the cache in bytes
+    return int(os.environ.get("NERFBASELINES_UNDISTORTED_CACHE_SIZE", _UNDISTORTED_CACHE_SIZE))
+
+
+def _get_undistorted_cache_key(camera: Cameras, image_path: Optional[str], sampling_mask_path: Optional[str], supported_camera_models) -> Optional[str]:
+    if image_path is None or not os.path.isfile(image_path):
+        # Images which are not stored on disk are not cached
+        return None
+    sha = hashlib.sha256()
+
+    def add_file(path):
+        stat = os.stat(path)
+        sha.update(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+
+    sha.update(b"nerfbaselines-undistorted-v2")
+    add_file(image_path)
+    if sampling_mask_path is not None:
+        if not os.path.isfile(sampling_mask_path):
+            return None
+        add_file(sampling_mask_path)
+    for array in (camera.camera_models, camera.intrinsics, camera.distortion_parameters, camera.image_sizes):
+        array = np.asarray(array)
+        sha.update(array.dtype.str.encode("utf-8") + array.tobytes())
+    sha.update(",".join(sorted(supported_camera_models)).encode("utf-8"))
+    return sha.hexdigest()
+
+
+def _load_undistorted_cache(path: str, camera: Cameras):
+    try:
+        with np.load(path) as data:
+            undistorted_camera = camera.replace(
+                camera_models=data["camera_models"],
+                intrinsics=data["intrinsics"],
+                distortion_parameters=data["distortion_parameters"],
+                image_sizes=data["image_sizes"])
+            out = undistorted_camera, data["image"], (data["sampling_mask"] if "sampling_mask" in data else None)
+    except Exception as e:
+        logging.warning(f"Failed to load cached undistorted image {path}: {e}")
+        return None
+    try:
+        # The modification time is used to evict the least recently used entries
+        os.utime(path)
+    except OSError:
+        pass
+    return out
+
+
+def _save_undistorted_cache(path: str, camera: Cameras, image: np.ndarray, sampling_mask: Optional[np.ndarray]):
+    arrays = dict(
+        camera_models=camera.camera_models,
+        intrinsics=camera.intrinsics,
+        distortion_parameters=camera.distortion_parameters,
+        image_sizes=camera.image_sizes,
+        image=image,
+    )
+    if sampling_mask is not None:
+        arrays["sampling_mask"] = sampling_mask
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write atomically, other processes may be reading the cache
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), suffix=".tmp.npz", delete=False) as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(f.name, path)
+    except OSError as e:
+        logging.warning(f"Failed to cache undistorted image {path}: {e}")
+
+
+def _evict_undistorted_cache(cache_dir: str, max_size: int):
+    # Removes the least recently used entries until the cache fits into max_size bytes
+    entries = []
+    total_size = 0
+    for root, _, files in os.walk(cache_dir):
+        for fname in files:
+            if not fname.endswith(".npz"):
+                continue
+            path = os.path.join(root, fname)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+    if total_size <= max_size:
+        return
+    entries.sort()
+    num_removed = 0
+    for _, size, path in entries:
+        if total_size <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total_size -= size
+        num_removed += 1
+    logging.info(f"Removed {num_removed} least recently used undistorted images from the cache {cache_dir}")
+
+
+def _get_undistorted_cache_path(camera: Cameras, 
+                                source_image_path: Optional[str], 
+                                source_sampling_mask_path: Optional[str], 
+                                supported_camera_models) -> Optional[str]:
+    cache_dir = _get_undistorted_cache_dir()
+    if cache_dir is None:
+        return None
+    cache_key = _get_undistorted_cache_key(camera, source_image_path, source_sampling_mask_path, supported_camera_models)
+    if cache_key is None:
+        return None
+    return os.path.join(cache_dir, cache_key[:2], cache_key + ".npz")
+
+
+def _lookup_undistorted_cache(camera: Cameras, 
+                              source_image_path: Optional[str], 
+                              source_sampling_mask_path: Optional[str], 
+                              supported_camera_models):
+    # Returns the cache path (or None if the image cannot be cached) and the cached entry (or None)
+    cache_path = _get_undistorted_cache_path(camera, source_image_path, source_sampling_mask_path, supported_camera_models)
+    if cache_path is None:
+        return None, None
+    cached = None
+    if os.path.exists(cache_path):
+        cached = _load_undistorted_cache(cache_path, camera)
+        if cached is not None and (source_sampling_mask_path is None) != (cached[2] is None):
+            cached = None
+    return cache_path, cached
+
+
+def _dataset_undistort_unsupported(dataset: Dataset, supported_camera_models, *, 
+                                   source_image_paths: Optional[List[str]] = None,
+                                   source_sampling_mask_paths: Optional[List[str]] = None,
+                                   cached_undistorted: Optional[Dict[int, Any]] = None):
+    """
+    Undistorts images of cameras not supported by the method. The undistorted images
+    and cameras are cached on disk (see ``NERFBASELINES_UNDISTORTED_CACHE``) and reused in later runs.
+    The cache is limited to ``NERFBASELINES_UNDISTORTED_CACHE_SIZE`` bytes (4 GiB by default),
+    the least recently used entries are removed first.
+
+    Args:
+        dataset: Dataset with loaded images (modified in-place).
+        supported_camera_models: Camera models supported by the method.
+        source_image_paths: Paths to the original image files (used for the cache key) if the dataset image paths were rewritten.
+        source_sampling_mask_paths: Paths to the original sampling mask files.
+        cached_undistorted: Entries already loaded from the cache (the source images were not decoded for these).
+    """
     assert dataset["images"] is not None, "Images must be loaded"
     supported_models_int = set(camera_model_to_int(x) for x in supported_camera_models)
     undistort_tasks = []
@@ -227,6 +422,48 @@ def _dataset_undistort_unsupported(dataset: Dataset, supported_camera_models):
     if len(undistort_tasks) == 0:
         return False
 
+    if source_image_paths is None and dataset["image_paths"] is not None:
+        source_image_paths = list(dataset["image_paths"])
+    if source_sampling_mask_paths is None and dataset["sampling_mask_paths"] is not None:
+        source_sampling_mask_paths = list(dataset["sampling_mask_paths"])
+
+    if isinstance(dataset["images"], LazyImages):
+        # Images are undistorted when they are loaded (using the undistorted images cache)
+        lazy_images = dataset["images"]
+        sampling_masks = list(dataset["sampling_masks"]) if dataset["sampling_masks"] is not None else None
+        dataset["sampling_masks"] = sampling_masks
+        cache_dir = _get_undistorted_cache_dir()
+        if cache_dir is not None:
+            # Entries are added when the images are loaded, the cache is trimmed here
+            _evict_undistorted_cache(cache_dir, _get_undistorted_cache_size())
+        for i, camera in undistort_tasks:
+            # NOTE: camera is a view into dataset["cameras"], which is modified below
+            camera = camera.apply(lambda x, _: x.copy())
+            ow, oh = camera.image_sizes
+            undistorted_camera = cameras.undistort_camera(camera)
+            if sampling_masks is not None:
+                sampling_masks[i] = cameras.warp_image_between_cameras(camera, undistorted_camera, sampling_masks[i][:oh, :ow])
+            cache_path = _get_undistorted_cache_path(
+                camera,
+                source_image_paths[i] if source_image_paths is not None else None,
+                source_sampling_mask_paths[i] if source_sampling_mask_paths is not None else None,
+                supported_camera_models)
+            lazy_images.set_undistortion(i, camera, undistorted_camera, 
+                                         cache_path=cache_path,
+                                         sampling_mask=sampling_masks[i] if sampling_masks is not None else None)
+            if dataset["image_paths"] is not None:
+                dataset["image_paths"][i] = os.path.join(
+                    "/undistorted", os.path.split(dataset["image_paths"][i])[-1]
+                )
+            if dataset["sampling_mask_paths"] is not None:
+                dataset["sampling_mask_paths"][i] = os.path.join(
+                    "/undistorted-masks", os.path.split(dataset["sampling_mask_paths"][i])[-1]
+                )
+            # IMPORTANT: camera is modified in-place
+            dataset["cameras"][i] = undistorted_camera
+        dataset["image_paths_root"] = "/undistorted"
+        return True
+
     was_list = isinstance(dataset["images"], list)
     new_images = list(dataset["images"])
     new_sampling_masks = (
@@ -238,9 +475,19 @@ def _dataset_undistort_unsupported(dataset: Dataset, supported_camera_models):
     # Release memory here
     gc.collect()
 
+    cache_dir = _get_undistorted_cache_dir()
+    num_cached = 0
+    num_saved = 0
     for i, camera in tqdm(undistort_tasks, desc="undistorting images", dynamic_ncols=True):
-        undistorted_camera = cameras.undistort_camera(camera)
         ow, oh = camera.image_sizes
+        if cached_undistorted is not None and i in cached_undistorted:
+            cache_path, cached = None, cached_undistorted[i]
+        else:
+            cache_path, cached = _lookup_undistorted_cache(
+                camera, 
+                source_image_paths[i] if source_image_paths is not None else None,
+                source_sampling_mask_paths[i] if source_sampling_mask_paths is not None else None,
+                supported_camera_models)
         if dataset["image_paths"] is not None:
             dataset["image_paths"][i] = os.path.join(
                 "/undistorted", os.path.split(dataset["image_paths"][i])[-1]
@@ -249,15 +496,30 @@ def _dataset_undistort_unsupported(dataset: Dataset, supported_camera_models):
             dataset["sampling_mask_paths"][i] = os.path.join(
                 "/undistorted-masks", os.path.split(dataset["sampling_mask_paths"][i])[-1]
             )
-        warped = cameras.warp_image_between_cameras(
-            camera, undistorted_camera, new_images[i][:oh, :ow]
-        )
-        new_images[i] = warped
-        if new_sampling_masks is not None:
-            warped = cameras.warp_image_between_cameras(camera, undistorted_camera, new_sampling_masks[i][:oh, :ow])
-            new_sampling_masks[i] = warped
+        if cached is not None:
+            undistorted_camera, new_images[i], sampling_mask = cached
+            if new_sampling_masks is not None:
+                new_sampling_masks[i] = sampling_mask
+            num_cached += 1
+        else:
+            undistorted_camera = cameras.undistort_camera(camera)
+            warped = cameras.warp_image_between_cameras(
+                camera, undistorted_camera, new_images[i][:oh, :ow]
+            )
+            new_images[i] = warped
+            if new_sampling_masks is not None:
+                warped = cameras.warp_image_between_cameras(camera, undistorted_camera, new_sampling_masks[i][:oh, :ow])
+                new_sampling_masks[i] = warped
+            if cache_path is not None:
+                _save_undistorted_cache(cache_path, undistorted_camera, new_images[i], 
+                                        new_sampling_masks[i] if new_sampling_masks is not None else None)
+                num_saved += 1
         # IMPORTANT: camera is modified in-place
         dataset["cameras"][i] = undistorted_camera
+    if num_cached > 0:
+        logging.info(f"Loaded {num_cached} undistorted images from the cache {cache_dir}")
+    if num_saved > 0 and cache_dir is not None:
+        _evict_undistorted_cache(cache_dir, _get_undistorted_cache_size())
     if not was_list:
         dataset["images"] = padded_stack(new_images)
         dataset["sampling_masks"] = (
@@ -336,14 +598,238 @@ def _dataset_rescale_intrinsics(dataset: Dataset, image_sizes: np.ndarray):
             intrinsics=(cameras.intrinsics * multipliers).astype(cameras.intrinsics.dtype))
 
 
+def _read_image(path: str, *, resize: Optional[float] = None) -> np.ndarray:
+    if str(path).endswith(".bin"):
+        with open(path, "rb") as f:
+            data_bytes = f.read()
+            h, w = struct.unpack("<II", data_bytes[:8])
+            return (
+                np.frombuffer(
+                    data_bytes, dtype=np.float16, count=h * w * 4, offset=8
+                )
+                .astype(np.float32)
+                .reshape([h, w, 4])
+            )
+    pil_image = PIL.Image.open(path)
+    if resize is not None:
+        w, h = pil_image.size
+        new_size = round(w/resize), round(h/resize)
+        pil_image = pil_image.resize(new_size, PIL.Image.Resampling.BICUBIC)
+        warnings.warn(f"Resized image with a factor of {resize}")
+    return np.array(pil_image, dtype=np.uint8)
+
+
+def _read_image_size(path: str, *, resize: Optional[float] = None) -> Tuple[int, int]:
+    # Reads only the header, the image is not decoded
+    if str(path).endswith(".bin"):
+        with open(path, "rb") as f:
+            h, w = struct.unpack("<II", f.read(8))
+        return w, h
+    with PIL.Image.open(path) as pil_image:
+        w, h = pil_image.size
+    if resize is not None:
+        w, h = round(w/resize), round(h/resize)
+    return w, h
+
+
+def _get_lazy_images_cache_size() -> int:
+    return max(1, int(os.environ.get("NERFBASELINES_LAZY_IMAGES_CACHE_SIZE", 64)))
+
+
+class _LazyImagesCache:
+    def __init__(self, max_size: int, prefetch: int):
+        self.max_size = max_size
+        self.prefetch = prefetch
+        self.images: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self.pending: Dict[int, Any] = {}
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def submit(self, key: int, fn):
+        with self.lock:
+            if key in self.images or key in self.pending:
+                return
+            if self.executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self.executor = ThreadPoolExecutor(max_workers=max(1, min(self.prefetch, 4)), thread_name_prefix="nb-prefetch")
+            self.pending[key] = self.executor.submit(self._load, key, fn)
+
+    def _load(self, key: int, fn) -> np.ndarray:
+        try:
+            image = fn()
+            self.put(key, image)
+            return image
+        finally:
+            with self.lock:
+                self.pending.pop(key, None)
+
+    def put(self, key: int, image: np.ndarray):
+        with self.lock:
+            self.images[key] = image
+            self.images.move_to_end(key)
+            while len(self.images) > self.max_size:
+                self.images.popitem(last=False)
+
+    def get(self, key: int, fn) -> np.ndarray:
+        with self.lock:
+            image = self.images.get(key)
+            if image is not None:
+                self.images.move_to_end(key)
+                return image
+            future = self.pending.get(key)
+        if future is not None:
+            return future.result()
+        image = fn()
+        self.put(key, image)
+        return image
+
+
+class LazyImages(Sequence):
+    """
+    A drop-in replacement for the list of images in ``Dataset["images"]`` which decodes
+    the images on first access. A bounded LRU cache of the decoded images is kept
+    (``NERFBASELINES_LAZY_IMAGES_CACHE_SIZE`` images by default) and when the images are accessed
+    with a constant stride (e.g., sequentially), the next images are decoded ahead in background threads.
+    The object is pickled by the image paths (the decoded images are not transferred).
+
+    Args:
+        image_paths: Paths to the image files.
+        resize: Downscale factor applied when the images are loaded.
+        cache_size: Maximum number of decoded images kept in memory.
+        prefetch: Number of images decoded ahead for strided access patterns (0 disables prefetching).
+    """
+    def __init__(self, 
+                 image_paths: Sequence[str], 
+                 *, 
+                 resize: Optional[float] = None, 
+                 cache_size: Optional[int] = None, 
+                 prefetch: int = 4):
+        if cache_size is None:
+            cache_size = _get_lazy_images_cache_size()
+        self._image_paths = list(image_paths)
+        self._resize = resize
+        self._keys = list(range(len(self._image_paths)))
+        # Images assigned explicitly (in-memory) and lazily applied undistortion
+        self._overrides: Dict[int, np.ndarray] = {}
+        self._undistort: Dict[int, Tuple[Cameras, Cameras, Optional[str], Optional[np.ndarray]]] = {}
+        self._cache = _LazyImagesCache(cache_size, prefetch)
+        self._last_accessed: Tuple[int, int] = (-1, -1)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _load(self, index: int) -> np.ndarray:
+        key = self._keys[index]
+        if key not in self._undistort:
+            return _read_image(self._image_paths[key], resize=self._resize)
+        camera, undistorted_camera, cache_path, sampling_mask = self._undistort[key]
+        if cache_path is not None and os.path.exists(cache_path):
+            cached = _load_undistorted_cache(cache_path, camera)
+            if cached is not None and (sampling_mask is None) == (cached[2] is None):
+                return cached[1]
+        image = _read_image(self._image_paths[key], resize=self._resize)
+        ow, oh = camera.image_sizes
+        image = cameras.warp_image_between_cameras(camera, undistorted_camera, image[:oh, :ow])
+        if cache_path is not None:
+            _save_undistorted_cache(cache_path, undistorted_camera, image, sampling_mask)
+        return image
+
+    def _prefetch(self, index: int):
+        prev, last = self._last_accessed
+        self._last_accessed = (last, index)
+        stride = index - last
+        if self._cache.prefetch <= 0 or stride == 0 or last - prev != stride:
+            return
+        for i in range(1, self._cache.prefetch + 1):
+            next_index = index + i * stride
+            if next_index < 0 or next_index >= len(self):
+                break
+            if self._keys[next_index] not in self._overrides:
+                self._cache.submit(self._keys[next_index], functools.partial(self._load, next_index))
+
+    def _subset(self, indices) -> "LazyImages":
+        out = cast(LazyImages, object.__new__(LazyImages))
+        out.__dict__.update(self.__dict__)
+        out._keys = [self._keys[i] for i in indices]
+        out._overrides = dict(self._overrides)
+        out._undistort = dict(self._undistort)
+        out._last_accessed = (-1, -1)
+        return out
+
+    def __getitem__(self, index):
+        if isinstance(index, (slice, list, np.ndarray)):
+            return self._subset(np.arange(len(self))[index].tolist())
+        index = int(index)
+        if index < -len(self) or index >= len(self):
+            raise IndexError(f"Image index {index} out of range")
+        index = index % len(self)
+        key = self._keys[index]
+        if key in self._overrides:
+            return self._overrides[key]
+        image = self._cache.get(key, functools.partial(self._load, index))
+        self._prefetch(index)
+        return image
+
+    def __setitem__(self, index: int, image: np.ndarray):
+        self._overrides[self._keys[index]] = image
+
+    def set_undistortion(self, 
+                         index: int, 
+                         camera: Cameras, 
+                         undistorted_camera: Cameras, 
+                         *,
+                         cache_path: Optional[str] = None,
+                         sampling_mask: Optional[np.ndarray] = None):
+        """
+        Undistort the image (from ``camera`` to ``undistorted_camera``) when it is loaded.
+
+        Args:
+            index: Index of the image.
+            camera: Camera of the loaded image.
+            undistorted_camera: Camera of the undistorted image.
+            cache_path: Path of the undistorted images cache entry. If it exists, the undistorted image
+                is loaded from it, otherwise the entry is written after the image is undistorted.
+            sampling_mask: Undistorted sampling mask stored in the cache entry.
+        """
+        key = self._keys[index]
+        self._undistort[key] = (camera, undistorted_camera, cache_path, sampling_mask)
+        with self._cache.lock:
+            self._cache.images.pop(key, None)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_cache"] = (self._cache.max_size, self._cache.prefetch)
+        state["_last_accessed"] = (-1, -1)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cache = _LazyImagesCache(*state["_cache"])
+
+    def __repr__(self):
+        return f"LazyImages(num_images={len(self)}, cache_size={self._cache.max_size})"
+
+
 def dataset_load_features(
-    dataset: UnloadedDataset, features=None, supported_camera_models=None
+    dataset: UnloadedDataset, features=None, supported_camera_models=None, *, lazy_images: bool = False
 ) -> Dataset:
+    """
+    Loads the images (and sampling masks) of the dataset.
+
+    Args:
+        dataset: The dataset to load features for (modified in-place).
+        features: The features to load.
+        supported_camera_models: Camera models supported by the method. Images of other cameras are undistorted.
+        lazy_images: If True, the images are not loaded upfront. Instead, ``dataset["images"]`` is a
+            ``LazyImages`` sequence which decodes images on first access and keeps a bounded number of them in memory.
+    
+    Returns:
+        The dataset with loaded features.
+    """
     if features is None:
         features = frozenset(("color",))
     images: List[np.ndarray] = []
     image_sizes = []
-    all_metadata = []
     resize = dataset["metadata"].get("downscale_loaded_factor")
     if resize == 1:
         resize = None
@@ -352,40 +838,32 @@ def dataset_load_features(
     if image_paths_root is not None:
         logging.info(f"Loading images from {image_paths_root}")
 
-    i = 0
-    for p in tqdm(dataset["image_paths"], desc="loading images", dynamic_ncols=True):
+    # Original paths are used to identify cached undistorted images
+    source_image_paths = list(dataset["image_paths"])
+    source_sampling_mask_paths = list(dataset["sampling_mask_paths"]) if dataset["sampling_mask_paths"] is not None else None
+
+    # Images which will be undistorted can be loaded from the undistorted images cache.
+    # Only the image sizes are read for them now and the cache is checked after the intrinsics are rescaled.
+    deferred = set()
+    if not lazy_images and supported_camera_models is not None and _get_undistorted_cache_dir() is not None:
+        supported_models_int = set(camera_model_to_int(x) for x in supported_camera_models)
+        deferred = set(i for i, model in enumerate(dataset["cameras"].camera_models.tolist()) 
+                       if model not in supported_models_int)
+
+    for i, p in enumerate(tqdm(dataset["image_paths"], desc="loading images" if not lazy_images else "reading image sizes", dynamic_ncols=True)):
         if str(p).endswith(".bin"):
             assert dataset["metadata"]["color_space"] == "linear"
-            with open(p, "rb") as f:
-                data_bytes = f.read()
-                h, w = struct.unpack("<II", data_bytes[:8])
-                image = (
-                    np.frombuffer(
-                        data_bytes, dtype=np.float16, count=h * w * 4, offset=8
-                    )
-                    .astype(np.float32)
-                    .reshape([h, w, 4])
-                )
-            metadata = np.array(
-                [np.nan for _ in range(len(METADATA_COLUMNS))], dtype=np.float32
-            )
         else:
             assert dataset["metadata"]["color_space"] == "srgb"
-            pil_image = PIL.Image.open(p)
-            metadata = get_image_metadata(pil_image)
-            if resize is not None:
-                w, h = pil_image.size
-                new_size = round(w/resize), round(h/resize)
-                pil_image = pil_image.resize(new_size, PIL.Image.Resampling.BICUBIC)
-                warnings.warn(f"Resized image with a factor of {resize}")
-
-            image = np.array(pil_image, dtype=np.uint8)
+        if lazy_images or i in deferred:
+            image_sizes.append(list(_read_image_size(p, resize=resize)))
+            continue
+        image = _read_image(p, resize=resize)
         images.append(image)
         image_sizes.append([image.shape[1], image.shape[0]])
-        all_metadata.append(metadata)
-        i += 1
 
-    logging.debug(f"Loaded {len(images)} images")
+    if not lazy_images:
+        logging.debug(f"Loaded {len(images)} images")
 
     if dataset["sampling_mask_paths"] is not None:
         sampling_masks = []
@@ -413,15 +891,43 @@ def dataset_load_features(
                 for p in dataset["sampling_mask_paths"]]
             dataset["sampling_mask_paths_root"] = "/resized-sampling-masks"
 
-    dataset["images"] = images
+    if lazy_images:
+        # NOTE: Paths are read before they are replaced with the resized paths
+        dataset["images"] = LazyImages(source_image_paths, resize=resize)
+    else:
+        # NOTE: Deferred images are added below
+        dataset["images"] = images
 
     # Replace image sizes and metadata
     image_sizes = np.array(image_sizes, dtype=np.int32)
 
     _dataset_rescale_intrinsics(cast(Dataset, dataset), image_sizes)
 
+    cached_undistorted = {}
+    if deferred:
+        # Decode only the images which are not in the undistorted images cache
+        loaded_images = iter(images)
+        images = []
+        for i, p in enumerate(source_image_paths):
+            if i not in deferred:
+                images.append(next(loaded_images))
+                continue
+            _, cached = _lookup_undistorted_cache(
+                dataset["cameras"][i], p, 
+                source_sampling_mask_paths[i] if source_sampling_mask_paths is not None else None,
+                supported_camera_models)
+            if cached is not None:
+                cached_undistorted[i] = cached
+                images.append(cached[1])
+            else:
+                images.append(_read_image(p, resize=resize))
+        dataset["images"] = images
+
     if supported_camera_models is not None:
-        if _dataset_undistort_unsupported(cast(Dataset, dataset), supported_camera_models):
+        if _dataset_undistort_unsupported(cast(Dataset, dataset), supported_camera_models, 
+                                          source_image_paths=source_image_paths, 
+                                          source_sampling_mask_paths=source_sampling_mask_paths,
+                                          cached_undistorted=cached_undistorted):
             logging.warning(
                 "Some cameras models are not supported by the method. Images have been undistorted. Make sure to use the undistorted images for training."
             )
@@ -475,6 +981,8 @@ def dataset_index_select(dataset: TDataset, i: Union[slice, list, np.ndarray]) -
         if isinstance(obj, list):
             indices = np.arange(dataset_len)[i]
             return [obj[i] for i in indices]
+        if isinstance(obj, LazyImages):
+            return obj[i]
         raise ValueError(f"Cannot index object of type {type(obj)} at key {key}")
 
     _dataset = cast(Dict, dataset.copy())
@@ -514,6 +1022,7 @@ def load_dataset(
         features: Optional[FrozenSet[DatasetFeature]] = ...,
         supported_camera_models: Optional[FrozenSet[CameraModel]] = ...,
         load_features: Literal[True] = ...,
+        lazy_images: bool = ...,
         **kwargs) -> Dataset:
     ...
 
@@ -525,10 +1034,35 @@ def load_dataset(
         features: Optional[FrozenSet[DatasetFeature]] = ...,
         supported_camera_models: Optional[FrozenSet[CameraModel]] = ...,
         load_features: Literal[False] = ...,
+        lazy_images: bool = ...,
         **kwargs) -> UnloadedDataset:
     ...
 
 
+@overload
+def load_dataset_splits(
+        path: Union[Path, str], 
+        splits: Sequence[str] = ...,
+        features: Optional[FrozenSet[DatasetFeature]] = ...,
+        supported_camera_models: Optional[FrozenSet[CameraModel]] = ...,
+        load_features: Literal[True] = ...,
+        lazy_images: bool = ...,
+        **kwargs) -> Dict[str, Dataset]:
+    ...
+
+
+@overload
+def load_dataset_splits(
+        path: Union[Path, str], 
+        splits: Sequence[str] = ...,
+        features: Optional[FrozenSet[DatasetFeature]] = ...,
+        supported_camera_models: Optional[FrozenSet[CameraModel]] = ...,
+        load_features: Literal[False] = ...,
+        lazy_images: bool = ...,
+        **kwargs) -> Dict[str, UnloadedDataset]:
+    ...
+
+
 def _resolve_loader(loader):
     if loader in get_supported_dataset_loaders():
         loader = get_dataset_loader_spec(loader)["load_dataset_function"]
@@ -607,9 +1141,75 @@ def _load_unknown_dataset(path, **kwargs):
     return loader, dataset
 
 
+_DOWNLOAD_BLOCK_SIZE = 1024 * 1024  # 1 MiB
+_download_session = None
+_download_session_lock = threading.Lock()
+
+
+def _get_download_workers() -> int:
+    return max(1, int(os.environ.get("NERFBASELINES_DOWNLOAD_WORKERS", 4)))
+
+
+def _get_download_session():
+    """
+    Returns a ``requests.Session`` shared by all dataset downloads. The connection pool
+    is sized for the number of parallel download workers.
+    """
+    global _download_session
+    with _download_session_lock:
+        if _download_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=_get_download_workers())
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _download_session = session
+        return _download_session
+
+
+def _download_scenes(fn, scenes: List[str], dataset_name: str, output: str, *, max_attempts: int = 2, **kwargs):
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    num_workers = min(_get_download_workers(), len(scenes))
+    errors: Dict[str, BaseException] = {}
+    pending = list(scenes)
+    with tqdm(total=len(scenes), unit="scene", desc=f"Downloading {dataset_name}", dynamic_ncols=True) as progress_bar, \
+            ThreadPoolExecutor(max_workers=max(1, num_workers)) as executor:
+        for attempt in range(max_attempts):
+            futures = {
+                executor.submit(fn, f"{dataset_name}/{scene}", os.path.join(output, scene), **kwargs): scene
+                for scene in pending
+            }
+            pending = []
+            for future in as_completed(futures):
+                scene = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    # Other scenes continue downloading, the failed ones are retried at the end
+                    errors[scene] = e
+                    pending.append(scene)
+                    if attempt + 1 < max_attempts:
+                        logging.warning(f"Failed to download {dataset_name}/{scene} ({e}), it will be retried")
+                    else:
+                        logging.error(f"Failed to download {dataset_name}/{scene}: {e}")
+                else:
+                    errors.pop(scene, None)
+                    progress_bar.update(1)
+            if not pending:
+                break
+    if pending:
+        pending = [x for x in scenes if x in errors]
+        raise RuntimeError(f"Failed to download scenes {', '.join(pending)} of {dataset_name}") from errors[pending[-1]]
+
+
 def download_dataset_wrapper(all_scenes: Iterable[str], dataset_name: str):
     """
     Wraps a function which downloads a single scene into a function which downloads multiple scenes.
+    Scenes are downloaded in parallel (``NERFBASELINES_DOWNLOAD_WORKERS`` workers, 4 by default).
+    A failed scene does not interrupt the other downloads and it is retried after they finish.
 
     Args:
         all_scenes: Supported scenes.
@@ -628,115 +1228,409 @@ def download_dataset_wrapper(all_scenes: Iterable[str], dataset_name: str):
             else:
                 if path != dataset_name:
                     raise DatasetNotFoundError(f"Dataset {path} does not start with {dataset_name}")
-                for scene in all_scenes:
-                    fn(f"{path}/{scene}", os.path.join(output, scene), **kwargs)
+                _download_scenes(fn, all_scenes, path, output, **kwargs)
         return download_dataset
     return wrap
 
 
-def download_archive_dataset(url: str,
-                             output: str,
-                             *,
-                             archive_prefix: Optional[str],
-                             nb_info: Dict[str, Any],
-                             callback=None,
-                             file_type = None):
-    response = requests.get(url, stream=True)
-    response.raise_for_status()
-    total_size_in_bytes = int(response.headers.get("content-length", 0))
-    block_size = 1024  # 1 Kibibyte
+class _PartialDownloadRestarted(RuntimeError):
+    pass
+
+
+class _PartialDownload:
+    """
+    Tracks a download into a persistent partial file. Readers returned from :meth:`open`
+    can consume the file while it is still being downloaded. The validator of the remote
+    file (ETag/Last-Modified) is stored next to the partial file (``{path}.json``), so that
+    a later resume can detect that the remote file changed.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.validator_path = path + ".json"
+        self.condition = threading.Condition()
+        self.size = os.path.getsize(path) if os.path.exists(path) else 0
+        self.finished = False
+        self.error: Optional[BaseException] = None
+        self.restarts = 0
+
+    def open(self) -> "_PartialDownloadReader":
+        return _PartialDownloadReader(self)
+
+    def load_validator(self) -> Dict[str, Any]:
+        try:
+            with open(self.validator_path, "r", encoding="utf8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_validator(self, validator: Dict[str, Any]):
+        with open(self.validator_path, "w", encoding="utf8") as f:
+            json.dump(validator, f)
+
+    def restart(self, file):
+        # Readers which already consumed the old content fail with _PartialDownloadRestarted
+        with self.condition:
+            file.seek(0)
+            file.truncate(0)
+            self.size = 0
+            self.restarts += 1
+            self.condition.notify_all()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.validator_path)
+
+    def remove(self):
+        for path in (self.path, self.validator_path):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
+    def _notify(self, size=None, finished=False, error=None):
+        with self.condition:
+            if size is not None:
+                self.size = size
+            self.finished = self.finished or finished
+            if error is not None:
+                self.error = error
+            self.condition.notify_all()
+
+
+class _PartialDownloadReader(io.RawIOBase):
+    def __init__(self, download: _PartialDownload):
+        super().__init__()
+        self._download = download
+        self._file = open(download.path, "rb")
+        self._restarts = download.restarts
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):  # type: ignore
+        while True:
+            with self._download.condition:
+                if self._download.restarts != self._restarts:
+                    raise _PartialDownloadRestarted("The download was restarted")
+                available = self._download.size - self._file.tell()
+                if available <= 0:
+                    if self._download.error is not None:
+                        raise RuntimeError("Download failed") from self._download.error
+                    if self._download.finished:
+                        return 0
+                    self._download.condition.wait(1.0)
+                    continue
+                # The file is read under the lock so that it cannot be truncated meanwhile
+                view = memoryview(b)[:available]
+                return self._file.readinto(view)
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def _get_response_validator(response) -> Dict[str, Any]:
+    """
+    Extracts the validator (ETag/Last-Modified, size and checksums) of the remote file
+    from the headers of a full (200) response.
+    """
+    headers = response.headers
+    validator: Dict[str, Any] = {}
+    etag = headers.get("etag")
+    # Weak ETags cannot be used in If-Range requests
+    if etag and not etag.startswith("W/"):
+        validator["etag"] = etag
+    if headers.get("last-modified"):
+        validator["last_modified"] = headers["last-modified"]
+    if headers.get("content-length", "").isdigit():
+        validator["size"] = int(headers["content-length"])
+
+    # Google Cloud Storage reports the MD5 of the object
+    md5 = headers.get("content-md5")
+    for part in headers.get("x-goog-hash", "").split(","):
+        if part.strip().startswith("md5="):
+            md5 = part.strip()[len("md5="):]
+    if md5:
+        with contextlib.suppress(ValueError):
+            validator["md5"] = base64.b64decode(md5).hex()
+
+    # Hugging Face reports the SHA256 of LFS files in the redirect response
+    for res in list(response.history) + [response]:
+        linked_etag = res.headers.get("x-linked-etag", "")
+        linked_etag = linked_etag[len("W/"):] if linked_etag.startswith("W/") else linked_etag
+        linked_etag = linked_etag.strip('"')
+        if re.fullmatch(r"[0-9a-f]{64}", linked_etag):
+            validator["sha256"] = linked_etag
+    return validator
+
+
+def _download_file(url: str,
+                   download: _PartialDownload,
+                   *,
+                   session=None,
+                   max_retries: int = 5,
+                   block_size: int = _DOWNLOAD_BLOCK_SIZE,
+                   desc: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Downloads a file into ``download.path``. If the partial file already exists,
+    the download is resumed using HTTP Range requests guarded by ``If-Range``, so that
+    a partial file of an older version of the remote file is never extended. If the server
+    responds with the full file instead, the download restarts from zero. Failed transfers
+    are retried from the last received byte.
+
+    Returns:
+        The validator of the remote file (ETag/Last-Modified, size, and checksums
+        reported by the server, if any).
+    """
+    import requests
+
+    if session is None:
+        session = _get_download_session()
+
     progress_bar = tqdm(
-        total=total_size_in_bytes,
+        total=None,
+        initial=download.size,
         unit="iB",
         unit_scale=True,
-        desc=f"Downloading {url.split('/')[-1]}", 
+        desc=desc or f"Downloading {url.split('/')[-1]}",
         dynamic_ncols=True,
     )
-    with tempfile.TemporaryFile("rb+") as file:
-        for data in response.iter_content(block_size):
-            progress_bar.update(len(data))
-            file.write(data)
-        file.flush()
-        file.seek(0)
+    retries = 0
+    validator = download.load_validator()
+    total_size = validator.get("size")
+    try:
+        with open(download.path, "ab") as file:
+            while True:
+                offset = file.tell()
+                headers = {}
+                if offset > 0:
+                    if_range = validator.get("etag") or validator.get("last_modified")
+                    if if_range is None:
+                        # Without a validator, we cannot tell if the partial file matches the remote file
+                        logging.warning(f"Cannot resume download of {url}, the server does not provide ETag or Last-Modified")
+                        download.restart(file)
+                        progress_bar.reset()
+                        offset = 0
+                    else:
+                        headers = {"Range": f"bytes={offset}-", "If-Range": if_range}
+                try:
+                    with session.get(url, stream=True, headers=headers, timeout=(30, 120)) as response:
+                        if response.status_code == 416 and offset > 0:
+                            if validator.get("size") == offset:
+                                # The partial file is already complete
+                                total_size = offset
+                                break
+                            # The remote file is now smaller than the partial file
+                            download.restart(file)
+                            progress_bar.reset()
+                            validator = {}
+                            continue
+                        response.raise_for_status()
+                        if response.status_code == 206:
+                            match = re.fullmatch(r"bytes (\d+)-\d+/(\d+|\*)", response.headers.get("content-range", "").strip())
+                            if match is not None and match.group(2) != "*":
+                                total_size = int(match.group(2))
+                            if match is None or int(match.group(1)) != offset or validator.get("size") not in (None, total_size):
+                                logging.warning(f"Unexpected Content-Range {response.headers.get('content-range')} for {url}, restarting the download")
+                                download.restart(file)
+                                progress_bar.reset()
+                                validator = {}
+                                continue
+                        else:
+                            if offset > 0:
+                                # The remote file changed or the server does not support ranges
+                                logging.warning(f"Server sent the full content of {url}, restarting the download")
+                                download.restart(file)
+                                progress_bar.reset()
+                            validator = _get_response_validator(response)
+                            total_size = validator.get("size")
+                            download.save_validator(validator)
+                        if total_size is not None:
+                            progress_bar.total = total_size
+                            progress_bar.refresh()
+                        for data in response.iter_content(block_size):
+                            file.write(data)
+                            file.flush()
+                            progress_bar.update(len(data))
+                            download._notify(size=file.tell())
+                    if total_size is None or file.tell() >= total_size:
+                        break
+                    raise RuntimeError(f"Connection closed after {file.tell()} bytes out of {total_size} bytes.")
+                except Exception as e:
+                    if isinstance(e, requests.HTTPError) and e.response is not None and e.response.status_code < 500:
+                        raise
+                    if file.tell() > offset:
+                        # Some progress was made, the connection is not completely broken
+                        retries = 0
+                    retries += 1
+                    if retries > max_retries:
+                        raise
+                    logging.warning(f"Download of {url} failed ({e}), retrying ({retries}/{max_retries})")
+                    time.sleep(min(2 ** retries, 30))
+        if total_size is not None and download.size != total_size:
+            raise RuntimeError(f"Failed to download {url}. {download.size} bytes downloaded out of {total_size} bytes.")
+    except BaseException as e:
+        download._notify(error=e)
+        raise
+    finally:
         progress_bar.close()
-        if total_size_in_bytes != 0 and progress_bar.n != total_size_in_bytes:  # noqa: PLR1714
-            logging.error(
-                f"Failed to download dataset. {progress_bar.n} bytes downloaded out of {total_size_in_bytes} bytes."
-            )
+    download._notify(finished=True)
+    return validator
 
-        has_any = False
-        if file_type is None:
-            if url.split("?")[0].split("#")[0].endswith(".tar.gz"):
-                file_type = "tar.gz"
-            elif url.split("?")[0].split("#")[0].endswith(".zip"):
-                file_type = "zip"
-            else:
-                raise RuntimeError(f"Unknown file type for {url}")
-        output_tmp = output + ".tmp"
-        os.makedirs(output_tmp, exist_ok=True)
-        if file_type == "tar.gz":
-            import tarfile
-            with tarfile.open(fileobj=file, mode="r:gz") as z:
-                def members(tf):
-                    nonlocal has_any
-                    nonlocal archive_prefix
-                    if archive_prefix is None:
-                        # We estimate archive prefix as the common prefix of all files
-                        archive_prefix = os.path.commonprefix([member.path for member in tf.getmembers() if not member.isdir()])
-                    for member in tf.getmembers():
-                        if not member.path.startswith(archive_prefix):
-                            continue
-                        has_any = True
-                        member.path = member.path[len(archive_prefix):]
-                        yield member
-
-                z.extractall(output_tmp, members=members(z))
-        elif file_type == "zip":
-            import zipfile
-            with zipfile.ZipFile(file, "r") as z:
-                if archive_prefix is None:
-                    # We estimate archive prefix as the common prefix of all files
-                    archive_prefix = os.path.commonprefix([member.filename for member in z.infolist() if not member.is_dir()])
-                for member in z.infolist():
-                    if not member.filename.startswith(archive_prefix):
-                        continue
-                    relname = member.filename[len(archive_prefix):]
-                    target = os.path.join(output_tmp, relname)
-                    if member.is_dir():
-                        os.makedirs(target, exist_ok=True)
-                    else:
-                        os.makedirs(os.path.dirname(target), exist_ok=True)
-                        member.filename = relname
-                        z.extract(member, output_tmp)
-                        has_any = True
-
-                        # Fix mtime
-                        date_time = datetime(*member.date_time)
-                        mtime = time.mktime(date_time.timetuple())
-                        os.utime(target, (mtime, mtime))
-        else:
-            raise RuntimeError(f"Unknown file type {file_type}")
-        if not has_any:
-            raise RuntimeError(f"Prefix '{archive_prefix}' not found in {url}.")
 
-        with open(os.path.join(str(output_tmp), "nb-info.json"), "w", encoding="utf8") as f2:
-            json.dump(nb_info, f2)
+def _verify_checksum(path: str, algorithm: str, digest: str):
+    hasher = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for data in iter(lambda: f.read(_DOWNLOAD_BLOCK_SIZE), b""):
+            hasher.update(data)
+    if hasher.hexdigest() != digest.lower():
+        raise RuntimeError(f"Checksum mismatch for {path}: expected {algorithm} {digest}, got {hasher.hexdigest()}")
 
-        if callback is not None:
-            callback(output_tmp)
 
-        shutil.rmtree(output, ignore_errors=True)
-        shutil.move(str(output_tmp), str(output))
+def _extract_tar_stream(fileobj, output: str, archive_prefix: str) -> bool:
+    import tarfile
 
+    has_any = False
+    # Streaming mode reads the archive sequentially, members are extracted as they arrive
+    with tarfile.open(fileobj=fileobj, mode="r|gz") as z:
+        for member in z:
+            if not member.path.startswith(archive_prefix):
+                continue
+            has_any = True
+            member.path = member.path[len(archive_prefix):]
+            z.extract(member, output)
+    return has_any
 
-def load_dataset(
-        path: Union[Path, str], 
-        split: str, 
-        features: Optional[FrozenSet[DatasetFeature]] = None,
-        supported_camera_models: Optional[FrozenSet[CameraModel]] = None,
-        load_features: bool = True,
-        **kwargs,
-        ) -> Union[Dataset, UnloadedDataset]:
+
+def download_archive_dataset(url: str,
+                             output: str,
+                             *,
+                             archive_prefix: Optional[str],
+                             nb_info: Dict[str, Any],
+                             callback=None,
+                             file_type = None,
+                             sha256: Optional[str] = None,
+                             session=None):
+    """
+    Downloads and extracts an archive (zip or tar.gz) into the output directory.
+    The archive is downloaded into a persistent partial file next to the output (``{output}.part``),
+    so interrupted downloads are resumed. For tar.gz archives with a known prefix, members are
+    extracted while the archive is still being downloaded. The archive is verified against
+    the ``sha256`` checksum if provided, otherwise against the checksum reported by the server
+    (if any) and its Content-Length.
+
+    Args:
+        url: URL of the archive.
+        output: Output directory.
+        archive_prefix: Prefix of the files in the archive to extract (it is stripped from the paths).
+            If None, the common prefix of all files is used.
+        nb_info: Dataset info to be stored in ``nb-info.json``.
+        callback: Optional function called with the temporary output directory before it is moved in place.
+        file_type: Archive type (``zip`` or ``tar.gz``). If None, it is inferred from the URL.
+        sha256: Optional checksum of the archive. Overrides the checksum reported by the server.
+        session: Optional ``requests.Session`` used for the download. Defaults to a shared pooled session.
+    """
+    if file_type is None:
+        if url.split("?")[0].split("#")[0].endswith(".tar.gz"):
+            file_type = "tar.gz"
+        elif url.split("?")[0].split("#")[0].endswith(".zip"):
+            file_type = "zip"
+        else:
+            raise RuntimeError(f"Unknown file type for {url}")
+    if file_type not in ("tar.gz", "zip"):
+        raise RuntimeError(f"Unknown file type {file_type}")
+
+    output_tmp = output + ".tmp"
+    shutil.rmtree(output_tmp, ignore_errors=True)
+    os.makedirs(output_tmp, exist_ok=True)
+    partial_path = output + ".part"
+    os.makedirs(os.path.dirname(os.path.abspath(partial_path)), exist_ok=True)
+    open(partial_path, "ab").close()
+    download = _PartialDownload(partial_path)
+
+    has_any = False
+    extracted = False
+    if file_type == "tar.gz" and archive_prefix is not None:
+        # Extract the archive concurrently with the download
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=1) as executor, download.open() as reader:
+            future = executor.submit(_extract_tar_stream, io.BufferedReader(reader, _DOWNLOAD_BLOCK_SIZE), output_tmp, archive_prefix)
+            try:
+                validator = _download_file(url, download, session=session)
+            finally:
+                try:
+                    has_any = future.result() if download.error is None else False
+                    extracted = True
+                except _PartialDownloadRestarted:
+                    # The remote file changed during the download, it is extracted after the download
+                    shutil.rmtree(output_tmp, ignore_errors=True)
+                    os.makedirs(output_tmp, exist_ok=True)
+    else:
+        validator = _download_file(url, download, session=session)
+
+    # Use the checksum reported by the server if no checksum is provided
+    checksums = [("sha256", sha256)] if sha256 is not None else [
+        (algorithm, validator[algorithm]) for algorithm in ("sha256", "md5") if algorithm in validator]
+    for algorithm, digest in checksums:
+        try:
+            _verify_checksum(partial_path, algorithm, digest)
+        except Exception:
+            download.remove()
+            raise
+
+    if file_type == "tar.gz" and not extracted:
+        import tarfile
+        with tarfile.open(partial_path, mode="r:gz") as z:
+            def members(tf):
+                nonlocal has_any
+                nonlocal archive_prefix
+                if archive_prefix is None:
+                    # We estimate archive prefix as the common prefix of all files
+                    archive_prefix = os.path.commonprefix([member.path for member in tf.getmembers() if not member.isdir()])
+                for member in tf.getmembers():
+                    if not member.path.startswith(archive_prefix):
+                        continue
+                    has_any = True
+                    member.path = member.path[len(archive_prefix):]
+                    yield member
+
+            z.extractall(output_tmp, members=members(z))
+    elif file_type == "zip":
+        # Zip archives store the directory at the end, they can only be extracted after the download
+        import zipfile
+        with zipfile.ZipFile(partial_path, "r") as z:
+            if archive_prefix is None:
+                # We estimate archive prefix as the common prefix of all files
+                archive_prefix = os.path.commonprefix([member.filename for member in z.infolist() if not member.is_dir()])
+            for member in z.infolist():
+                if not member.filename.startswith(archive_prefix):
+                    continue
+                relname = member.filename[len(archive_prefix):]
+                target = os.path.join(output_tmp, relname)
+                if member.is_dir():
+                    os.makedirs(target, exist_ok=True)
+                else:
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    member.filename = relname
+                    z.extract(member, output_tmp)
+                    has_any = True
+
+                    # Fix mtime
+                    date_time = datetime(*member.date_time)
+                    mtime = time.mktime(date_time.timetuple())
+                    os.utime(target, (mtime, mtime))
+    if not has_any:
+        raise RuntimeError(f"Prefix '{archive_prefix}' not found in {url}.")
+
+    with open(os.path.join(str(output_tmp), "nb-info.json"), "w", encoding="utf8") as f2:
+        json.dump(nb_info, f2)
+
+    if callback is not None:
+        callback(output_tmp)
+
+    shutil.rmtree(output, ignore_errors=True)
+    shutil.move(str(output_tmp), str(output))
+    download.remove()
+
+
+def _prepare_load_dataset(path: Union[Path, str], features: Optional[FrozenSet[DatasetFeature]], kwargs: Dict[str, Any]):
     path = str(path)
     path, _kwargs = experimental_parse_dataset_path(path)
     _kwargs.update(kwargs)
@@ -777,9 +1671,12 @@ def load_dataset(
         for k, v in (loader_kwargs or {}).items():
             if k not in kwargs:
                 kwargs[k] = v
+    return path, loader, meta, kwargs
 
+
+def _load_dataset_split(path: str, split: str, loader: Optional[str], meta: Dict[str, Any], kwargs: Dict[str, Any]):
     # Add split back to kwargs
-    kwargs["split"] = split
+    kwargs = dict(kwargs, split=split)
 
     # If loader is None, try detecting a dataset
     if loader is None:
@@ -795,7 +1692,7 @@ def load_dataset(
     # Dataset loaded successfully
     # Now we apply the postprocessing
     # We update the metadata from nb-info.json
-    dataset_instance["metadata"].update(meta)
+    dataset_instance["metadata"].update(copy.deepcopy(meta))
     if split == "train":
         # For train split, we compute additional metadata
         dataset_type = dataset_instance["metadata"].get("type", None)
@@ -818,7 +1715,68 @@ def load_dataset(
             if dataset_instance["metadata"].get("evaluation_protocol", "default") != eval_protocol:
                 raise RuntimeError(f"Evaluation protocol mismatch: {dataset_instance['metadata']['evaluation_protocol']} != {eval_protocol}")
             dataset_instance["metadata"]["evaluation_protocol"] = eval_protocol
+    return loader, dataset_instance
+
 
+def load_dataset(
+        path: Union[Path, str], 
+        split: str, 
+        features: Optional[FrozenSet[DatasetFeature]] = None,
+        supported_camera_models: Optional[FrozenSet[CameraModel]] = None,
+        load_features: bool = True,
+        lazy_images: bool = False,
+        **kwargs,
+        ) -> Union[Dataset, UnloadedDataset]:
+    path, loader, meta, kwargs = _prepare_load_dataset(path, features, kwargs)
+    _, dataset_instance = _load_dataset_split(path, split, loader, meta, kwargs)
     if load_features:
-        return dataset_load_features(dataset_instance, features=kwargs["features"], supported_camera_models=supported_camera_models)
+        return dataset_load_features(dataset_instance, features=kwargs["features"], supported_camera_models=supported_camera_models, lazy_images=lazy_images)
     return dataset_instance
+
+
+def load_dataset_splits(
+        path: Union[Path, str], 
+        splits: Sequence[str] = ("train", "test"),
+        features: Optional[FrozenSet[DatasetFeature]] = None,
+        supported_camera_models: Optional[FrozenSet[CameraModel]] = None,
+        load_features: bool = True,
+        lazy_images: bool = False,
+        **kwargs,
+        ) -> Union[Dict[str, Dataset], Dict[str, UnloadedDataset]]:
+    """
+    Loads multiple splits of a dataset. Unlike calling ``load_dataset`` for each split,
+    the dataset metadata is read once, the dataset format is detected once, the scene
+    description files (e.g., COLMAP reconstruction) are parsed once, and the features of
+    all splits are loaded in parallel.
+
+    Args:
+        path: Path to the dataset.
+        splits: Splits to load.
+        features: Features to load.
+        supported_camera_models: Camera models supported by the method. Images of other cameras are undistorted.
+        load_features: If True, the images (and other features) are loaded.
+        lazy_images: If True, the images are loaded lazily (see ``dataset_load_features``).
+        **kwargs: Additional arguments passed to the dataset loader.
+
+    Returns:
+        A dictionary mapping split names to the loaded datasets.
+    """
+    path, loader, meta, kwargs = _prepare_load_dataset(path, features, kwargs)
+    datasets: Dict[str, Any] = {}
+    with _parse_cache_scope():
+        for split in splits:
+            # The detected loader is reused for the following splits
+            loader, datasets[split] = _load_dataset_split(path, split, loader, meta, kwargs)
+    if not load_features:
+        return datasets
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=max(1, len(datasets))) as executor:
+        futures = {
+            split: executor.submit(dataset_load_features, dataset, 
+                                   features=kwargs["features"], 
+                                   supported_camera_models=supported_camera_models, 
+                                   lazy_images=lazy_images)
+            for split, dataset in datasets.items()
+        }
+        return {split: future.result() for split, future in futures.items()}
@@ -7,7 +7,7 @@ import numpy as np
 from nerfbaselines import DatasetFeature, CameraModel, camera_model_to_int, new_cameras, DatasetNotFoundError, new_dataset
 from ..utils import Indices
 from . import _colmap_utils as colmap_utils
-from ._common import padded_stack, dataset_index_select
+from ._common import padded_stack, dataset_index_select, cached_parse
 
 
 def _parse_colmap_camera_params(camera: colmap_utils.Camera) -> Tuple[np.ndarray, int, np.ndarray, Tuple[int, int]]:
@@ -250,18 +250,18 @@ def load_colmap_dataset(path: Union[Path, str],
         raise DatasetNotFoundError(f"Missing '{rel_images_path}' folder in COLMAP dataset")
 
     if (colmap_path / "cameras.bin").exists():
-        colmap_cameras = colmap_utils.read_cameras_binary(colmap_path / "cameras.bin")
+        colmap_cameras = cached_parse(colmap_utils.read_cameras_binary, colmap_path / "cameras.bin")
     elif (colmap_path / "cameras.txt").exists():
-        colmap_cameras = colmap_utils.read_cameras_text(colmap_path / "cameras.txt")
+        colmap_cameras = cached_parse(colmap_utils.read_cameras_text, colmap_path / "cameras.txt")
     else:
         raise DatasetNotFoundError("Missing 'sparse/0/cameras.{bin,txt}' file in COLMAP dataset")
 
     if not (colmap_path / "images.bin").exists() and not (colmap_path / "images.txt").exists():
         raise DatasetNotFoundError("Missing 'sparse/0/images.{bin,txt}' file in COLMAP dataset")
     if (colmap_path / "images.bin").exists():
-        images = colmap_utils.read_images_binary(colmap_path / "images.bin")
+        images = cached_parse(colmap_utils.read_images_binary, colmap_path / "images.bin")
     elif (colmap_path / "images.txt").exists():
-        images = colmap_utils.read_images_text(colmap_path / "images.txt")
+        images = cached_parse(colmap_utils.read_images_text, colmap_path / "images.txt")
     else:
         raise DatasetNotFoundError("Missing 'sparse/0/images.{bin,txt}' file in COLMAP dataset")
 
@@ -270,9 +270,9 @@ def load_colmap_dataset(path: Union[Path, str],
         if not (colmap_path / "points3D.bin").exists() and not (colmap_path / "points3D.txt").exists():
             raise DatasetNotFoundError("Missing 'sparse/0/points3D.{bin,txt}' file in COLMAP dataset")
         if (colmap_path / "points3D.bin").exists():
-            points3D = colmap_utils.read_points3D_binary(colmap_path / "points3D.bin")
+            points3D = cached_parse(colmap_utils.read_points3D_binary, colmap_path / "points3D.bin")
         elif (colmap_path / "points3D.txt").exists():
-            points3D = colmap_utils.read_points3D_text(colmap_path / "points3D.txt")
+            points3D = cached_parse(colmap_utils.read_points3D_text, colmap_path / "points3D.txt")
         else:
             raise DatasetNotFoundError("Missing 'sparse/0/points3D.{bin,txt}' file in COLMAP dataset")
 
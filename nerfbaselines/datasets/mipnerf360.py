@@ -1,18 +1,17 @@
 import json
 import os
 import warnings
-from typing import List, Tuple, Union
+from typing import Dict, Union
 import logging
-from itertools import groupby
 import shutil
-import requests
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 import numpy as np
 import zipfile
-from tqdm import tqdm
-import tempfile
 from nerfbaselines import DatasetNotFoundError
 from ._common import single, dataset_index_select
+from ._common import _PartialDownload, _download_file, _download_scenes, _verify_checksum
 from .colmap import load_colmap_dataset
 
 
@@ -29,6 +28,14 @@ _scenes360_res = {
     "room": 2,
 }
 SCENES = set(_scenes360_res.keys())
+_URLS = {
+    "base": "https://storage.googleapis.com/gresearch/refraw360/360_v2.zip",
+    "extra": "https://storage.googleapis.com/gresearch/refraw360/360_extra_scenes.zip",
+}
+
+
+def _get_scene_url(scene: str) -> str:
+    return _URLS["extra"] if scene in {"flowers", "treehill"} else _URLS["base"]
 
 
 def load_mipnerf360_dataset(path, *args, **kwargs):
@@ -55,86 +62,119 @@ def _save_colmap_splits(output):
                 f.write(os.path.relpath(img_name, dataset["image_paths_root"]) + "\n")
 
 
+def _extract_scene(archive_path: str, scene: str, output: str):
+    output_tmp = output + ".tmp"
+    shutil.rmtree(output_tmp, ignore_errors=True)
+    os.makedirs(output_tmp, exist_ok=True)
+    has_any = False
+    with zipfile.ZipFile(archive_path) as z:
+        for info in z.infolist():
+            if not info.filename.startswith(scene + "/"):
+                continue
+            has_any = True
+            relname = info.filename[len(scene) + 1 :]
+            target = os.path.join(output_tmp, relname)
+            if info.is_dir():
+                os.makedirs(target, exist_ok=True)
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with z.open(info) as source, open(target, "wb") as target_file:
+                    shutil.copyfileobj(source, target_file)
+    if not has_any:
+        raise RuntimeError(f"Capture '{scene}' not found in {archive_path}.")
+
+    res = _scenes360_res[scene]
+    images_path = "images" if res == 1 else f"images_{res}"
+
+    with open(os.path.join(output_tmp, "nb-info.json"), "w", encoding="utf8") as f:
+        json.dump({
+            "loader": "colmap",
+            "loader_kwargs": {
+                "images_path": images_path,
+            },
+            "id": DATASET_NAME,
+            "scene": scene,
+            "downscale_factor": res,
+            "evaluation_protocol": "nerf",
+            "type": "object-centric",
+        }, f)
+
+    # Generate split files
+    _save_colmap_splits(output_tmp)
+
+    shutil.rmtree(output, ignore_errors=True)
+    shutil.move(output_tmp, output)
+    logging.info(f"Downloaded {DATASET_NAME}/{scene} to {output}")
+
+
+class _SharedArchives:
+    """
+    Downloads the archives shared by multiple scenes concurrently. Each archive is downloaded
+    once, failed downloads are started again when a scene requests the archive again.
+    """
+    def __init__(self, executor, archive_dir: str):
+        self._executor = executor
+        self._archive_dir = archive_dir
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _download(self, url: str) -> str:
+        download = _PartialDownload(os.path.join(self._archive_dir, url.split("/")[-1] + ".part"))
+        validator = _download_file(url, download)
+        for algorithm in ("sha256", "md5"):
+            if algorithm in validator:
+                try:
+                    _verify_checksum(download.path, algorithm, validator[algorithm])
+                except Exception:
+                    download.remove()
+                    raise
+        return download.path
+
+    def submit(self, url: str) -> Future:
+        with self._lock:
+            future = self._futures.get(url)
+            if future is None or (future.done() and future.exception() is not None):
+                future = self._futures[url] = self._executor.submit(self._download, url)
+            return future
+
+    def remove(self):
+        for url in self._futures:
+            _PartialDownload(os.path.join(self._archive_dir, url.split("/")[-1] + ".part")).remove()
+
+
 def download_mipnerf360_dataset(path: str, output: Union[Path, str]):
-    url_extra = "https://storage.googleapis.com/gresearch/refraw360/360_extra_scenes.zip"
-    url_base = "http://storage.googleapis.com/gresearch/refraw360/360_v2.zip"
-    output = Path(output)
+    output = str(output)
     if not path.startswith(f"{DATASET_NAME}/") and path != DATASET_NAME:
         raise DatasetNotFoundError(f"Dataset path must be equal to '{DATASET_NAME}' or must start with '{DATASET_NAME}/'.")
 
-    captures: List[Tuple[str, Path]] = []
     if path == DATASET_NAME:
-        # We will download all faster here
-        for x in _scenes360_res:
-            captures.append((x, output / x))
+        scenes = sorted(_scenes360_res.keys())
+        archive_dir = output
     else:
-        captures = [(path[len(f"{DATASET_NAME}/") :], output)]
-    captures_to_download: List[Tuple[str, str, Path]] = []
-    for scene, output in captures:
+        scenes = [path[len(f"{DATASET_NAME}/") :]]
+        archive_dir = os.path.dirname(os.path.abspath(output))
+    for scene in scenes:
         if scene not in _scenes360_res:
             raise DatasetNotFoundError(f"Capture '{scene}' not a valid {DATASET_NAME} scene.")
-        url = url_extra if scene in {"flowers", "treehill"} else url_base
-        captures_to_download.append((url, scene, output))
-    captures_to_download.sort(key=lambda x: x[0])
-    for url, _captures in groupby(captures_to_download, key=lambda x: x[0]):
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        total_size_in_bytes = int(response.headers.get("content-length", 0))
-        block_size = 1024  # 1 Kibibyte
-        progress_bar = tqdm(total=total_size_in_bytes, unit="iB", unit_scale=True, desc=f"Downloading {url.split('/')[-1]}", dynamic_ncols=True)
-        with tempfile.TemporaryFile("rb+") as file:
-            for data in response.iter_content(block_size):
-                progress_bar.update(len(data))
-                file.write(data)
-            file.flush()
-            file.seek(0)
-            progress_bar.close()
-            if total_size_in_bytes != 0 and progress_bar.n != total_size_in_bytes:
-                logging.error(f"Failed to download dataset. {progress_bar.n} bytes downloaded out of {total_size_in_bytes} bytes.")
-
-            has_any = False
-            with zipfile.ZipFile(file) as z:
-                for _, scene, output in _captures:
-                    output_tmp = output.with_suffix(".tmp")
-                    output_tmp.mkdir(exist_ok=True, parents=True)
-                    for info in z.infolist():
-                        if not info.filename.startswith(scene + "/"):
-                            continue
-                        # z.extract(name, output_tmp)
-                        has_any = True
-                        relname = info.filename[len(scene) + 1 :]
-                        target = output_tmp / relname
-                        target.parent.mkdir(exist_ok=True, parents=True)
-                        if info.is_dir():
-                            target.mkdir(exist_ok=True, parents=True)
-                        else:
-                            with z.open(info) as source, open(target, "wb") as target:
-                                shutil.copyfileobj(source, target)
-                    if not has_any:
-                        raise RuntimeError(f"Capture '{scene}' not found in {url}.")
-
-                    res = _scenes360_res[scene]
-                    images_path = "images" if res == 1 else f"images_{res}"
-
-                    with open(os.path.join(str(output_tmp), "nb-info.json"), "w", encoding="utf8") as f:
-                        json.dump({
-                            "loader": "colmap",
-                            "loader_kwargs": {
-                                "images_path": images_path,
-                            },
-                            "id": DATASET_NAME,
-                            "scene": scene,
-                            "downscale_factor": res,
-                            "evaluation_protocol": "nerf",
-                            "type": "object-centric",
-                        }, f)
-
-                    # Generate split files
-                    _save_colmap_splits(output_tmp)
-
-                    shutil.rmtree(output, ignore_errors=True)
-                    shutil.move(str(output_tmp), str(output))
-                    logging.info(f"Downloaded {DATASET_NAME}/{scene} to {output}")
+    os.makedirs(archive_dir, exist_ok=True)
+
+    # Both archives are downloaded concurrently into persistent partial files (resumed on failure)
+    # and scenes are extracted as soon as their archive is complete
+    with ThreadPoolExecutor(max_workers=len(_URLS)) as executor:
+        archives = _SharedArchives(executor, archive_dir)
+        for scene in scenes:
+            archives.submit(_get_scene_url(scene))
+
+        def extract(scene_path: str, scene_output: str):
+            scene = scene_path[len(f"{DATASET_NAME}/") :]
+            archive_path = archives.submit(_get_scene_url(scene)).result()
+            _extract_scene(archive_path, scene, scene_output)
+
+        if path == DATASET_NAME:
+            _download_scenes(extract, scenes, DATASET_NAME, output)
+        else:
+            extract(path, output)
+    archives.remove()
 
 
 __all__ = ["download_mipnerf360_dataset"]
@@ -1,5 +1,6 @@
 import importlib
-from contextlib import contextmanager
+import hashlib
+from contextlib import contextmanager, ExitStack
 import zipfile
 import tarfile
 import time
@@ -8,7 +9,7 @@ from functools import wraps
 import logging
 import os
 import typing
-from typing import Dict, Union, Iterable, TypeVar, Optional, cast, List, Tuple, BinaryIO, Any
+from typing import Dict, Union, Iterable, Iterator, TypeVar, Optional, cast, List, Tuple, BinaryIO, Any, Sequence
 import numpy as np
 import json
 from pathlib import Path
@@ -31,6 +32,8 @@ from . import (
     Cameras,
     Method,
     Trajectory,
+    TrajectoryFrame,
+    KochanekBartelsInterpolationSource,
     RenderOptions,
     camera_model_to_int,
     new_cameras,
@@ -104,13 +107,20 @@ def compute_metrics(pred, gt, *, reduce: bool = True, run_lpips_vgg: bool = Fals
             return x
 
     pred = pred[..., : gt.shape[-1]]
-    pred = convert_image_dtype(pred, np.float32)
-    gt = convert_image_dtype(gt, np.float32)
-    mse = metrics.mse(pred, gt)
+    if pred.dtype == np.uint8 and gt.dtype == np.uint8:
+        # Table lookup kernel for 8-bit images, same values as the float32 path
+        mse, mae = metrics.mse_mae_uint8(pred, gt)
+        pred = convert_image_dtype(pred, np.float32)
+        gt = convert_image_dtype(gt, np.float32)
+    else:
+        pred = convert_image_dtype(pred, np.float32)
+        gt = convert_image_dtype(gt, np.float32)
+        mse = metrics.mse(pred, gt)
+        mae = metrics.mae(gt, pred)
     out = {
         "psnr": reduction(metrics.psnr(mse)),
         "ssim": reduction(metrics.ssim(gt, pred)),
-        "mae": reduction(metrics.mae(gt, pred)),
+        "mae": reduction(mae),
         "mse": reduction(mse),
         "lpips": reduction(metrics.lpips(gt, pred)),
     }
@@ -215,6 +225,117 @@ def evaluate(predictions: str,
         return out
 
 
+class PredictionsEvaluator:
+    """
+    Evaluates predictions in-memory while they are being written by ``render_all_images``
+    (pass ``evaluator.add_file`` as the ``on_saved`` callback). The metrics and SHA digests
+    are computed from the same uint8 images and encoded bytes which are stored, so the results
+    are the same as running ``evaluate`` on the written predictions, but the predictions
+    do not have to be read back.
+
+    Args:
+        evaluation_protocol: The evaluation protocol to use. If None, the protocol from info.json will be used.
+        image_names: The relative paths of the predicted images (e.g., ``"image_0.png"``). If provided,
+            the SHA digests are updated as the images are written and only the images written out of
+            the sorted order are kept in memory. Otherwise, all encoded images are kept until ``save``.
+    """
+    def __init__(self, evaluation_protocol: Optional[EvaluationProtocol] = None, image_names: Optional[Iterable[str]] = None):
+        self._evaluation_protocol = evaluation_protocol
+        self._nb_info: Optional[Dict] = None
+        self._gt_images: Dict[str, np.ndarray] = {}
+        self._image_names = sorted(image_names, key=Path) if image_names is not None else None
+        self._encoded: Dict[str, Dict[str, bytes]] = {"color": {}, "gt-color": {}}
+        self._sha = {k: hashlib.sha256() for k in self._encoded}
+        self._num_hashed = {k: 0 for k in self._encoded}
+        self._metrics: Dict[str, Dict[str, Union[float, int]]] = {}
+        self.evaluation_time = 0.0
+
+    def _update_sha(self, directory: str) -> None:
+        # The digests are computed in the same order as if the predictions were read from the disk
+        if self._image_names is None:
+            return
+        encoded = self._encoded[directory]
+        while self._num_hashed[directory] < len(self._image_names):
+            data = encoded.pop(self._image_names[self._num_hashed[directory]], None)
+            if data is None:
+                break
+            self._sha[directory].update(data)
+            self._num_hashed[directory] += 1
+
+    def add_file(self, path: str, data: bytes, image: Optional[np.ndarray] = None) -> None:
+        if path == "info.json":
+            self._nb_info = deserialize_nb_info(json.loads(data.decode("utf8")))
+            if self._evaluation_protocol is None:
+                self._evaluation_protocol = build_evaluation_protocol(self._nb_info["evaluation_protocol"])
+            return
+        directory, _, relname = path.partition("/")
+        if directory not in self._encoded:
+            return
+        assert image is not None, f"Image must be provided for {path}"
+        self._encoded[directory][relname] = data
+        self._update_sha(directory)
+        if directory == "gt-color":
+            self._gt_images[relname] = image
+            return
+
+        # Predictions are written after the corresponding ground-truth images
+        start = time.perf_counter()
+        assert self._nb_info is not None and self._evaluation_protocol is not None, "info.json must be written first"
+        metadata = self._nb_info.get("render_dataset_metadata", self._nb_info.get("dataset_metadata", {}))
+        with suppress_type_checks():
+            dataset_slice = new_dataset(
+                cameras=typing.cast(Cameras, None),
+                image_paths=[relname],
+                image_paths_root="",
+                metadata=typing.cast(Dict, metadata),
+                images=[self._gt_images.pop(relname)])
+            self._metrics[relname] = self._evaluation_protocol.evaluate({"color": image}, dataset_slice)
+        self.evaluation_time += time.perf_counter() - start
+
+    def save(self, output: str) -> Dict:
+        """
+        Accumulates the metrics and writes the results to a json file.
+
+        Args:
+            output: Path to a json file where the results will be written.
+        Returns:
+            A dictionary containing the results.
+        """
+        if os.path.exists(output):
+            raise FileExistsError(f"{output} already exists")
+        assert self._nb_info is not None and self._evaluation_protocol is not None, "No predictions were written"
+
+        # Same order as if the predictions were read from the disk
+        relpaths = sorted(self._metrics.keys())
+        metrics_lists = {}
+
+        def collect_metrics_lists():
+            for relname in relpaths:
+                metrics = self._metrics[relname]
+                for k, v in metrics.items():
+                    if k not in metrics_lists:
+                        metrics_lists[k] = []
+                    metrics_lists[k].append(v)
+                yield metrics
+
+        metrics = self._evaluation_protocol.accumulate_metrics(collect_metrics_lists())
+
+        for directory, encoded in self._encoded.items():
+            if self._image_names is not None:
+                assert not encoded and self._num_hashed[directory] == len(self._image_names), \
+                    f"The written {directory} images do not match the image names"
+            for relname in sorted(encoded, key=Path):
+                self._sha[directory].update(encoded[relname])
+
+        return save_evaluation_results(str(output),
+                                       metrics=metrics, 
+                                       metrics_lists=metrics_lists, 
+                                       predictions_sha=self._sha["color"].hexdigest(),
+                                       ground_truth_sha=self._sha["gt-color"].hexdigest(),
+                                       evaluation_protocol=self._evaluation_protocol.get_name(),
+                                       nb_info=self._nb_info)
+
+
 class DefaultEvaluationProtocol(EvaluationProtocol):
     _name = "default"
     _lpips_vgg = False
@@ -240,9 +361,7 @@ class DefaultEvaluationProtocol(EvaluationProtocol):
         gt = dataset["images"][0]
         pred = image_to_srgb(pred, np.uint8, color_space=color_space, background_color=background_color)
         gt = image_to_srgb(gt, np.uint8, color_space=color_space, background_color=background_color)
-        pred_f = convert_image_dtype(pred, np.float32)
-        gt_f = convert_image_dtype(gt, np.float32)
-        return compute_metrics(pred_f[None], gt_f[None], run_lpips_vgg=self._lpips_vgg, reduce=True)
+        return compute_metrics(pred[None], gt[None], run_lpips_vgg=self._lpips_vgg, reduce=True)
 
     def accumulate_metrics(self, metrics: Iterable[Dict[str, Union[float, int]]]) -> Dict[str, Union[float, int]]:
         acc = {}
@@ -289,6 +408,7 @@ def render_all_images(
     description: str = "rendering all images",
     nb_info: Optional[dict] = None,
     evaluation_protocol: Optional[EvaluationProtocol] = None,
+    on_saved: Optional[typing.Callable[[str, bytes, Optional[np.ndarray]], None]] = None,
 ) -> Iterable[RenderOutput]:
     if evaluation_protocol is None:
         evaluation_protocol = build_evaluation_protocol(dataset["metadata"]["evaluation_protocol"])
@@ -320,74 +440,150 @@ def render_all_images(
         for val in _save_predictions_iterate(output,
                                              _render_all(),
                                              dataset=dataset,
-                                             nb_info=nb_info):
+                                             nb_info=nb_info,
+                                             on_saved=on_saved):
             progress.update(1)
             yield val
 
 
-def render_frames(
-    method: Method,
-    cameras: Cameras,
-    output: Union[str, Path],
-    fps: float,
-    embeddings: Optional[List[np.ndarray]] = None,
-    description: str = "rendering frames",
-    output_names: Tuple[str, ...] = ("color",),
-    nb_info: Optional[dict] = None,
-) -> None:
-    output = str(output) if isinstance(output, Path) else output
-    assert cameras.image_sizes is not None, "cameras.image_sizes must be set"
-    info = method.get_info()
-    render = with_supported_camera_models(info.get("supported_camera_models", frozenset(("pinhole",))))(method.render)
-    color_space = "srgb"
-    background_color = nb_info.get("background_color") if nb_info is not None else None
-    expected_scene_scale = nb_info.get("expected_scene_scale") if nb_info is not None else None
-    output_types_map = {
-        (x if isinstance(x, str) else x["name"]): (x if isinstance(x, str) else x.get("type", x["name"]))
-        for x in info.get("supported_outputs", ["color"])
-    }
-    for output_name in output_names:
-        if output_name not in output_types_map:
-            raise ValueError(f"Output type {output_name} not supported by method. Supported types: {list(output_types_map.keys())}")
+def _encode_png(image: np.ndarray) -> bytes:
+    with io.BytesIO() as f:
+        f.name = "image.png"  # type: ignore
+        save_image(f, image)
+        return f.getvalue()
 
-    def _predict_all(allow_transparency=True):
-        for i in tqdm(range(len(cameras)), desc=description, total=len(cameras), dynamic_ncols=True):
-            options: RenderOptions = {
-                "output_type_dtypes": {"color": "uint8"},
-                "embedding": (embeddings[i] if embeddings is not None else None),
-            }
-            pred = render(cameras[i], options=options)
-            out = {}
-            for output_name in output_names:
-                output_type = output_types_map[output_name]
-                if output_type == "color":
-                    pred_image = image_to_srgb(pred[output_name], np.uint8, 
-                                               color_space=color_space, 
-                                               allow_alpha=allow_transparency, 
-                                               background_color=background_color)
-                    out[output_name] = pred_image
-                elif output_type == "depth":
-                    depth_rgb = visualize_depth(
-                            pred[output_name], 
-                            near_far=cameras.nears_fars[i] if cameras.nears_fars is not None else None, 
-                            expected_scale=expected_scene_scale)
-                    out[output_name] = convert_image_dtype(depth_rgb, np.uint8)
-                elif output_type == "accumulation":
-                    out[output_name] = convert_image_dtype(apply_colormap(pred[output_name], pallete="coolwarm"), np.uint8)
-                else:
-                    raise RuntimeError(f"Output type {output_type} is not supported.")
-            yield out
-
-    @contextmanager
-    def _zip_writer(output):
-        with zipfile.ZipFile(output, "w") as zip:
-            i = 0
-            def _write_frame(frame):
-                nonlocal i
-                rel_path = f"{i:05d}.png"
+
+def _write_image(file: BinaryIO, image: Union[np.ndarray, bytes]) -> None:
+    # Images can be already encoded by the pipelined workers
+    if isinstance(image, bytes):
+        file.write(image)
+    else:
+        save_image(file, image)
+
+
+def _iter_zip_entry_content(file: BinaryIO, offset: int, method: int, compress_size: int, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+    import zlib
+
+    decompressor = zlib.decompressobj(-15) if method == zipfile.ZIP_DEFLATED else None
+    file.seek(offset)
+    remaining = compress_size
+    while remaining > 0:
+        chunk = file.read(min(chunk_size, remaining))
+        if not chunk:
+            raise EOFError("Unexpected end of the zip archive")
+        remaining -= len(chunk)
+        yield decompressor.decompress(chunk) if decompressor is not None else chunk
+    if decompressor is not None:
+        yield decompressor.flush()
+
+
+def _recover_zip(path: str) -> int:
+    """
+    Recovers a zip archive which was not closed properly (e.g., the process writing it was killed)
+    and thus has no central directory. The complete entries are found by scanning the local file
+    headers and the archive is rewritten with them. Incomplete entries are dropped.
+    The entries are streamed in chunks, the archive is never loaded into memory.
+
+    Returns:
+        The number of recovered entries.
+    """
+    import struct
+    import zlib
+
+    header_struct = struct.Struct("<4s5H3L2H")
+    entries = []
+    with open(path, "rb") as f:
+        total_size = os.fstat(f.fileno()).st_size
+        offset = 0
+        while offset + header_struct.size <= total_size:
+            f.seek(offset)
+            header = f.read(header_struct.size)
+            (signature, _, flags, method, mtime, mdate, crc, compress_size, file_size, 
+             name_len, extra_len) = header_struct.unpack(header)
+            start = offset + header_struct.size + name_len + extra_len
+            end = start + compress_size
+            if signature != b"PK\x03\x04" or flags & 0x08 or end > total_size or method not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+                break
+            name = f.read(name_len).decode("utf8" if flags & 0x800 else "cp437")
+            content_size = 0
+            content_crc = 0
+            try:
+                for chunk in _iter_zip_entry_content(f, start, method, compress_size):
+                    content_size += len(chunk)
+                    content_crc = zlib.crc32(chunk, content_crc)
+            except zlib.error:
+                break
+            if content_size != file_size or content_crc != crc:
+                # The entry was not finished
+                break
+            date_time = ((mdate >> 9) + 1980, (mdate >> 5) & 0xF, mdate & 0x1F, mtime >> 11, (mtime >> 5) & 0x3F, (mtime & 0x1F) * 2)
+            entries.append((name, date_time, method, start, compress_size, file_size))
+            offset = end
+
+        with zipfile.ZipFile(path + ".tmp", "w") as zip:
+            for name, date_time, method, start, compress_size, file_size in entries:
+                zinfo = zipfile.ZipInfo(name, date_time)
+                zinfo.compress_type = method
+                zinfo.file_size = file_size
+                zinfo.external_attr = 0o600 << 16     # ?rw-------
+                with zip.open(zinfo, "w") as dest:
+                    for chunk in _iter_zip_entry_content(f, start, method, compress_size):
+                        dest.write(chunk)
+    os.replace(path + ".tmp", path)
+    logging.warning(f"Recovered {len(entries)} entries from the incomplete zip archive {path}")
+    return len(entries)
+
+
+@contextmanager
+def _open_frames_writer(output: str, *, fps: float, append: bool = False):
+    """
+    Opens a writer for the rendered frames. The writer is a function ``write(index, frame)``,
+    where frame is either an image or a dictionary of images (one for each output).
+    If ``append`` is set, the frames are added to an existing folder/zip output.
+    """
+    if path_is_video(output):
+        if append and os.path.exists(output):
+            raise ValueError(f"Cannot append frames to an existing video {output}")
+        # Handle video
+        import mediapy
+
+        codec = 'gif' if output.endswith(".gif") else "h264"
+        writer = None
+        try:
+            def _add_frame(index, frame):
+                del index
+                nonlocal writer
+                if isinstance(frame, dict):
+                    frame = np.concatenate(list(frame.values()), axis=1)
+                if writer is None:
+                    h, w = frame.shape[:-1]
+
+                    writer = mediapy.VideoWriter(output, (h, w), fps=fps, codec=codec)
+                    writer.__enter__()
+                writer.add_image(frame)
+            yield _add_frame
+        finally:
+            if writer is not None:
+                writer.__exit__(None, None, None)
+                writer = None
+
+    elif output.endswith(".zip"):
+        append = append and os.path.exists(output)
+        if append and not zipfile.is_zipfile(output):
+            _recover_zip(output)
+        with zipfile.ZipFile(output, "a" if append else "w") as zip:
+            # Frames can be partially present (e.g., color but not depth) when resuming,
+            # the existing entries are kept and not added twice.
+            existing = set(zip.namelist())
+
+            def _write_frame(index, frame):
+                rel_path = f"{index:05d}.png"
                 framedata = frame if isinstance(frame, dict) else {None: frame}
                 for key, image in framedata.items():
                     lpath = f"{key}/{rel_path}" if key is not None else rel_path
+                    if lpath in existing:
+                        continue
+                    existing.add(lpath)
 
                     date_time = time.localtime(time.time())[:6]
                     zinfo = zipfile.ZipInfo(lpath, date_time)
@@ -398,17 +594,15 @@ def render_frames(
 
                     with zip.open(zinfo, 'w') as dest:
                         dest.name = lpath  # type: ignore
-                        save_image(cast(BinaryIO, dest), image)
-                i += 1
+                        _write_image(cast(BinaryIO, dest), image)
             yield _write_frame
 
-    @contextmanager
-    def _targz_writer(output):
+    elif output.endswith(".tar.gz"):
+        if append and os.path.exists(output):
+            raise ValueError(f"Cannot append frames to an existing tar.gz archive {output}. Use a zip archive or a folder instead.")
         with tarfile.open(output, "w:gz") as tar:
-            i = 0
-            def _write_frame(frame):
-                nonlocal i
-                rel_path = f"{i:05d}.png"
+            def _write_frame(index, frame):
+                rel_path = f"{index:05d}.png"
                 framedata = frame if isinstance(frame, dict) else {None: frame}
                 for key, image in framedata.items():
                     lpath = f"{key}/{rel_path}" if key is not None else rel_path
@@ -416,93 +610,339 @@ def render_frames(
                     tarinfo.mtime = int(time.time())
                     with io.BytesIO() as f:
                         f.name = lpath  # type: ignore
-                        save_image(f, image)
+                        _write_image(f, image)
                         tarinfo.size = f.tell()
                         f.seek(0)
                         tar.addfile(tarinfo=tarinfo, fileobj=f)
-                i += 1
             yield _write_frame
 
-    vidwriter = 0
-
-    @contextmanager
-    def _video_writer(output):
-        nonlocal vidwriter
-        # Handle video
-        import mediapy
-
-        codec = 'gif' if output.endswith(".gif") else "h264"
-        writer = None
-        try:
-            def _add_frame(frame):
-                nonlocal writer
-                if isinstance(frame, dict):
-                    frame = np.concatenate(list(frame.values()), axis=1)
-                if writer is None:
-                    h, w = frame.shape[:-1]
+    else:
+        os.makedirs(output, exist_ok=True)
 
-                    writer = mediapy.VideoWriter(output, (h, w), fps=fps, codec=codec)
-                    writer.__enter__()
-                writer.add_image(frame)
-            yield _add_frame
-        finally:
-            if writer is not None:
-                writer.__exit__(None, None, None)
-                writer = None
+        def _write_file(path, image):
+            # Write to a temporary file first, so that interrupted
+            # writes are not mistaken for finished frames when resuming.
+            with open(path + ".tmp", "wb") as f:
+                _write_image(f, image)
+            os.replace(path + ".tmp", path)
 
-    @contextmanager
-    def _folder_writer(output):
-        os.makedirs(output, exist_ok=True)
-        i = 0
-        def _add_frame(frame):
-            nonlocal i
-            rel_path = f"{i:05d}.png"
+        def _add_frame(index, frame):
+            rel_path = f"{index:05d}.png"
             if isinstance(frame, dict):
                 for key, image in frame.items():
                     os.makedirs(os.path.join(output, key), exist_ok=True)
-                    with open(os.path.join(output, key, rel_path), "wb") as f:
-                        save_image(f, image)
+                    _write_file(os.path.join(output, key, rel_path), image)
             else:
-                with open(os.path.join(output, rel_path), "wb") as f:
-                    save_image(f, frame)
-            i += 1
+                _write_file(os.path.join(output, rel_path), frame)
         yield _add_frame
 
-    writers = {}
-    try:
+
+def _list_frames(path: str) -> Dict[Optional[str], Dict[int, str]]:
+    """
+    Lists frames stored in a folder or a zip archive written by ``render_frames``.
+
+    Returns:
+        A mapping from the output name (or None for single-output files) to a mapping from frame index to the relative path.
+    """
+    if os.path.isdir(path):
+        names = [os.path.relpath(os.path.join(root, x), path).replace(os.sep, "/") for root, _, files in os.walk(path) for x in files]
+    elif path.endswith(".zip") and os.path.exists(path):
+        with zipfile.ZipFile(path, "r") as zip:
+            names = [x.filename for x in zip.infolist() if not x.is_dir()]
+    else:
+        return {}
+    frames: Dict[Optional[str], Dict[int, str]] = {}
+    for name in names:
+        parts = name.split("/")
+        if len(parts) > 2 or not parts[-1].endswith(".png") or not parts[-1][:-len(".png")].isdigit():
+            continue
+        key = parts[0] if len(parts) == 2 else None
+        frames.setdefault(key, {})[int(parts[-1][:-len(".png")])] = name
+    return frames
+
+
+def render_frames(
+    method: Method,
+    cameras: Cameras,
+    output: Union[str, Path],
+    fps: float,
+    embeddings: Optional[List[np.ndarray]] = None,
+    description: str = "rendering frames",
+    output_names: Tuple[str, ...] = ("color",),
+    nb_info: Optional[dict] = None,
+    num_workers: int = 0,
+    queue_size: Optional[int] = None,
+    frames: Optional[Sequence[int]] = None,
+    resume: bool = False,
+) -> None:
+    """
+    Render frames for the given cameras and write them to a video, a directory, a zip or a tar.gz archive.
+
+    Args:
+        method: Method to render the frames with.
+        cameras: Cameras to render.
+        output: Output path. Use ``{output}`` as a placeholder for the output name.
+        fps: Frames per second (used for videos).
+        embeddings: Optional per-frame appearance embeddings.
+        description: Progress bar description.
+        output_names: Outputs to render (e.g., color, depth, accumulation).
+        nb_info: Optional nb-info of the checkpoint (used to get the background color and scene scale).
+        num_workers: If greater than zero, frames are post-processed (colorized, encoded) by
+            ``num_workers`` worker threads and written by a separate writer thread,
+            while the main thread keeps rendering.
+        queue_size: Maximum number of frames in flight in the pipelined mode
+            (defaults to ``2 * num_workers``).
+        frames: Indices of the cameras to render (e.g., a shard of the trajectory). The output
+            images are named by these indices, so shards can later be merged with :func:`merge_frames`.
+        resume: Skip frames already present in the folder/zip output and append the rest.
+    """
+    output = str(output) if isinstance(output, Path) else output
+    assert cameras.image_sizes is not None, "cameras.image_sizes must be set"
+    info = method.get_info()
+    render = with_supported_camera_models(info.get("supported_camera_models", frozenset(("pinhole",))))(method.render)
+    color_space = "srgb"
+    background_color = nb_info.get("background_color") if nb_info is not None else None
+    expected_scene_scale = nb_info.get("expected_scene_scale") if nb_info is not None else None
+    output_types_map = {
+        (x if isinstance(x, str) else x["name"]): (x if isinstance(x, str) else x.get("type", x["name"]))
+        for x in info.get("supported_outputs", ["color"])
+    }
+    for output_name in output_names:
+        if output_name not in output_types_map:
+            raise ValueError(f"Output type {output_name} not supported by method. Supported types: {list(output_types_map.keys())}")
+
+    # Group outputs by the output file
+    output_groups: Dict[str, Tuple[str, ...]] = {}
+    for output_name in output_names:
+        loutput = output.format(output=output_name)
+        output_groups[loutput] = output_groups.get(loutput, ()) + (output_name,)
+
+    frame_indices = list(frames) if frames is not None else list(range(len(cameras)))
+    if resume:
+        for loutput, _outs in output_groups.items():
+            if loutput.endswith(".zip") and os.path.exists(loutput) and not zipfile.is_zipfile(loutput):
+                _recover_zip(loutput)
+            existing = _list_frames(loutput)
+            if len(_outs) == 1:
+                done = set(existing.get(None, {}).keys())
+            else:
+                done = set.intersection(*(set(existing.get(x, {}).keys()) for x in _outs))
+            frame_indices = [i for i in frame_indices if i not in done]
+        if len(frame_indices) < (len(frames) if frames is not None else len(cameras)):
+            logging.info(f"Resuming rendering, {len(frame_indices)} frames left")
+
+    def _render_all():
+        for i in tqdm(frame_indices, desc=description, total=len(frame_indices), dynamic_ncols=True):
+            options: RenderOptions = {
+                "output_type_dtypes": {"color": "uint8"},
+                "embedding": (embeddings[i] if embeddings is not None else None),
+            }
+            yield i, render(cameras[i], options=options)
+
+    def _postprocess(i, pred, allow_transparency=True):
+        out = {}
         for output_name in output_names:
-            loutput = output.format(output=output_name)
-            if loutput not in writers:
-                if path_is_video(loutput):
-                    writer_obj = _video_writer(loutput)
-                elif loutput.endswith(".zip"):
-                    writer_obj = _zip_writer(loutput)
-                elif loutput.endswith(".tar.gz"):
-                    writer_obj = _targz_writer(loutput)
-                else:
-                    writer_obj = _folder_writer(loutput)
-                writers[loutput] = (writer_obj, writer_obj.__enter__(), (output_name,))
+            output_type = output_types_map[output_name]
+            if output_type == "color":
+                pred_image = image_to_srgb(pred[output_name], np.uint8, 
+                                           color_space=color_space, 
+                                           allow_alpha=allow_transparency, 
+                                           background_color=background_color)
+                out[output_name] = pred_image
+            elif output_type == "depth":
+                depth_rgb = visualize_depth(
+                        pred[output_name], 
+                        near_far=cameras.nears_fars[i] if cameras.nears_fars is not None else None, 
+                        expected_scale=expected_scene_scale)
+                out[output_name] = convert_image_dtype(depth_rgb, np.uint8)
+            elif output_type == "accumulation":
+                out[output_name] = convert_image_dtype(apply_colormap(pred[output_name], pallete="coolwarm"), np.uint8)
             else:
-                writer_obj, writer, _outs = writers[loutput]
-                writers[loutput] = (writer_obj, writer, _outs + (output_name,))
+                raise RuntimeError(f"Output type {output_type} is not supported.")
+        return out
 
-        for frame in _predict_all():
-            for _, writer, _outs in writers.values():
+    with ExitStack() as stack:
+        writers = {
+            loutput: (stack.enter_context(_open_frames_writer(loutput, fps=fps, append=resume)), _outs)
+            for loutput, _outs in output_groups.items()
+        }
+
+        def _write_frame(i, frame, encoded=None):
+            for loutput, (writer, _outs) in writers.items():
+                # Video writers need the raw frames, other writers accept encoded PNGs
+                data = encoded if encoded is not None and not path_is_video(loutput) else frame
                 if len(_outs) == 1:
-                    writer(frame[_outs[0]])
+                    writer(i, data[_outs[0]])
+                else:
+                    writer(i, {name: data[name] for name in _outs})
+
+        if num_workers <= 0:
+            for i, pred in _render_all():
+                _write_frame(i, _postprocess(i, pred))
+        else:
+            _render_frames_pipelined(
+                _render_all(), 
+                _postprocess, 
+                _write_frame,
+                encode_png=any(not path_is_video(x) for x in writers),
+                num_workers=num_workers,
+                queue_size=queue_size if queue_size is not None else 2 * num_workers)
+
+
+def merge_frames(inputs: Sequence[Union[str, Path]], output: Union[str, Path], fps: float, num_frames: Optional[int] = None) -> None:
+    """
+    Merges frames rendered by (possibly multiple) :func:`render_frames` calls into a single output.
+    This can be used to assemble a video from trajectory shards rendered in parallel.
+    The inputs must be folders or zip archives and together they must contain all frames.
+
+    Args:
+        inputs: Folders or zip archives with the rendered frames.
+        output: Output video/folder/zip/tar.gz. Use ``{output}`` as a placeholder for the output name.
+        fps: Frames per second (used for videos).
+        num_frames: Expected number of frames (e.g., the length of the trajectory). If not set,
+            the frames up to the largest index found in the inputs are required.
+    """
+    output = str(output)
+    sources: Dict[Optional[str], Dict[int, Tuple[str, str]]] = {}
+    for input_path in inputs:
+        input_path = str(input_path)
+        if not (os.path.isdir(input_path) or input_path.endswith(".zip")):
+            raise ValueError(f"Input {input_path} is not a folder or a zip archive")
+        for key, key_frames in _list_frames(input_path).items():
+            for index, name in key_frames.items():
+                sources.setdefault(key, {})[index] = (input_path, name)
+    if not sources:
+        raise ValueError("No frames found in the inputs")
+    output_names = sorted(sources.keys(), key=lambda x: x or "")
+    indices = sorted(set.union(*(set(x.keys()) for x in sources.values())))
+    if num_frames is None:
+        num_frames = indices[-1] + 1
+    elif indices[-1] >= num_frames:
+        raise ValueError(f"The inputs contain frame {indices[-1]}, but only {num_frames} frames are expected")
+    for key in output_names:
+        missing = sorted(set(range(num_frames)).difference(sources[key].keys()))
+        if missing:
+            raise ValueError(f"Missing {len(missing)} frames{(' for output ' + key) if key else ''}, e.g. {missing[:10]}")
+
+    with ExitStack() as stack:
+        zip_files: Dict[str, zipfile.ZipFile] = {}
+
+        def _read_frame(input_path, name):
+            if os.path.isdir(input_path):
+                return read_image(os.path.join(input_path, name))
+            if input_path not in zip_files:
+                zip_files[input_path] = stack.enter_context(zipfile.ZipFile(input_path, "r"))
+            with zip_files[input_path].open(name) as f:
+                return read_image(cast(BinaryIO, f))
+
+        writers = {}
+        for key in output_names:
+            loutput = output.format(output=key) if key is not None else output
+            if loutput not in writers:
+                writers[loutput] = (stack.enter_context(_open_frames_writer(loutput, fps=fps)), ())
+            writer, keys = writers[loutput]
+            writers[loutput] = (writer, keys + (key,))
+
+        for index in tqdm(indices, desc="merging frames", dynamic_ncols=True):
+            for writer, keys in writers.values():
+                if keys == (None,):
+                    writer(index, _read_frame(*sources[None][index]))
                 else:
-                    writer({name: frame[name] for name in _outs})
+                    writer(index, {key: _read_frame(*sources[key][index]) for key in keys})
+
+
+def _render_frames_pipelined(frames, postprocess, write_frame, *, encode_png: bool, num_workers: int, queue_size: int):
+    import queue
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    def _process(i, pred):
+        out = postprocess(i, pred)
+        encoded = None
+        if encode_png:
+            encoded = {k: _encode_png(v) for k, v in out.items()}
+        return i, out, encoded
+
+    # The queue is bounded to limit the number of frames kept in memory.
+    # Futures are queued in order, so the frames are written in order.
+    pending = queue.Queue(maxsize=max(1, queue_size))
+    writer_error = []
+
+    def _writer():
+        while True:
+            future = pending.get()
+            if future is None:
+                break
+            if writer_error:
+                # Drain the queue after an error
+                continue
+            try:
+                write_frame(*future.result())
+            except BaseException as e:
+                writer_error.append(e)
+
+    writer_thread = threading.Thread(target=_writer, daemon=True)
+    writer_thread.start()
+    try:
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            for i, pred in frames:
+                if writer_error:
+                    break
+                pending.put(executor.submit(_process, i, pred))
     finally:
-        # Release all writers
-        for writer_obj, _, _ in reversed(list(writers.values())):
-            writer_obj.__exit__(None, None, None)
+        pending.put(None)
+        writer_thread.join()
+    if writer_error:
+        raise writer_error[0]
+
+
+def _trajectory_get_frames(trajectory: Trajectory) -> List[TrajectoryFrame]:
+    frames = trajectory["frames"]
+    source = trajectory.get("source")
+    if frames or source is None or source.get("type") != "interpolation" or source.get("interpolation") != "kochanek-bartels":
+        return frames
+
+    # Frames were not stored, we interpolate them from the keyframes
+    from ._splines import interpolate_kochanek_bartels_camera_path, rotation_matrix_to_quaternion, quaternion_to_rotation_matrix
+
+    source = cast(KochanekBartelsInterpolationSource, source)
+    keyframes = source["keyframes"]
+    if len(keyframes) < 2:
+        return frames
+    keyframe_poses = np.stack([x["pose"][:3, :4] for x in keyframes]).astype(np.float64)
+    out = interpolate_kochanek_bartels_camera_path(
+        keyframe_poses[:, :3, 3],
+        rotation_matrix_to_quaternion(keyframe_poses[:, :3, :3]),
+        np.array([x["fov"] if x["fov"] is not None else source["default_fov"] for x in keyframes], dtype=np.float64),
+        np.array([x.get("transition_duration") or source["default_transition_duration"] for x in keyframes], dtype=np.float32),
+        tension=source["tension"],
+        is_cycle=source["is_cycle"],
+        framerate=trajectory["fps"])
+    if out is None:
+        return frames
+    positions, wxyz, fovs, weights = out
+    poses = np.concatenate([quaternion_to_rotation_matrix(wxyz), positions[..., None]], -1).astype(np.float32)
+    w, h = trajectory["image_size"]
+    focal_lengths = h / 2 / np.tan(fovs * (np.pi / 180.0) / 2)
+    has_appearances = bool(trajectory.get("appearances"))
+    frames = []
+    for pose, focal_length, weight in zip(poses, focal_lengths, weights):
+        frame: TrajectoryFrame = {
+            "pose": pose,
+            "intrinsics": np.array([focal_length, focal_length, w / 2, h / 2], dtype=np.float32),
+        }
+        if has_appearances:
+            frame["appearance_weights"] = weight.astype(np.float32)
+        frames.append(frame)
+    return frames
 
 
 def trajectory_get_cameras(trajectory: Trajectory) -> Cameras:
     if trajectory["camera_model"] != "pinhole":
         raise NotImplementedError("Only pinhole camera model is supported")
-    poses = np.stack([x["pose"] for x in trajectory["frames"]])
-    intrinsics = np.stack([x["intrinsics"] for x in trajectory["frames"]])
+    frames = _trajectory_get_frames(trajectory)
+    poses = np.stack([x["pose"] for x in frames])
+    intrinsics = np.stack([x["intrinsics"] for x in frames])
     camera_models = np.array([camera_model_to_int(trajectory["camera_model"])]*len(poses), dtype=np.int32)
     image_sizes = np.array([list(trajectory["image_size"])]*len(poses), dtype=np.int32)
     return new_cameras(poses=poses, 
@@ -528,15 +968,16 @@ def trajectory_get_embeddings(method: Method, trajectory: Trajectory) -> Optiona
         return None
     if not all(x is not None for x in appearance_embeddings):
         raise ValueError("Either all embeddings must be provided or all must be missing")
-    if all(x.get("appearance_weights") is None for x in trajectory["frames"]):
+    frames = _trajectory_get_frames(trajectory)
+    if all(x.get("appearance_weights") is None for x in frames):
         return None
-    if not all(x.get("appearance_weights") is not None for x in trajectory["frames"]):
+    if not all(x.get("appearance_weights") is not None for x in frames):
         raise ValueError("Either all appearance weights must be provided or all must be missing")
     appearance_embeddings_np = np.stack(cast(List[np.ndarray], appearance_embeddings))
 
     # Interpolate embeddings
     out = []
-    for frame in trajectory["frames"]:
+    for frame in frames:
         embedding = (frame.get("appearance_weights") @ appearance_embeddings_np).astype(appearance_embeddings_np.dtype)
         out.append(embedding)
     return out
@@ -9,7 +9,7 @@ import numpy as np
 import time
 import tarfile
 import os
-from typing import Union, Iterator, IO, Any, Dict, List, Iterable, Optional, TypeVar
+from typing import Union, Iterator, IO, Any, Dict, List, Iterable, Optional, TypeVar, Callable
 import zipfile
 import contextlib
 from pathlib import Path
@@ -18,7 +18,6 @@ import tempfile
 import logging
 import shutil
 from tqdm import tqdm
-import requests
 from . import (
     Trajectory, 
     Method,
@@ -35,6 +34,7 @@ try:
 except ImportError:
     from typing_extensions import Literal
 from . import __version__
+from ._constants import NB_PREFIX
 
 
 OpenMode = Literal["r", "w"]
@@ -48,6 +48,8 @@ def _assert_not_none(value: Optional[T]) -> T:
 
 def wget(url: str, output: Union[str, Path]):
     output = Path(output)
+    import requests
+
     response = requests.get(url, stream=True)
     response.raise_for_status()
     total_size_in_bytes = int(response.headers.get("content-length", 0))
@@ -66,6 +68,68 @@ def wget(url: str, output: Union[str, Path]):
         )
 
 
+def _get_http_cache_dir() -> Optional[str]:
+    # An empty string disables the cache
+    path = os.environ.get("NERFBASELINES_HTTP_CACHE", os.path.join(NB_PREFIX, "http-cache"))
+    return path or None
+
+
+def _http_get_cached(url: str, *, session=None) -> bytes:
+    """
+    Downloads the content of an URL. Responses are cached on disk and revalidated using
+    the ETag/Last-Modified headers, so unchanged files are not downloaded again.
+
+    Args:
+        url: The URL to fetch.
+        session: Optional ``requests.Session`` to use.
+
+    Returns:
+        The response content.
+    """
+    import requests
+
+    if session is None:
+        session = requests
+    cache_dir = _get_http_cache_dir()
+    cache_path = meta_path = None
+    headers = {}
+    meta = {}
+    if cache_dir is not None:
+        key = hashlib.sha256(url.encode("utf8")).hexdigest()
+        cache_path = os.path.join(cache_dir, key)
+        meta_path = cache_path + ".json"
+        if os.path.exists(cache_path) and os.path.exists(meta_path):
+            try:
+                with open(meta_path, "r", encoding="utf8") as f:
+                    meta = json.load(f)
+            except Exception as e:
+                logging.warning(f"Failed to read HTTP cache entry for {url}: {e}")
+                meta = {}
+            if meta.get("url") == url:
+                if meta.get("etag"):
+                    headers["If-None-Match"] = meta["etag"]
+                if meta.get("last_modified"):
+                    headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = session.get(url, headers=headers, timeout=(30, 120))
+    if response.status_code == 304 and cache_path is not None and headers:
+        with open(cache_path, "rb") as f:
+            return f.read()
+    response.raise_for_status()
+    content = response.content
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if cache_path is not None and meta_path is not None and (etag or last_modified):
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write atomically, other processes may read the cache concurrently
+        for path, data in ((cache_path, content), (meta_path, json.dumps({
+                "url": url, "etag": etag, "last_modified": last_modified}).encode("utf8"))):
+            with tempfile.NamedTemporaryFile("wb", dir=cache_dir, delete=False) as f:
+                f.write(data)
+            os.replace(f.name, path)
+    return content
+
+
 @contextlib.contextmanager
 def open_any(
     path: Union[str, Path, BinaryIO], mode: OpenMode = "r"
@@ -112,6 +176,8 @@ def open_any(
     # Download from url
     if path.startswith("http://") or path.startswith("https://"):
         assert mode == "r", "Only reading from remote files is supported."
+        import requests
+
         response = requests.get(path, stream=True)
         response.raise_for_status()
         total_size_in_bytes = int(response.headers.get("content-length", 0))
@@ -549,7 +615,14 @@ def save_evaluation_results(file,
         return out
 
 
-def _save_predictions_iterate(output: str, predictions: Iterable[RenderOutput], dataset: Dataset, *, nb_info=None):
+def _get_predictions_relative_name(dataset: Dataset, index: int) -> Path:
+    relative_name = Path(dataset["image_paths"][index])
+    if dataset["image_paths_root"] is not None:
+        relative_name = relative_name.relative_to(Path(dataset["image_paths_root"]))
+    return relative_name
+
+
+def _save_predictions_iterate(output: str, predictions: Iterable[RenderOutput], dataset: Dataset, *, nb_info=None, on_saved: Optional[Callable[[str, bytes, Optional[np.ndarray]], None]] = None):
     background_color =  dataset["metadata"].get("background_color", None)
     assert background_color is None or background_color.dtype == np.uint8, "background_color must be None or uint8"
     color_space = dataset["metadata"].get("color_space", "srgb")
@@ -581,38 +654,42 @@ def _save_predictions_iterate(output: str, predictions: Iterable[RenderOutput],
 
             open_fn = open_fn_fs
 
+        def save_file(path, data: bytes, image: Optional[np.ndarray] = None):
+            with open_fn(path) as f:
+                f.write(data)
+            # The callback receives exactly what was written (used for in-memory evaluation)
+            if on_saved is not None:
+                on_saved(path, data, image)
+
+        def save_png(path, image: np.ndarray):
+            with io.BytesIO() as f:
+                f.name = path
+                save_image(f, image)
+                save_file(path, f.getvalue(), image)
+
         # Write metadata
         from pprint import pprint
         pprint(nb_info)
-        with open_fn("info.json") as fp:
-            _background_color = background_color
-            if isinstance(_background_color, np.ndarray):
-                _background_color = _background_color.tolist()
-            fp.write(
-                json.dumps(
-                    serialize_nb_info(
-                        {
-                            **(nb_info or {}),
-                            "render_version": __version__,
-                            "render_datetime": datetime.utcnow().isoformat(timespec="seconds"),
-                            "render_dataset_metadata": dataset["metadata"],
-                        }),
-                    indent=2,
-                ).encode("utf-8")
-            )
+        info_json = json.dumps(
+            serialize_nb_info(
+                {
+                    **(nb_info or {}),
+                    "render_version": __version__,
+                    "render_datetime": datetime.utcnow().isoformat(timespec="seconds"),
+                    "render_dataset_metadata": dataset["metadata"],
+                }),
+            indent=2,
+        )
+        save_file("info.json", info_json.encode("utf-8"))
 
 
         for i, (pred, (w, h)) in enumerate(zip(predictions, _assert_not_none(dataset["cameras"].image_sizes))):
             gt_image = image_to_srgb(dataset["images"][i][:h, :w], np.uint8, color_space=color_space, allow_alpha=allow_transparency, background_color=background_color)
             pred_image = image_to_srgb(pred["color"], np.uint8, color_space=color_space, allow_alpha=allow_transparency, background_color=background_color)
             assert gt_image.shape[:-1] == pred_image.shape[:-1], f"gt size {gt_image.shape[:-1]} != pred size {pred_image.shape[:-1]}"
-            relative_name = Path(dataset["image_paths"][i])
-            if dataset["image_paths_root"] is not None:
-                relative_name = relative_name.relative_to(Path(dataset["image_paths_root"]))
-            with open_fn(f"gt-color/{relative_name.with_suffix('.png')}") as f:
-                save_image(f, gt_image)
-            with open_fn(f"color/{relative_name.with_suffix('.png')}") as f:
-                save_image(f, pred_image)
+            relative_name = _get_predictions_relative_name(dataset, i)
+            save_png(f"gt-color/{relative_name.with_suffix('.png')}", gt_image)
+            save_png(f"color/{relative_name.with_suffix('.png')}", pred_image)
 
             with open_fn(f"cameras/{relative_name.with_suffix('.npz')}") as f:
                 save_cameras_npz(f, dataset["cameras"][i])
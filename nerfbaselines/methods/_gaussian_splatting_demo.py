@@ -1,9 +1,5 @@
 import json
-import shutil
 import logging
-import shlex
-import subprocess
-import tempfile
 import os
 from typing import Optional, Union
 import numpy as np
@@ -54,7 +50,8 @@ def _cast_value(tp, value):
 
 
 def export_generic_demo(path: str, *,
-                        options):
+                        options,
+                        scene_manifest_uri: Optional[str] = None):
     os.makedirs(path, exist_ok=True)
 
     # Parse options
@@ -114,7 +111,8 @@ def export_generic_demo(path: str, *,
             "kernel2DSize": kernel2DSize,
             "splatRenderMode": splatRenderMode,
             "offset": offset.tolist(),
-            "sceneUri": "scene.ksplat",
+            "sceneUri": "scene.ksplat" if scene_manifest_uri is None else None,
+            "sceneManifestUri": scene_manifest_uri,
         }, f, indent=2)
     if enable_shared_memory:
         assert index.index("const enableSharedMemory = false;") >= 0, "Could not set shared memory"
@@ -136,56 +134,381 @@ def export_generic_demo(path: str, *,
     logging.info(f"Demo exported to {path}")
 
 
-def generate_ksplat_file(path: str,
-                         xyz: np.ndarray,
-                         scales: np.ndarray,
-                         opacities: np.ndarray,
-                         quaternions: np.ndarray,
-                         spherical_harmonics: np.ndarray):
-    from plyfile import PlyElement, PlyData  # type: ignore
+_SH_C0 = 0.28209479177387814
+_KSPLAT_HEADER_SIZE = 4096
+_KSPLAT_SECTION_HEADER_SIZE = 1024
+_KSPLAT_VERSION = (0, 1)
+_KSPLAT_COMPRESSION_SCALE_RANGE = 32767
+# Size of a bucket center (3 x float32)
+_KSPLAT_BUCKET_STORAGE_SIZE = 12
+# Number of spherical harmonics coefficients per color channel (without the DC term)
+_KSPLAT_SH_COEFFICIENTS = {0: 0, 1: 3, 2: 8}
+
+
+def _get_ksplat_dtype(compression_level: int, spherical_harmonics_degree: int) -> np.dtype:
+    if spherical_harmonics_degree not in _KSPLAT_SH_COEFFICIENTS:
+        raise ValueError(f"Unsupported spherical harmonics degree {spherical_harmonics_degree}, the ksplat format supports degrees 0-2")
+    if compression_level == 0:
+        center, other, sh = "<f4", "<f4", "<f4"
+    elif compression_level == 1:
+        center, other, sh = "<u2", "<f2", "<f2"
+    elif compression_level == 2:
+        center, other, sh = "<u2", "<f2", "u1"
+    else:
+        raise ValueError(f"Unsupported compression level {compression_level}")
+    fields = [("center", center, (3,)), ("scale", other, (3,)), ("rotation", other, (4,)), ("color", "u1", (4,))]
+    num_sh = 3 * _KSPLAT_SH_COEFFICIENTS[spherical_harmonics_degree]
+    if num_sh > 0:
+        fields.append(("sh", sh, (num_sh,)))
+    return np.dtype(fields)
+
+
+def _compute_ksplat_buckets(xyz: np.ndarray, block_size: float, bucket_size: int):
+    """
+    Groups splats into buckets. Space is split into cells of a regular grid and each cell
+    is split into buckets of bucket_size splats. The full buckets are stored first, followed
+    by the partially filled ones.
+
+    Returns:
+        Tuple of (splat order, number of full buckets, partially filled bucket lengths, bucket centers).
+    """
+    min_corner = xyz.min(0).astype(np.float64)
+    cells = np.floor((xyz - min_corner) / block_size).astype(np.int64)
+    grid_shape = tuple(cells.max(0) + 1)
+    unique_cells, cell_ids, cell_counts = np.unique(
+        np.ravel_multi_index(tuple(cells.T), grid_shape), return_inverse=True, return_counts=True)
+    unique_cells = np.stack(np.unravel_index(unique_cells, grid_shape), -1)
+    order = np.argsort(cell_ids, kind="stable")
+    sorted_cells = cell_ids[order]
+    cell_starts = np.concatenate(([0], np.cumsum(cell_counts)[:-1]))
+    rank = np.arange(len(order)) - cell_starts[sorted_cells]
+    is_full = rank < (cell_counts // bucket_size * bucket_size)[sorted_cells]
+    full_bucket_cells = sorted_cells[is_full][::bucket_size]
+    partial_bucket_cells = np.nonzero(cell_counts % bucket_size)[0]
+    bucket_cells = np.concatenate((full_bucket_cells, partial_bucket_cells))
+    bucket_centers = min_corner + (unique_cells[bucket_cells] + 0.5) * block_size
+    order = np.concatenate((order[is_full], order[~is_full]))
+    partial_lengths = cell_counts[partial_bucket_cells] % bucket_size
+    return order, len(full_bucket_cells), partial_lengths, bucket_centers
+
+
+def _get_ksplat_splat_buckets(num_splats: int, bucket_size: int, num_full_buckets: int, partial_lengths: np.ndarray) -> np.ndarray:
+    return np.concatenate((
+        np.repeat(np.arange(num_full_buckets), bucket_size),
+        np.repeat(np.arange(num_full_buckets, num_full_buckets + len(partial_lengths)), partial_lengths),
+    ))[:num_splats]
+
+
+def generate_ply_file(path: str,
+                      xyz: np.ndarray,
+                      scales: np.ndarray,
+                      opacities: np.ndarray,
+                      quaternions: np.ndarray,
+                      spherical_harmonics: np.ndarray):
+    """
+    Writes the Gaussians to a PLY file in the format used by the original Gaussian Splatting implementation.
+
+    Args:
+        path: Output path.
+        xyz: Gaussian centers (N, 3).
+        scales: Gaussian scales after activation (N, 3).
+        opacities: Gaussian opacities after activation (N,) or (N, 1).
+        quaternions: Gaussian rotations as wxyz quaternions (N, 4).
+        spherical_harmonics: Spherical harmonics coefficients (N, 3, K).
+    """
+    num_points = xyz.shape[0]
+    f_dc = spherical_harmonics[..., 0]
+    f_rest = spherical_harmonics[..., 1:].reshape(num_points, -1)
     attributes = ['x', 'y', 'z', 'nx', 'ny', 'nz']
     attributes.extend([f'f_dc_{i}' for i in range(3)])
-    attributes.extend([f'f_rest_{i}' for i in range(3*(spherical_harmonics.shape[-1]-1))])
+    attributes.extend([f'f_rest_{i}' for i in range(f_rest.shape[-1])])
     attributes.append('opacity')
     attributes.extend([f'scale_{i}' for i in range(scales.shape[-1])])
     attributes.extend([f'rot_{i}' for i in range(4)])
 
-    if len(opacities.shape) == 1:
-        opacities = opacities[:, None]
-
-    with tempfile.TemporaryDirectory() as tmpdirname:
-        dtype_full = [(attribute, 'f4') for attribute in attributes]
-        elements = np.empty(xyz.shape[0], dtype=dtype_full)
-        f_dc = spherical_harmonics[..., 0]
-        f_rest = spherical_harmonics[..., 1:].reshape(f_dc.shape[0], -1)
-        attributes = np.concatenate((
-            xyz, np.zeros_like(xyz), 
-            f_dc, f_rest, 
-            _inverse_sigmoid(opacities), 
-            np.log(scales), 
-            quaternions), axis=1)
-        elements[:] = list(map(tuple, attributes))
-        el = PlyElement.describe(elements, 'vertex')
-
-        ply_file = os.path.join(tmpdirname, "splat.ply")
-        out_file = os.path.join(tmpdirname, "scene.ksplat")
-        ply_data = PlyData([el])
-        ply_data.write(ply_file)
-
-        # Convert to ksplat format
-        subprocess.check_call(["bash", "-c", f"""
-if [ ! -e /tmp/gaussian-splats-3d ]; then
-rm -rf "/tmp/gaussian-splats-3d-tmp"
-git clone https://github.com/mkkellogg/GaussianSplats3D.git "/tmp/gaussian-splats-3d-tmp"
-cd /tmp/gaussian-splats-3d-tmp
-npm install
-npm run build
-cd "$PWD"
-mv /tmp/gaussian-splats-3d-tmp /tmp/gaussian-splats-3d
-fi
-node /tmp/gaussian-splats-3d/util/create-ksplat.js {shlex.quote(ply_file)} {shlex.quote(out_file)}
-"""])
-        shutil.move(out_file, path)
+    # All attributes are float32, the rows of the array are exactly the binary PLY vertices
+    data = np.empty((num_points, len(attributes)), dtype="<f4")
+    offset = 0
+    for values in (xyz, np.zeros_like(xyz), f_dc, f_rest,
+                   _inverse_sigmoid(opacities.reshape(num_points, 1)), np.log(scales), quaternions):
+        data[:, offset:offset + values.shape[-1]] = values
+        offset += values.shape[-1]
+    header = "\n".join([
+        "ply",
+        "format binary_little_endian 1.0",
+        f"element vertex {num_points}",
+        *(f"property float {x}" for x in attributes),
+        "end_header",
+    ]) + "\n"
+    with open(path, "wb") as f:
+        f.write(header.encode("ascii"))
+        f.write(memoryview(data).cast("B"))
+
+
+def generate_ksplat_file(path: str,
+                         xyz: np.ndarray,
+                         scales: np.ndarray,
+                         opacities: np.ndarray,
+                         quaternions: np.ndarray,
+                         spherical_harmonics: np.ndarray,
+                         *,
+                         compression_level: int = 0,
+                         spherical_harmonics_degree: int = 0,
+                         alpha_removal_threshold: int = 1,
+                         block_size: float = 5.0,
+                         bucket_size: int = 256):
+    """
+    Writes the Gaussians to a ksplat file (the format of the GaussianSplats3D viewer).
+
+    Args:
+        path: Output path.
+        xyz: Gaussian centers (N, 3).
+        scales: Gaussian scales after activation (N, 3).
+        opacities: Gaussian opacities after activation (N,) or (N, 1).
+        quaternions: Gaussian rotations as wxyz quaternions (N, 4).
+        spherical_harmonics: Spherical harmonics coefficients (N, 3, K).
+        compression_level: 0 stores float32 values, 1 quantizes centers to 16 bits and stores other
+            values as float16, 2 additionally stores spherical harmonics as 8 bits.
+        spherical_harmonics_degree: Degree of the stored spherical harmonics (0-2).
+        alpha_removal_threshold: Gaussians with opacity (in 0-255 range) below the threshold are removed.
+        block_size: Size of the grid cells used to group Gaussians for the position quantization.
+        bucket_size: Maximum number of Gaussians quantized relative to the same bucket center.
+    """
+    dtype = _get_ksplat_dtype(compression_level, spherical_harmonics_degree)
+    num_coefficients = _KSPLAT_SH_COEFFICIENTS[spherical_harmonics_degree]
+    opacities = opacities.reshape(-1)
+    alpha = np.clip(np.round(opacities * 255), 0, 255)
+    mask = alpha >= alpha_removal_threshold
+    if not np.all(mask):
+        xyz, scales, quaternions, spherical_harmonics, alpha = (
+            xyz[mask], scales[mask], quaternions[mask], spherical_harmonics[mask], alpha[mask])
+    num_splats = xyz.shape[0]
+    if num_splats > 0 and spherical_harmonics.shape[-1] < num_coefficients + 1:
+        raise ValueError(f"Spherical harmonics of degree {spherical_harmonics_degree} require at least {num_coefficients + 1} coefficients")
+
+    scene_center = (xyz.min(0) + xyz.max(0)) / 2 if num_splats > 0 else np.zeros(3)
+    half_block_size = block_size / 2
+    bucket_centers = np.zeros((0, 3), dtype=np.float64)
+    partial_lengths = np.zeros((0,), dtype=np.int64)
+    num_full_buckets = 0
+    if compression_level >= 1 and num_splats > 0:
+        order, num_full_buckets, partial_lengths, bucket_centers = _compute_ksplat_buckets(xyz, block_size, bucket_size)
+        xyz, scales, quaternions, spherical_harmonics, alpha = (
+            xyz[order], scales[order], quaternions[order], spherical_harmonics[order], alpha[order])
+
+    splats = np.empty(num_splats, dtype=dtype)
+    if compression_level >= 1:
+        splat_bucket_centers = bucket_centers[_get_ksplat_splat_buckets(num_splats, bucket_size, num_full_buckets, partial_lengths)]
+        scale_factor = _KSPLAT_COMPRESSION_SCALE_RANGE / half_block_size
+        splats["center"] = np.clip(
+            np.round((xyz - splat_bucket_centers) * scale_factor) + _KSPLAT_COMPRESSION_SCALE_RANGE,
+            0, 2 * _KSPLAT_COMPRESSION_SCALE_RANGE)
+    else:
+        splats["center"] = xyz
+    float_max = np.finfo(dtype["scale"].base).max
+    splats["scale"] = np.clip(scales, -float_max, float_max)
+    splats["rotation"] = quaternions / np.linalg.norm(quaternions, axis=-1, keepdims=True)
+    splats["color"][:, :3] = np.clip(np.round((0.5 + _SH_C0 * spherical_harmonics[:, :, 0]) * 255), 0, 255)
+    splats["color"][:, 3] = alpha
+    sh_min, sh_max = -1.5, 1.5
+    if num_coefficients > 0:
+        # Coefficients are stored coefficient-major with interleaved color channels
+        sh = spherical_harmonics[:, :, 1:num_coefficients + 1].transpose(0, 2, 1).reshape(num_splats, -1)
+        if compression_level == 2:
+            sh = np.clip(np.round((sh - sh_min) / (sh_max - sh_min) * 255), 0, 255)
+        splats["sh"] = sh
+
+    bucket_data_size = 0
+    if compression_level >= 1:
+        bucket_data_size = 4 * len(partial_lengths) + _KSPLAT_BUCKET_STORAGE_SIZE * len(bucket_centers)
+    section_size = bucket_data_size + splats.nbytes
+
+    # Header layout follows SplatBuffer of the GaussianSplats3D viewer
+    header = np.zeros(_KSPLAT_HEADER_SIZE, dtype=np.uint8)
+    header[0], header[1] = _KSPLAT_VERSION
+    header.view("<u4")[1:5] = (1, 1, num_splats, num_splats)
+    header.view("<u2")[10] = compression_level
+    header.view("<f4")[6:11] = (*scene_center, sh_min, sh_max)
+
+    section_header = np.zeros(_KSPLAT_SECTION_HEADER_SIZE, dtype=np.uint8)
+    section_header.view("<u4")[[0, 1, 7]] = (num_splats, num_splats, section_size)
+    section_header.view("<u2")[20] = spherical_harmonics_degree
+    if compression_level >= 1:
+        section_header.view("<u4")[[2, 3, 6, 8, 9]] = (
+            bucket_size, len(bucket_centers), _KSPLAT_COMPRESSION_SCALE_RANGE, num_full_buckets, len(partial_lengths))
+        section_header.view("<f4")[4] = block_size
+        section_header.view("<u2")[10] = _KSPLAT_BUCKET_STORAGE_SIZE
+
+    with open(path, "wb") as f:
+        f.write(header.data)
+        f.write(section_header.data)
+        if compression_level >= 1:
+            f.write(partial_lengths.astype("<u4").data)
+            f.write(bucket_centers.astype("<f4").data)
+        f.write(splats.data)
+
+
+def _read_ksplat_file(path: str):
+    """
+    Reads a single-section ksplat file written by :func:`generate_ksplat_file`.
+
+    Returns:
+        Dictionary with xyz, scales, opacities, quaternions, colors (base color in 0-1 range)
+        and spherical_harmonics (N, 3, K) without the DC term.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    header = np.frombuffer(data, dtype=np.uint8, count=_KSPLAT_HEADER_SIZE)
+    if tuple(header[:2]) != _KSPLAT_VERSION:
+        raise ValueError(f"Unsupported ksplat version {tuple(header[:2])}")
+    max_sections, num_sections = header.view("<u4")[1:3]
+    if num_sections != 1:
+        raise ValueError("Only single-section ksplat files are supported")
+    compression_level = int(header.view("<u2")[10])
+    sh_min, sh_max = header.view("<f4")[9:11]
+    section_header = np.frombuffer(data, dtype=np.uint8, count=_KSPLAT_SECTION_HEADER_SIZE, offset=_KSPLAT_HEADER_SIZE)
+    num_splats, _, bucket_size, num_buckets = (int(x) for x in section_header.view("<u4")[:4])
+    block_size = float(section_header.view("<f4")[4])
+    bucket_storage_size = int(section_header.view("<u2")[10])
+    scale_range = int(section_header.view("<u4")[6]) or _KSPLAT_COMPRESSION_SCALE_RANGE
+    num_full_buckets, num_partial_buckets = (int(x) for x in section_header.view("<u4")[8:10])
+    sh_degree = int(section_header.view("<u2")[20])
+    if compression_level >= 1 and bucket_storage_size != _KSPLAT_BUCKET_STORAGE_SIZE:
+        raise ValueError(f"Unsupported bucket storage size {bucket_storage_size}")
+    dtype = _get_ksplat_dtype(compression_level, sh_degree)
+
+    offset = _KSPLAT_HEADER_SIZE + int(max_sections) * _KSPLAT_SECTION_HEADER_SIZE
+    if compression_level >= 1:
+        partial_lengths = np.frombuffer(data, dtype="<u4", count=num_partial_buckets, offset=offset)
+        offset += 4 * num_partial_buckets
+        bucket_centers = np.frombuffer(data, dtype="<f4", count=3 * num_buckets, offset=offset).reshape(-1, 3)
+        offset += _KSPLAT_BUCKET_STORAGE_SIZE * num_buckets
+    splats = np.frombuffer(data, dtype=dtype, count=num_splats, offset=offset)
+    xyz = splats["center"].astype(np.float32)
+    if compression_level >= 1:
+        buckets = _get_ksplat_splat_buckets(num_splats, bucket_size, num_full_buckets, partial_lengths)
+        xyz = (xyz - scale_range) * (block_size / 2 / scale_range) + bucket_centers[buckets]
+    num_coefficients = _KSPLAT_SH_COEFFICIENTS[sh_degree]
+    spherical_harmonics = np.zeros((num_splats, 3, num_coefficients), dtype=np.float32)
+    if num_coefficients > 0:
+        sh = splats["sh"].astype(np.float32)
+        if compression_level == 2:
+            sh = sh / 255 * (sh_max - sh_min) + sh_min
+        spherical_harmonics = sh.reshape(num_splats, num_coefficients, 3).transpose(0, 2, 1)
+    return {
+        "xyz": xyz,
+        "scales": splats["scale"].astype(np.float32),
+        "quaternions": splats["rotation"].astype(np.float32),
+        "colors": splats["color"][:, :3].astype(np.float32) / 255,
+        "opacities": splats["color"][:, 3].astype(np.float32) / 255,
+        "spherical_harmonics": spherical_harmonics,
+    }
+
+
+def _compute_morton_codes(xyz: np.ndarray, bits: int = 10) -> np.ndarray:
+    # Quantize the positions to a (2^bits)^3 grid and interleave the bits of the coordinates
+    min_corner, max_corner = xyz.min(0), xyz.max(0)
+    extent = np.maximum(max_corner - min_corner, 1e-8)
+    grid = np.clip((xyz - min_corner) / extent * (1 << bits), 0, (1 << bits) - 1).astype(np.uint64)
+    codes = np.zeros(len(xyz), dtype=np.uint64)
+    for bit in range(bits):
+        for axis in range(3):
+            codes |= ((grid[:, axis] >> np.uint64(bit)) & np.uint64(1)) << np.uint64(3 * bit + axis)
+    return codes
+
+
+def generate_chunked_scene(path: str,
+                           xyz: np.ndarray,
+                           scales: np.ndarray,
+                           opacities: np.ndarray,
+                           quaternions: np.ndarray,
+                           spherical_harmonics: np.ndarray,
+                           *,
+                           num_levels: int = 3,
+                           chunk_size: int = 262144,
+                           prune_opacity: float = 0.0,
+                           prune_scale: float = 0.0,
+                           compression_level: int = 1,
+                           spherical_harmonics_degree: int = 0,
+                           scene_name: str = "scene") -> dict:
+    """
+    Exports the Gaussians as a set of spatially ordered ksplat chunks organized into coarse-to-fine levels.
+    The first level contains the most important Gaussians (by opacity and size), each further level
+    adds four times as many Gaussians. Within a level, Gaussians are sorted along a Morton curve and
+    split into chunks of at most chunk_size Gaussians. The manifest ``{scene_name}.json`` stores the
+    chunk paths and bounds so that the demo can load the levels progressively.
+
+    Args:
+        path: Output directory.
+        xyz: Gaussian centers (N, 3).
+        scales: Gaussian scales after activation (N, 3).
+        opacities: Gaussian opacities after activation (N,) or (N, 1).
+        quaternions: Gaussian rotations as wxyz quaternions (N, 4).
+        spherical_harmonics: Spherical harmonics coefficients (N, 3, K).
+        num_levels: Number of levels of detail.
+        chunk_size: Maximum number of Gaussians in a chunk.
+        prune_opacity: Gaussians with lower opacity are removed.
+        prune_scale: Gaussians with all scales lower than this value are removed.
+        compression_level: Compression level of the ksplat chunks.
+        spherical_harmonics_degree: Degree of the stored spherical harmonics.
+        scene_name: Name of the manifest and of the directory with the chunks.
+
+    Returns:
+        The manifest.
+    """
+    if num_levels < 1:
+        raise ValueError("num_levels must be at least 1")
+    opacities = opacities.reshape(-1)
+    mask = (opacities >= prune_opacity) & (scales.max(-1) >= prune_scale)
+    if not np.all(mask):
+        logging.info(f"Pruned {np.sum(~mask)} out of {len(mask)} Gaussians")
+        xyz, scales, opacities, quaternions, spherical_harmonics = (
+            xyz[mask], scales[mask], opacities[mask], quaternions[mask], spherical_harmonics[mask])
+    num_gaussians = len(xyz)
+
+    # Most visible Gaussians (approximated by the opacity times the projected area) go first
+    importance = opacities * np.prod(scales, -1) ** (2 / 3)
+    importance_order = np.argsort(-importance, kind="stable")
+    level_ends = [int(np.ceil(num_gaussians / 4 ** (num_levels - 1 - level))) for level in range(num_levels)]
+    morton_codes = _compute_morton_codes(xyz) if num_gaussians > 0 else np.zeros(0, dtype=np.uint64)
+
+    os.makedirs(os.path.join(path, scene_name), exist_ok=True)
+    levels = []
+    level_start = 0
+    for level, level_end in enumerate(level_ends):
+        indices = importance_order[level_start:level_end]
+        indices = indices[np.argsort(morton_codes[indices], kind="stable")]
+        chunks = []
+        for chunk_start in range(0, len(indices), chunk_size):
+            chunk = indices[chunk_start:chunk_start + chunk_size]
+            uri = f"{scene_name}/{level}_{len(chunks)}.ksplat"
+            generate_ksplat_file(os.path.join(path, uri),
+                                 xyz[chunk], scales[chunk], opacities[chunk], quaternions[chunk], spherical_harmonics[chunk],
+                                 compression_level=compression_level,
+                                 spherical_harmonics_degree=spherical_harmonics_degree,
+                                 alpha_removal_threshold=0)
+            chunks.append({
+                "uri": uri,
+                "numGaussians": len(chunk),
+                "min": xyz[chunk].min(0).tolist(),
+                "max": xyz[chunk].max(0).tolist(),
+            })
+        levels.append({"level": level, "numGaussians": len(indices), "chunks": chunks})
+        level_start = level_end
+
+    manifest = {
+        "version": 1,
+        "format": "ksplat",
+        "compressionLevel": compression_level,
+        "sphericalHarmonicsDegree": spherical_harmonics_degree,
+        "numGaussians": num_gaussians,
+        "min": xyz.min(0).tolist() if num_gaussians > 0 else None,
+        "max": xyz.max(0).tolist() if num_gaussians > 0 else None,
+        "levels": levels,
+    }
+    with open(os.path.join(path, f"{scene_name}.json"), "w", encoding="utf8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
 
 
 def export_demo(path: str, *,
@@ -196,5 +519,31 @@ def export_demo(path: str, *,
                 spherical_harmonics: np.ndarray,
                 options):
     os.makedirs(path, exist_ok=True)
-    generate_ksplat_file(os.path.join(path, "scene.ksplat"), xyz, scales, opacities, quaternions, spherical_harmonics)
+    options = (options or {}).copy()
+    lod_levels = _cast_value(Optional[int], options.pop("lod_levels", None))
+    chunk_size = _cast_value(int, options.pop("chunk_size", 262144))
+    prune_opacity = _cast_value(float, options.pop("prune_opacity", 0.0))
+    prune_scale = _cast_value(float, options.pop("prune_scale", 0.0))
+    compression_level = _cast_value(Optional[int], options.pop("compression_level", None))
+    sh_degree = _cast_value(int, options.pop("sh_degree", 0))
+    if lod_levels is not None:
+        # Chunked scene which can be loaded progressively
+        generate_chunked_scene(path, xyz, scales, opacities, quaternions, spherical_harmonics,
+                               num_levels=lod_levels,
+                               chunk_size=chunk_size,
+                               prune_opacity=prune_opacity,
+                               prune_scale=prune_scale,
+                               compression_level=compression_level if compression_level is not None else 1,
+                               spherical_harmonics_degree=sh_degree)
+        export_generic_demo(path, options=options, scene_manifest_uri="scene.json")
+        return
+
+    if prune_opacity > 0 or prune_scale > 0:
+        mask = (opacities.reshape(-1) >= prune_opacity) & (scales.max(-1) >= prune_scale)
+        xyz, scales, opacities, quaternions, spherical_harmonics = (
+            xyz[mask], scales[mask], opacities[mask], quaternions[mask], spherical_harmonics[mask])
+    generate_ksplat_file(os.path.join(path, "scene.ksplat"),
+                         xyz, scales, opacities, quaternions, spherical_harmonics,
+                         compression_level=compression_level or 0,
+                         spherical_harmonics_degree=sh_degree)
     export_generic_demo(path, options=options)
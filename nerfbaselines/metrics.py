@@ -352,6 +352,44 @@ def mae(a: np.ndarray, b: np.ndarray) -> Union[np.ndarray, np.float32]:
     return _mean(np.abs(a - b))
 
 
+_uint8_error_tables = None
+
+
+def _get_uint8_error_tables():
+    # Squared and absolute errors of all pairs of 8-bit values, computed with the same
+    # float32 operations as convert_image_dtype followed by mse and mae
+    global _uint8_error_tables
+    if _uint8_error_tables is None:
+        values = np.arange(256, dtype=np.float32)
+        values /= 255.0
+        values = _normalize_input(values)
+        diff = values[:, None] - values[None, :]
+        _uint8_error_tables = (diff ** 2).ravel(), np.abs(diff).ravel()
+    return _uint8_error_tables
+
+
+def mse_mae_uint8(a: np.ndarray, b: np.ndarray) -> Tuple[Union[np.ndarray, np.float32], Union[np.ndarray, np.float32]]:
+    """
+    Compute Mean Squared Error and Mean Absolute Error of 8-bit images.
+    The per-pixel errors are looked up from precomputed tables instead of converting the full
+    images to float. The results are bit-identical to :func:`mse` and :func:`mae` applied
+    to the images converted to float32.
+    Args:
+        a: Tensor of prediction images [B, H, W, C] (uint8).
+        b: Tensor of target images [B, H, W, C] (uint8).
+    Returns:
+        Tuple of tensors of mean squared error and mean absolute error values for each image [B]
+        (on the [0, 1] scale).
+    """
+    assert a.shape == b.shape, f"Images must have the same shape, got {a.shape} and {b.shape}"
+    assert a.dtype == np.uint8 and b.dtype == np.uint8, f"Expected uint8 inputs, got {a.dtype} and {b.dtype}"
+    squared_errors, absolute_errors = _get_uint8_error_tables()
+    index = a.astype(np.uint16)
+    index <<= 8
+    index |= b
+    return _mean(squared_errors.take(index)), _mean(absolute_errors.take(index))
+
+
 def psnr(a: Union[np.ndarray, np.float32, np.float64], b: Optional[np.ndarray] = None) -> Union[np.ndarray, np.float32, np.float64]:
     """
     Compute Peak Signal to Noise Ratio (the higher the better).
@@ -10,7 +10,7 @@ from pathlib import Path
 import json
 import warnings
 import numpy as np
-from .io import open_any
+from .io import open_any, _http_get_cached
 from . import (
     metrics, get_method_spec, 
     get_dataset_spec, 
@@ -29,6 +29,8 @@ except ImportError:
 
 
 DEFAULT_DATASET_ORDER = ["mipnerf360", "blender", "tanksandtemples"]
+_RESULTS_FETCH_WORKERS = 8
+_method_info_cache: Dict[str, MethodInfo] = {}
 MethodLink = Literal["paper", "website", "results", "none"]
 
 
@@ -118,6 +120,10 @@ def _mock_build_method(spec: MethodSpec) -> Iterator[Type[Method]]:
     if not path.startswith("nerfbaselines.methods."):
         raise RuntimeError(f"Method does not have implementation in the nerfbaselines.methods package: {method_implementation}")
 
+    # Import the real dependencies which nerfbaselines imports lazily before
+    # patching the imports. Otherwise, their optional imports would be mocked.
+    import requests  # noqa: F401
+
     old_import = __import__
     def _patch_import(name, globals=None, locals=None, fromlist=(), level=0):
         if level > 0:
@@ -149,6 +155,15 @@ def get_method_info_from_spec(spec: MethodSpec) -> MethodInfo:
     Returns:
         The method info.
     """
+    # Building the method class (with mocked imports) is slow, we memoize the result
+    cache_key = json.dumps(spec, sort_keys=True, default=repr)
+    method_info = _method_info_cache.get(cache_key)
+    if method_info is None:
+        method_info = _method_info_cache[cache_key] = _get_method_info_from_spec(spec)
+    return cast(MethodInfo, method_info.copy())
+
+
+def _get_method_info_from_spec(spec: MethodSpec) -> MethodInfo:
     supported_camera_models = spec.get("supported_camera_models", None)
     supported_outputs = spec.get("supported_outputs", None)
     required_features = spec.get("required_features", None)
@@ -180,6 +195,28 @@ def get_method_info_from_spec(spec: MethodSpec) -> MethodInfo:
         raise
 
 
+def _fetch_json_files(links: List[str]) -> List[Any]:
+    if not links:
+        return []
+    import requests
+    from requests.adapters import HTTPAdapter
+    from concurrent.futures import ThreadPoolExecutor
+
+    num_workers = min(_RESULTS_FETCH_WORKERS, len(links))
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=num_workers) as executor:
+        adapter = HTTPAdapter(pool_maxsize=num_workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        def fetch(link):
+            if link.startswith("http://") or link.startswith("https://"):
+                return json.loads(_http_get_cached(link, session=session).decode("utf8"))
+            with open_any(link, "r") as f:
+                return json.load(f)
+
+        return list(executor.map(fetch, links))
+
+
 def compile_dataset_results(results_path: Union[Path, str], dataset: str, scenes: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Compile the results.json file from the results repository.
@@ -220,6 +257,7 @@ def compile_dataset_results(results_path: Union[Path, str], dataset: str, scenes
             method_data["scenes"][scene_id]["output_artifact"] = output_artifact
 
     # Fill the results from the methods registry
+    artifact_results = []
     for method_id in get_supported_methods():
         method_spec = get_method_spec(method_id)
         method_data = method_spec.get("metadata", {}).copy()
@@ -242,9 +280,12 @@ def compile_dataset_results(results_path: Union[Path, str], dataset: str, scenes
 
             assert info["link"].endswith(".zip"), f"Output artifact link {info['link']} does not end with .zip"
             results_link = info["link"][:-4] + ".json"
-            with open_any(results_link, "r") as f:
-                results = json.load(f)
-            _add_scene_data(scene_id, method_id, method_data, results, info)
+            artifact_results.append((scene_id, method_id, method_data, info, results_link))
+
+    # Fetch the results of the output artifacts in parallel
+    for (scene_id, method_id, method_data, info, _), results in zip(
+            artifact_results, _fetch_json_files([x[-1] for x in artifact_results])):
+        _add_scene_data(scene_id, method_id, method_data, results, info)
 
     
     for method_id in os.listdir(results_path):
@@ -1,4 +1,5 @@
 import importlib
+import contextlib
 import subprocess
 import shutil
 import struct
@@ -28,6 +29,7 @@ from .io import (
     serialize_nb_info, 
     save_output_artifact,
     new_nb_info,
+    _get_predictions_relative_name,
 )
 from ._registry import loggers_registry
 from .utils import (
@@ -38,7 +40,7 @@ from .utils import (
 )
 from .datasets import dataset_index_select
 from .evaluation import (
-    render_all_images, evaluate, build_evaluation_protocol,
+    render_all_images, build_evaluation_protocol, PredictionsEvaluator,
 )
 from .logging import ConcatLogger, Logger, log_metrics
 try:
@@ -56,6 +58,111 @@ class ResourcesUtilizationInfo(TypedDict, total=False):
     gpu_name: str
 
 
+def _read_proc_status(pid: int, *, proc: str = "/proc") -> Dict[str, int]:
+    # Returns the memory fields (in kB) of /proc/<pid>/status
+    out = {}
+    with open(os.path.join(proc, str(pid), "status"), "r") as f:
+        for line in f:
+            if line.startswith("Vm") and line.endswith(" kB\n"):
+                key, value = line.split(":", 1)
+                out[key] = int(value[:-4])
+    return out
+
+
+def _get_process_tree(pid: int, *, proc: str = "/proc") -> List[int]:
+    # Lists the process and all its descendants using procfs (no subprocess is spawned)
+    def _scan_children():
+        children: Dict[int, List[int]] = {}
+        for name in os.listdir(proc):
+            if not name.isdigit():
+                continue
+            try:
+                with open(os.path.join(proc, name, "stat"), "rb") as f:
+                    stat = f.read()
+            except OSError:
+                continue
+            # NOTE: The process name can contain spaces and parentheses
+            ppid = int(stat[stat.rfind(b")") + 2:].split(maxsplit=2)[1])
+            children.setdefault(ppid, []).append(int(name))
+        return children
+
+    children: Optional[Dict[int, List[int]]] = None
+    all_processes = []
+    stack = [pid]
+    while stack:
+        cpid = stack.pop()
+        all_processes.append(cpid)
+        if children is None:
+            # /proc/<pid>/task/<tid>/children is not available on all kernels
+            try:
+                cchildren = []
+                for tid in os.listdir(os.path.join(proc, str(cpid), "task")):
+                    with open(os.path.join(proc, str(cpid), "task", tid, "children"), "r") as f:
+                        cchildren.extend(int(x) for x in f.read().split())
+                stack.extend(cchildren)
+                continue
+            except FileNotFoundError:
+                if cpid != pid:
+                    # The process has already exited
+                    continue
+                children = _scan_children()
+        stack.extend(children.get(cpid, []))
+    return all_processes
+
+
+def _get_gpu_utilization_nvidia_smi(all_processes, current_platform: str) -> Tuple[int, Dict[str, int]]:
+    gpu_memory = 0
+    gpus: Dict[str, int] = {}
+    uuids = set()
+    nvidia_smi_command = "nvidia-smi --query-compute-apps=pid,used_memory,gpu_uuid,gpu_name --format=csv,noheader,nounits"
+    if current_platform == "Windows":
+        out = subprocess.check_output(nvidia_smi_command, shell=True, text=True).splitlines()
+    else:
+        out = subprocess.check_output(nvidia_smi_command.split(), text=True).splitlines()
+    for line in out:
+        cpid, used_memory, uuid, gpu_name = tuple(x.strip() for x in line.split(",", 3))
+        try:
+            cpid = int(cpid)
+            used_memory = int(used_memory)
+        except ValueError:
+            # Unused GPUs could sometimes return [N/A]
+            continue
+        if cpid in all_processes:
+            gpu_memory += used_memory
+            if uuid not in uuids:
+                uuids.add(uuid)
+                gpus[gpu_name] = gpus.get(gpu_name, 0) + 1
+    return gpu_memory, gpus
+
+
+class _NvmlGpuReader:
+    def __init__(self):
+        import pynvml
+
+        pynvml.nvmlInit()
+        self._pynvml = pynvml
+        self._handles = [pynvml.nvmlDeviceGetHandleByIndex(i) for i in range(pynvml.nvmlDeviceGetCount())]
+
+    def read(self, all_processes) -> Tuple[int, Dict[str, int]]:
+        gpu_memory = 0
+        gpus: Dict[str, int] = {}
+        for handle in self._handles:
+            used = [p.usedGpuMemory for p in self._pynvml.nvmlDeviceGetComputeRunningProcesses(handle)
+                    if p.pid in all_processes]
+            if not used:
+                continue
+            gpu_memory += sum(x for x in used if x is not None) // (1024 * 1024)
+            gpu_name = self._pynvml.nvmlDeviceGetName(handle)
+            if isinstance(gpu_name, bytes):
+                gpu_name = gpu_name.decode("utf8")
+            gpus[gpu_name] = gpus.get(gpu_name, 0) + 1
+        return gpu_memory, gpus
+
+
+def _format_gpu_names(gpus: Dict[str, int]) -> str:
+    return ",".join(f"{k}:{v}" if v > 1 else k for k, v in gpus.items())
+
+
 @run_on_host()
 def get_resources_utilization_info(pid: Optional[int] = None) -> ResourcesUtilizationInfo:
     import platform
@@ -97,6 +204,20 @@ def get_resources_utilization_info(pid: Optional[int] = None) -> ResourcesUtiliz
         except Exception:
             logging.error(f"Failed to get resource usage information on {current_platform}", exc_info=True)
             return info
+    elif current_platform == "Linux" and os.path.exists(f"/proc/{pid}/status"):
+        try:
+            mem = 0
+            all_processes = set(_get_process_tree(pid))
+            for cpid in all_processes:
+                try:
+                    mem += _read_proc_status(cpid).get("VmRSS", 0)
+                except OSError:
+                    # The process has already exited
+                    pass
+            info["memory"] = (mem + 1024 - 1) // 1024
+        except Exception:
+            logging.error(f"Failed to get resource usage information on {current_platform}", exc_info=True)
+            return info
     else:  # Linux or macOS
         try:
             mem = 0
@@ -120,28 +241,8 @@ def get_resources_utilization_info(pid: Optional[int] = None) -> ResourcesUtiliz
             return info
 
     try:
-        gpu_memory = 0
-        gpus = {}
-        uuids = set()
-        nvidia_smi_command = "nvidia-smi --query-compute-apps=pid,used_memory,gpu_uuid,gpu_name --format=csv,noheader,nounits"
-        if current_platform == "Windows":
-            out = subprocess.check_output("nvidia-smi --query-compute-apps=pid,used_memory,gpu_uuid,gpu_name --format=csv,noheader,nounits", shell=True, text=True).splitlines()
-        else:
-            out = subprocess.check_output(nvidia_smi_command.split(), text=True).splitlines()
-        for line in out:
-            cpid, used_memory, uuid, gpu_name = tuple(x.strip() for x in line.split(",", 3))
-            try:
-                cpid = int(cpid)
-                used_memory = int(used_memory)
-            except ValueError:
-                # Unused GPUs could sometimes return [N/A]
-                continue
-            if cpid in all_processes:
-                gpu_memory += used_memory
-                if uuid not in uuids:
-                    uuids.add(uuid)
-                    gpus[gpu_name] = gpus.get(gpu_name, 0) + 1
-        info["gpu_name"] = ",".join(f"{k}:{v}" if v > 1 else k for k, v in gpus.items())
+        gpu_memory, gpus = _get_gpu_utilization_nvidia_smi(all_processes, current_platform)
+        info["gpu_name"] = _format_gpu_names(gpus)
         info["gpu_memory"] = gpu_memory
     except Exception:
         logging.error(f"Failed to get GPU utilization on {current_platform}", exc_info=True)
@@ -150,6 +251,171 @@ def get_resources_utilization_info(pid: Optional[int] = None) -> ResourcesUtiliz
     return info
 
 
+def _get_resources_sampling_interval() -> float:
+    return float(os.environ.get("NERFBASELINES_RESOURCES_SAMPLING_INTERVAL", "1.0"))
+
+
+def _get_nvidia_smi_sampling_interval() -> float:
+    return float(os.environ.get("NERFBASELINES_NVIDIA_SMI_SAMPLING_INTERVAL", "60.0"))
+
+
+class ResourcesUtilizationSampler:
+    """
+    Samples the memory usage of a process and its children in a background thread and tracks the peak values.
+    On Linux, the memory is read from procfs (no subprocesses are spawned) and the peak RSS reported by
+    the kernel (``VmHWM``) is included, so that peaks between samples are not missed. GPU memory is read
+    using NVML (``pip install nerfbaselines[nvml]``) if installed. Otherwise, ``nvidia-smi`` is used, but
+    because it spawns a process, it is only polled every ``NERFBASELINES_NVIDIA_SMI_SAMPLING_INTERVAL``
+    seconds (60s by default) and when the sampler stops. On other platforms,
+    ``get_resources_utilization_info`` is used for every sample.
+
+    Args:
+        pid: The root process (defaults to the current process).
+        interval: Sampling interval in seconds (defaults to ``NERFBASELINES_RESOURCES_SAMPLING_INTERVAL`` or 1s).
+        max_samples: Maximum number of samples kept in the time series.
+        gpu: Whether to sample the GPU memory.
+        proc: Path where procfs is mounted.
+    """
+    def __init__(self, 
+                 pid: Optional[int] = None, 
+                 *,
+                 interval: Optional[float] = None, 
+                 max_samples: int = 10_000, 
+                 gpu: bool = True,
+                 proc: str = "/proc"):
+        import collections
+        import threading
+
+        self.pid = pid if pid is not None else os.getpid()
+        self.interval = interval if interval is not None else _get_resources_sampling_interval()
+        self.proc = proc
+        # Time series of (time, memory, gpu_memory) in seconds and MB
+        self.samples: "collections.deque[Tuple[float, int, Optional[int]]]" = collections.deque(maxlen=max_samples)
+        self._gpu = gpu
+        self._gpu_reader: Any = None
+        self._gpu_reader_interval = 0.0
+        self._gpu_last_read: Optional[Tuple[float, Tuple[int, Dict[str, int]]]] = None
+        self._use_procfs = os.path.exists(os.path.join(proc, str(self.pid), "status"))
+        self._info: ResourcesUtilizationInfo = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_time = time.monotonic()
+
+    def _read_gpu(self, all_processes) -> Optional[Tuple[int, Dict[str, int]]]:
+        if not self._gpu:
+            return None
+        if self._gpu_reader is None:
+            try:
+                self._gpu_reader = _NvmlGpuReader().read
+            except Exception:
+                if shutil.which("nvidia-smi") is None:
+                    self._gpu = False
+                    return None
+                self._gpu_reader = lambda pids: _get_gpu_utilization_nvidia_smi(pids, "Linux")
+                # Spawning nvidia-smi is expensive, it is polled much less frequently than procfs
+                self._gpu_reader_interval = _get_nvidia_smi_sampling_interval()
+        now = time.monotonic()
+        if self._gpu_last_read is not None and now - self._gpu_last_read[0] < self._gpu_reader_interval:
+            return self._gpu_last_read[1]
+        try:
+            gpu = self._gpu_reader(all_processes)
+        except Exception:
+            logging.warning("Failed to get GPU utilization. GPU memory will not be sampled.", exc_info=True)
+            self._gpu = False
+            return None
+        self._gpu_last_read = (now, gpu)
+        return gpu
+
+    def sample(self) -> ResourcesUtilizationInfo:
+        """
+        Takes a single sample and updates the peak values.
+
+        Returns:
+            The current resource utilization.
+        """
+        current: ResourcesUtilizationInfo = {}
+        peak_memory = 0
+        if self._use_procfs:
+            memory = 0
+            all_processes = set(_get_process_tree(self.pid, proc=self.proc))
+            for cpid in all_processes:
+                try:
+                    status = _read_proc_status(cpid, proc=self.proc)
+                except OSError:
+                    # The process has already exited
+                    continue
+                memory += status.get("VmRSS", 0)
+                if cpid == self.pid:
+                    peak_memory = status.get("VmHWM", 0)
+            current["memory"] = (memory + 1024 - 1) // 1024
+            peak_memory = (peak_memory + 1024 - 1) // 1024
+            gpu = self._read_gpu(all_processes)
+            if gpu is not None:
+                current["gpu_memory"], gpus = gpu
+                current["gpu_name"] = _format_gpu_names(gpus)
+        else:
+            current = get_resources_utilization_info(self.pid)
+
+        with self._lock:
+            self.samples.append((time.monotonic() - self._start_time, current.get("memory", 0), current.get("gpu_memory")))
+            info = self._info
+            info["memory"] = max(info.get("memory", 0), current.get("memory", 0), peak_memory)
+            if "gpu_memory" in current:
+                info["gpu_memory"] = max(info.get("gpu_memory", 0), current["gpu_memory"])
+            if current.get("gpu_name"):
+                info["gpu_name"] = current["gpu_name"]
+        return current
+
+    def get_info(self) -> ResourcesUtilizationInfo:
+        """
+        Returns the peak resource utilization observed so far.
+        """
+        with self._lock:
+            return cast(ResourcesUtilizationInfo, dict(self._info))
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.sample()
+            except Exception:
+                logging.error("Failed to sample resource utilization. Stopping the sampler.", exc_info=True)
+                break
+
+    def start(self):
+        """
+        Takes the first sample and starts the background thread.
+        """
+        import threading
+
+        if self._thread is not None:
+            return
+        self.sample()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="nb-resources-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the background thread and takes the last sample.
+        """
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        # The last sample always reads the GPU memory
+        self._gpu_last_read = None
+        self.sample()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+
 def _get_config_overrides_from_presets(spec: MethodSpec, presets: Union[Set[str], Sequence[str]]) -> Dict[str, Any]:
     """
     Apply presets to a method spec and return the config overrides.
@@ -401,6 +667,9 @@ def eval_all(method: Method, logger: Optional[Logger], dataset: Dataset, *, outp
         os.unlink(output_metrics)
         logging.warning(f"Removed existing results at {output_metrics}")
 
+    # Metrics are computed from the images as they are written (no need to read the predictions back)
+    image_names = [str(_get_predictions_relative_name(dataset, i).with_suffix(".png")) for i in range(len(dataset["image_paths"]))]
+    evaluator = PredictionsEvaluator(evaluation_protocol, image_names=image_names)
     start = time.perf_counter()
     num_vis_images = 16
     vis_images: List[Tuple[np.ndarray, np.ndarray]] = []
@@ -416,6 +685,7 @@ def eval_all(method: Method, logger: Optional[Logger], dataset: Dataset, *, outp
             description=f"Rendering all images at step={step}",
             nb_info=nb_info,
             evaluation_protocol=evaluation_protocol,
+            on_saved=evaluator.add_file,
         ),
         image_sizes,
     ):
@@ -429,14 +699,10 @@ def eval_all(method: Method, logger: Optional[Logger], dataset: Dataset, *, outp
             if "depth" in pred:
                 near_far = dataset["cameras"].nears_fars[i] if dataset["cameras"].nears_fars is not None else None
                 vis_depth.append(visualize_depth(pred["depth"], expected_scale=expected_scene_scale, near_far=near_far))
-    elapsed = time.perf_counter() - start
+    elapsed = time.perf_counter() - start - evaluator.evaluation_time
 
-    # Compute metrics
-    info = evaluate(
-        output, 
-        output_metrics, 
-        evaluation_protocol=evaluation_protocol,
-        description=f"evaluating all images at step={step}")
+    # Save the metrics
+    info = evaluator.save(output_metrics)
     metrics = info["metrics"]
 
     if logger:
@@ -579,6 +845,7 @@ class Trainer:
         self._dataset_metadata = None
         self._total_train_time = 0
         self._resources_utilization_info = None
+        self._resources_sampler: Optional[ResourcesUtilizationSampler] = None
         self._train_dataset_for_eval = None
         self._acc_metrics = MetricsAccumulator({
             "total-train-time": "last",
@@ -731,12 +998,16 @@ class Trainer:
         util: Dict[str, Union[int, float]] = {}
         if self._resources_utilization_info is None:
             update = True
-        elif self.step % 1000 == 11:
+        elif self._resources_sampler is not None or self.step % 1000 == 11:
             update = True
             util = self._resources_utilization_info
         if update:
-            logging.debug(f"Computing resource utilization at step={self.step}")
-            new_util = cast(Dict[str, int], get_resources_utilization_info())
+            if self._resources_sampler is not None:
+                # The peaks are tracked by the background sampler
+                new_util = cast(Dict[str, int], self._resources_sampler.get_info())
+            else:
+                logging.debug(f"Computing resource utilization at step={self.step}")
+                new_util = cast(Dict[str, int], get_resources_utilization_info())
             for k, v in new_util.items():
                 if k not in util:
                     util[k] = 0
@@ -746,6 +1017,30 @@ class Trainer:
                     util[k] = max(util[k], v)
             self._resources_utilization_info = util
 
+    @contextlib.contextmanager
+    def _sample_resource_utilization(self):
+        # Samples the resource utilization in a background thread (disabled if the interval is 0)
+        if _get_resources_sampling_interval() <= 0:
+            yield
+            return
+        self._resources_sampler = ResourcesUtilizationSampler()
+        self._resources_sampler.start()
+        try:
+            yield
+        finally:
+            self._resources_sampler.stop()
+            self._update_resource_utilization_info()
+            self._resources_sampler = None
+
+    def _log_resource_utilization(self, logger: Logger):
+        if self._resources_sampler is None or not self._resources_sampler.samples:
+            return
+        _, memory, gpu_memory = self._resources_sampler.samples[-1]
+        metrics: Dict[str, int] = {"memory": memory}
+        if gpu_memory is not None:
+            metrics["gpu-memory"] = gpu_memory
+        log_metrics(logger, metrics, prefix="resources/", step=self.step)
+
     def train(self):
         assert self.num_iterations is not None, "num_iterations must be set"
         assert self._average_image_size is not None, "dataset not set"
@@ -757,7 +1052,8 @@ class Trainer:
 
         update_frequency = 100
         final_metrics = None
-        with tqdm(total=self.num_iterations, initial=self.step, desc="training") as pbar:
+        with tqdm(total=self.num_iterations, initial=self.step, desc="training") as pbar, \
+                self._sample_resource_utilization():
             for i in range(self.step, self.num_iterations):
                 final_metrics = None
                 self.step = i
@@ -784,6 +1080,7 @@ class Trainer:
                     if postfix:
                         pbar.set_postfix(postfix)
                     log_metrics(logger, acc_metrics, prefix="train/", step=self.step)
+                    self._log_resource_utilization(logger)
 
                 # Visualize and save
                 if self.step in self.save_iters:
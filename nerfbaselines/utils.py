@@ -2,7 +2,9 @@ import math
 import numpy as np
 from operator import mul
 from functools import reduce
+import functools
 import threading
+from collections import OrderedDict
 import sys
 from typing import Any, Optional, Dict, TYPE_CHECKING, Union, List, TypeVar, Callable, Tuple, cast
 import numpy as np
@@ -188,6 +190,18 @@ def padded_stack(tensors: Union[np.ndarray, Tuple[np.ndarray, ...], List[np.ndar
     return np.stack(out_tensors, 0)
 
 
+def _convert_image_dtype_reference(image: np.ndarray, dtype) -> np.ndarray:
+    if image.dtype == dtype:
+        return image
+    if image.dtype != np.uint8 and dtype != np.uint8:
+        return image.astype(dtype)
+    if image.dtype == np.uint8 and dtype != np.uint8:
+        return image.astype(dtype) / 255.0
+    if image.dtype != np.uint8 and dtype == np.uint8:
+        return np.clip(image * 255.0, 0, 255).astype(np.uint8)
+    raise ValueError(f"cannot convert image from {image.dtype} to {dtype}")
+
+
 def convert_image_dtype(image: np.ndarray, dtype) -> np.ndarray:
     """
     Convert an image to a given dtype.
@@ -203,13 +217,17 @@ def convert_image_dtype(image: np.ndarray, dtype) -> np.ndarray:
         dtype = np.dtype(dtype)
     if image.dtype == dtype:
         return image
-    if image.dtype != np.uint8 and dtype != np.uint8:
-        return image.astype(dtype)
-    if image.dtype == np.uint8 and dtype != np.uint8:
-        return image.astype(dtype) / 255.0
-    if image.dtype != np.uint8 and dtype == np.uint8:
-        return np.clip(image * 255.0, 0, 255).astype(np.uint8)
-    raise ValueError(f"cannot convert image from {image.dtype} to {dtype}")
+    if isinstance(image, np.ndarray):
+        # Same operations as the reference implementation, but without the extra full-size temporaries
+        if image.dtype == np.uint8 and np.dtype(dtype).kind == "f":
+            out = image.astype(dtype)
+            out /= 255.0
+            return out
+        if image.dtype.kind == "f" and dtype == np.uint8:
+            out = image * 255.0
+            np.clip(out, 0, 255, out=out)
+            return out.astype(np.uint8)
+    return _convert_image_dtype_reference(image, dtype)
 
 
 def _srgb_to_linear(img):
@@ -224,6 +242,64 @@ def _linear_to_srgb(img):
     return np.where(img > limit, 1.055 * (img ** (1.0 / 2.4)) - 0.055, 12.92 * img)
 
 
+def _linear_to_srgb_uint8_reference(img):
+    return _convert_image_dtype_reference(_linear_to_srgb(_convert_image_dtype_reference(img, np.float32)), np.uint8)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_linear_to_srgb_uint8_lut() -> np.ndarray:
+    lut = _linear_to_srgb_uint8_reference(np.arange(256, dtype=np.uint8))
+    lut.setflags(write=False)
+    return lut
+
+
+def _linear_to_srgb_uint8(img: np.ndarray) -> np.ndarray:
+    if img.dtype == np.uint8:
+        return _get_linear_to_srgb_uint8_lut().take(img)
+
+    # Same float32 operations as _linear_to_srgb followed by the 8-bit rounding, done in-place
+    img = img.astype(np.float32, copy=False)
+    out = img ** (1.0 / 2.4)
+    out *= 1.055
+    out -= 0.055
+    np.multiply(img, 12.92, out=out, where=np.logical_not(img > 0.0031308))
+    out *= 255.0
+    np.clip(out, 0, 255, out=out)
+    return out.astype(np.uint8)
+
+
+@functools.lru_cache(maxsize=16)
+def _get_blend_uint8_lut(background_color: Optional[Tuple[float, ...]], color_space: str) -> np.ndarray:
+    # Output for each (channel, color, alpha) triplet computed exactly as the float pipeline would
+    values = _convert_image_dtype_reference(np.arange(256, dtype=np.uint8), np.float32)
+    color, alpha = values[:, None, None], values[None, :, None]
+    blended = color * alpha
+    if background_color is not None:
+        blended = blended + (1 - alpha) * np.array(background_color, dtype=np.float32)
+    if color_space == "linear":
+        blended = _linear_to_srgb(blended)
+    lut = _convert_image_dtype_reference(np.broadcast_to(blended, (256, 256, 3)), np.uint8)
+    lut = np.ascontiguousarray(lut.transpose(2, 0, 1)).reshape(3, -1)
+    lut.setflags(write=False)
+    return lut
+
+
+def _blend_uint8(tensor: np.ndarray, background_color: Optional[np.ndarray], color_space: str) -> np.ndarray:
+    background_color_key = None
+    if background_color is not None:
+        background_color = convert_image_dtype(np.asarray(background_color), np.float32)
+        background_color_key = tuple(np.broadcast_to(background_color, (3,)).tolist())
+    lut = _get_blend_uint8_lut(background_color_key, color_space)
+    out = np.empty(tensor.shape[:-1] + (3,), dtype=np.uint8)
+    for channel in range(3):
+        # 16-bit (color, alpha) index into the channel's table
+        index = tensor[..., channel].astype(np.uint16)
+        index <<= 8
+        index |= tensor[..., 3]
+        np.take(lut[channel], index, out=out[..., channel])
+    return out
+
+
 def image_to_srgb(tensor, dtype, color_space: Optional[str] = None, allow_alpha: bool = False, background_color: Optional[np.ndarray] = None):
     """
     Convert an image to sRGB color space (if it is not in sRGB color space already). 
@@ -249,6 +325,10 @@ def image_to_srgb(tensor, dtype, color_space: Optional[str] = None, allow_alpha:
     if color_space is None:
         color_space = "srgb"
     if tensor.shape[-1] == 4 and not allow_alpha:
+        if tensor.dtype == np.uint8 and color_space in ("srgb", "linear"):
+            # Blending (and the sRGB conversion) of uint8 images is a table lookup
+            return convert_image_dtype(_blend_uint8(tensor, background_color, color_space), dtype)
+
         # NOTE: here we blend with black background
         if tensor.dtype == np.uint8:
             tensor = convert_image_dtype(tensor, np.float32)
@@ -259,8 +339,8 @@ def image_to_srgb(tensor, dtype, color_space: Optional[str] = None, allow_alpha:
             tensor += (1 - alpha) * convert_image_dtype(background_color, np.float32)
 
     if color_space == "linear":
-        tensor = convert_image_dtype(tensor, np.float32)
-        tensor = _linear_to_srgb(tensor)
+        # Linear->sRGB conversion is fused with the rounding to 8-bit
+        tensor = _linear_to_srgb_uint8(tensor)
 
     # Round to 8-bit for fair comparisons
     tensor = convert_image_dtype(tensor, np.uint8)
@@ -273,6 +353,64 @@ def _zipnerf_power_transformation(x, lam: float):
     return (((x / abs(lam - 1)) + 1) ** lam - 1) * m
 
 
+def _zipnerf_power_transformation_(x: np.ndarray, lam: float) -> np.ndarray:
+    # In-place version of _zipnerf_power_transformation
+    m = abs(lam - 1) / lam
+    x /= abs(lam - 1)
+    x += 1
+    x **= lam
+    x -= 1
+    x *= m
+    return x
+
+
+_colormap_cache: Dict[Tuple[str, bool], np.ndarray] = {}
+_colormap_cache_lock = threading.Lock()
+_colormap_device_cache: Dict[Any, Any] = {}
+
+
+def _build_colormap_lut(pallete: str) -> np.ndarray:
+    from ._colormaps import COLORMAPS
+
+    if pallete in COLORMAPS:
+        return np.frombuffer(bytes.fromhex(COLORMAPS[pallete]), dtype=np.uint8).reshape(256, 3)
+
+    import matplotlib
+    import matplotlib.colors
+    if hasattr(matplotlib, "colormaps"):
+        colormap = matplotlib.colormaps[pallete]  # type: ignore
+    else:
+        import matplotlib.cm
+        colormap = matplotlib.cm.get_cmap(pallete)  # type: ignore
+    if isinstance(colormap, matplotlib.colors.ListedColormap):
+        colormap_colors = colormap.colors
+    else:
+        colormap_colors = [list(colormap(i / 255))[:3] for i in range(256)]
+    return (np.array(colormap_colors, dtype=np.float32)[:, :3] * 255).astype(np.uint8)
+
+
+def _get_colormap_lut(pallete: str, invert: bool = False) -> np.ndarray:
+    key = (pallete, invert)
+    lut = _colormap_cache.get(key)
+    if lut is None:
+        lut = _build_colormap_lut(pallete)
+        if invert:
+            lut = lut[::-1]
+        lut = np.ascontiguousarray(lut)
+        lut.setflags(write=False)
+        with _colormap_cache_lock:
+            lut = _colormap_cache.setdefault(key, lut)
+    return lut
+
+
+def _apply_colormap_numpy_(array: np.ndarray, lut: np.ndarray) -> np.ndarray:
+    # NOTE: The array is used as a scratch buffer
+    np.multiply(array, 255, out=array)
+    index = array.astype(np.int32)
+    np.clip(index, 0, 255, out=index)
+    return lut.take(index, axis=0)
+
+
 def apply_colormap(array: TTensor, *, pallete: str = "viridis", invert: bool = False) -> TTensor:
     """
     Apply a colormap to an array.
@@ -286,41 +424,44 @@ def apply_colormap(array: TTensor, *, pallete: str = "viridis", invert: bool = F
         The array with the colormap applied.
     """
     xnp = _get_xnp(array)
-    # TODO: remove matplotlib dependency
-    import matplotlib
-    colormaps: Dict[str, Any]
-    ListedColormap = None
-    try:
-        import matplotlib.colormaps as _colormaps  # type: ignore
-        colormaps = cast(Dict[str, Any], _colormaps)  # type: ignore
-        ListedColormap = matplotlib.colors.ListedColormap  # type: ignore
-    except ImportError:
-        import matplotlib.cm as _colormaps  # type: ignore
-        colormaps = cast(Dict[str, Any], vars(_colormaps))  # type: ignore
+    lut = _get_colormap_lut(pallete, invert)
+    if xnp is np:
+        if cast(np.ndarray, array).dtype.kind != "f":
+            array = cast(TTensor, cast(np.ndarray, array).astype(np.float64))
+        return cast(TTensor, _apply_colormap_numpy_(cast(np.ndarray, array).copy(), lut))
 
     # Map to a color scale
     array_long = cast(TTensor, _xnp_astype(array * 255, xnp.int32, xnp=xnp).clip(0, 255))
-    colormap = colormaps[pallete]
-    colormap_colors = None
-    if ListedColormap is not None and isinstance(colormap, ListedColormap):  # type: ignore
-        colormap_colors = colormap.colors
-    else:
-        colormap_colors = [list(colormap(i / 255))[:3] for i in range(256)]
     if xnp.__name__ == "torch":
         import torch
-        pallete_array = cast(TTensor, torch.tensor(colormap_colors, dtype=torch.float32, device=cast(torch.Tensor, array).device))
+        device = cast(torch.Tensor, array).device
+        pallete_array = _colormap_device_cache.get((pallete, invert, device))
+        if pallete_array is None:
+            pallete_array = torch.from_numpy(lut.copy()).to(device)
+            _colormap_device_cache[(pallete, invert, device)] = pallete_array
     else:
-        pallete_array = cast(TTensor, xnp.array(colormap_colors, dtype=xnp.float32))  # type: ignore
-    if invert:
-        array_long = 255 - array_long
-    out = cast(TTensor, pallete_array[array_long])  # type: ignore
-    return _xnp_astype(out * 255, xnp.uint8, xnp=xnp)
+        pallete_array = xnp.array(lut)  # type: ignore
+    return cast(TTensor, pallete_array[array_long])  # type: ignore
 
 
 def visualize_depth(depth: np.ndarray, expected_scale: Optional[float] = None, near_far: Optional[np.ndarray] = None, pallete: str = "viridis") -> np.ndarray:
     # We will squash the depth to range [0, 1] using Barron's power transformation
     xnp = _get_xnp(depth)
     eps = xnp.finfo(xnp.float32).eps  # type: ignore
+    if xnp is np and depth.dtype.kind == "f":
+        # Fused path: all operations are done in-place in a single scratch buffer
+        if near_far is not None:
+            depth_squashed = np.subtract(depth, near_far[0])
+            depth_squashed /= (near_far[1] - near_far[0])
+        elif expected_scale is not None:
+            depth_squashed = np.divide(depth, max(0.3 * expected_scale, eps))
+            _zipnerf_power_transformation_(depth_squashed, -1.5)
+            depth_squashed /= (5 / 3)
+        else:
+            depth_squashed = depth.copy()
+        np.clip(depth_squashed, 0, 1, out=depth_squashed)
+        return _apply_colormap_numpy_(depth_squashed, _get_colormap_lut(pallete))
+
     if near_far is not None:
         depth_squashed = (depth - near_far[0]) / (near_far[1] - near_far[0])
     elif expected_scale is not None:
@@ -1030,34 +1171,77 @@ SOFTWARE.
     return function_values.reshape(R.shape[:-2] + (Dsize,))
 
 
-def _winger_D_multiply_spherical_harmonics(D, y):
-    """
-    Multiply a Wigner D matrix by a spherical harmonic coefficients.
+_SH_ROTATION_CACHE_SIZE = 32
+_sh_rotation_cache: "OrderedDict[Tuple[bytes, int], np.ndarray]" = OrderedDict()
+_sh_rotation_cache_lock = threading.Lock()
+
+
+def get_spherical_harmonics_rotation_matrix(R, degree: int) -> np.ndarray:
     """
-    output = np.zeros_like(y)
-    offset, ls, i = 0, 0, 0
-    for i in range(int(math.sqrt(y.shape[-1]))):
-        ls = 2*i+1
-        offset = ((2*i-1)*i*(4*i+2))//6
-        d_part = D[..., offset:offset+ls**2].reshape(D.shape[:-1] + (ls, ls)).T
-        offset_sh = i**2
-        y_part = y[..., offset_sh:offset_sh+ls]
-        output[..., offset_sh:offset_sh+ls] = np.matmul(d_part, y_part[..., None])[..., 0].real
-    if (offset+ls**2) != D.shape[-1]:
-        raise ValueError(f"The D matrix shape {D.shape[-1]} does not match the expected shape {offset} for the spherical harmonics with rank {i-1}")
-    return output
+    Get the block-diagonal matrix (built from the Wigner D matrices) which rotates
+    spherical harmonics coefficients up to the given degree by a rotation matrix R.
+    The matrices are cached for recently used rotations.
 
+    Args:
+        R: A 3x3 rotation matrix.
+        degree: The maximum degree of the spherical harmonics.
 
-def rotate_spherical_harmonics(R, y):
+    Returns:
+        A read-only matrix of shape ((degree+1)**2, (degree+1)**2).
+    """
+    R = np.ascontiguousarray(R, dtype=np.float64)
+    if R.shape != (3, 3):
+        raise ValueError(f"Expected a 3x3 rotation matrix, got shape {R.shape}")
+    key = (R.tobytes(), degree)
+    with _sh_rotation_cache_lock:
+        matrix = _sh_rotation_cache.get(key)
+        if matrix is not None:
+            _sh_rotation_cache.move_to_end(key)
+            return matrix
+
+    D = _wigner_D_matrix(R, degree)
+    size = (degree + 1) ** 2
+    matrix = np.zeros((size, size), dtype=np.float64)
+    for ell in range(degree + 1):
+        ls = 2 * ell + 1
+        offset = ((2 * ell - 1) * ell * (4 * ell + 2)) // 6
+        matrix[ell**2:ell**2 + ls, ell**2:ell**2 + ls] = D[offset:offset + ls**2].reshape(ls, ls).T.real
+    matrix.flags.writeable = False
+    with _sh_rotation_cache_lock:
+        _sh_rotation_cache[key] = matrix
+        while len(_sh_rotation_cache) > _SH_ROTATION_CACHE_SIZE:
+            _sh_rotation_cache.popitem(last=False)
+    return matrix
+
+
+def rotate_spherical_harmonics(R, y, *, chunk_size: int = 1 << 18):
     """
     Rotate spherical harmonics coefficients by a rotation matrix R.
 
     Args:
-        R: A 3x3 rotation matrix.
-        y: The spherical harmonics coefficients.
+        R: A 3x3 rotation matrix, or a batch of rotation matrices broadcastable to the leading dimensions of y.
+        y: The spherical harmonics coefficients (..., (degree+1)**2).
+        chunk_size: Number of coefficient vectors transformed at once (limits the temporary memory).
 
     Returns:
         The rotated spherical harmonics coefficients.
     """
-    D = _wigner_D_matrix(R, int(math.sqrt(y.shape[-1]))-1)
-    return _winger_D_multiply_spherical_harmonics(D, y)
+    y = np.asarray(y)
+    R = np.asarray(R)
+    degree = int(math.sqrt(y.shape[-1])) - 1
+    size = y.shape[-1]
+    if (degree + 1) ** 2 != size:
+        raise ValueError(f"The number of spherical harmonics coefficients {size} is not a square number")
+    dtype = y.dtype if np.issubdtype(y.dtype, np.floating) else np.float64
+    if R.ndim > 2:
+        matrices = np.stack([get_spherical_harmonics_rotation_matrix(r, degree) for r in R.reshape(-1, 3, 3)])
+        matrices = matrices.reshape(R.shape[:-2] + (size, size)).astype(dtype, copy=False)
+        return np.einsum("...ij,...j->...i", matrices, y).astype(dtype, copy=False)
+
+    matrix_t = get_spherical_harmonics_rotation_matrix(R, degree).T.astype(dtype)
+    y_flat = y.reshape(-1, size)
+    output = np.empty(y.shape, dtype=dtype)
+    output_flat = output.reshape(-1, size)
+    for i in range(0, len(y_flat), chunk_size):
+        np.matmul(y_flat[i:i + chunk_size], matrix_t, out=output_flat[i:i + chunk_size])
+    return output
@@ -10,7 +10,7 @@ from dataclasses import dataclass
 import dataclasses
 import contextlib
 from pathlib import Path
-from collections import deque
+from collections import OrderedDict
 from time import perf_counter
 from typing import Optional, Tuple, Any, Dict, cast, List, Callable, Union, FrozenSet
 
@@ -27,24 +27,22 @@ from pathlib import Path
 from typing import Dict, List, Literal, Optional, Tuple
 
 import numpy as np
-import splines
-import splines.quaternion
 import viser
 import viser.transforms as tf
-from scipy import interpolate
 try:
     from typing import get_args, Literal, TypeVar
 except ImportError:
     from typing_extensions import get_args, Literal, TypeVar
 
 from nerfbaselines import (
-    Method, Dataset, DatasetFeature, CameraModel,
+    Method, Dataset, DatasetFeature, CameraModel, Cameras, RenderOutput,
     new_cameras,
     TrajectoryFrameAppearance, TrajectoryFrame, TrajectoryKeyframe, Trajectory,
     KochanekBartelsInterpolationSource, RenderOptions,
 )
 from nerfbaselines.datasets import dataset_load_features, load_dataset
-from nerfbaselines.datasets._colmap_utils import qvec2rotmat, rotmat2qvec
+from nerfbaselines.datasets._colmap_utils import qvec2rotmat
+from nerfbaselines._splines import KochanekBartelsCameraPath, rotation_matrix_to_quaternion, quaternion_to_rotation_matrix
 from nerfbaselines.utils import apply_transform, get_transform_and_scale, invert_transform
 from nerfbaselines.utils import CancelledException, CancellationToken
 from nerfbaselines.utils import apply_transform, get_transform_and_scale, invert_transform, pad_poses
@@ -131,8 +129,7 @@ def get_c2w(position, wxyz):
 
 def get_position_quaternion(c2s):
     position = c2s[..., :3, 3]
-    wxyz = np.stack([rotmat2qvec(x) for x in c2s[..., :3, :3].reshape(-1, 3, 3)], 0)
-    wxyz = wxyz.reshape(c2s.shape[:-2] + (4,))
+    wxyz = rotation_matrix_to_quaternion(c2s[..., :3, :3])
     return position, wxyz
 
 
@@ -301,6 +298,9 @@ class ViewerState:
     show_test_cameras: bool = False
     show_input_points: bool = True
     fps: str = ""
+    render_stats: str = ""
+    motion_target_fps: float = 12.0
+    still_max_latency: float = 0.0
 
     preview_render: bool = False
     preview_time: float = 0.0
@@ -431,20 +431,18 @@ class ViewerState:
         frames: List[TrajectoryFrame] = []
         trajectory_frames = _compute_camera_path_splines(self)
         if trajectory_frames is not None:
-            frames = []
-            for pos, wxyz, fov, weights in zip(*trajectory_frames):
-                pose = tf.SE3.from_rotation_and_translation(
-                    tf.SO3(wxyz),
-                    pos,
-                ).as_matrix()
-                pose = apply_transform(inv_transform, pose)
-                focal_length = three_js_perspective_camera_focal_length(fov, h)
-                intrinsics = np.array([focal_length, focal_length, w / 2, h / 2], dtype=np.float32)
-                frames.append(TrajectoryFrame({
-                    "pose": pose[:3, :].astype(np.float32),
-                    "intrinsics": intrinsics,
-                    "appearance_weights": weights.astype(np.float32),
-                }))
+            positions, wxyz, fovs, weights = trajectory_frames
+            poses = np.zeros((len(positions), 4, 4), dtype=np.float64)
+            poses[:, :3, :3] = quaternion_to_rotation_matrix(np.asarray(wxyz, dtype=np.float64))
+            poses[:, :3, 3] = positions
+            poses[:, 3, 3] = 1
+            poses = apply_transform(inv_transform, poses)
+            focal_lengths = three_js_perspective_camera_focal_length(np.asarray(fovs), h)
+            frames = [TrajectoryFrame({
+                "pose": pose[:3, :].astype(np.float32),
+                "intrinsics": np.array([focal_length, focal_length, w / 2, h / 2], dtype=np.float32),
+                "appearance_weights": weight.astype(np.float32),
+            }) for pose, focal_length, weight in zip(poses, focal_lengths, weights)]
         source: Dict = {
             "type": "interpolation",
             "interpolation": self.camera_path_interpolation,
@@ -830,7 +828,7 @@ def _interpolate_ellipse(camera_path_keyframes, num_frames: int, render_fov: flo
     dirx = np.cross(dirz, -oriented_normal_vector)
     diry = np.cross(dirz, dirx)
     R = np.stack([dirx, diry, dirz], axis=-1)
-    orientation_array = np.stack([rotmat2qvec(r) for r in R], axis=0)
+    orientation_array = rotation_matrix_to_quaternion(R)
 
     # TODO: implement rest
     fovs = np.full(num_frames, render_fov, dtype=np.float32)
@@ -838,6 +836,9 @@ def _interpolate_ellipse(camera_path_keyframes, num_frames: int, render_fov: flo
     return points_array, orientation_array, fovs, weights
 
 
+_camera_path_interpolator = KochanekBartelsCameraPath()
+
+
 @autobind
 @simple_cache
 def _compute_camera_path_splines(camera_path_keyframes, 
@@ -865,75 +866,19 @@ def _compute_camera_path_splines(camera_path_keyframes,
         return _interpolate_ellipse(camera_path_keyframes, num_frames, render_fov)
 
 
-    # Compute transition times cumsum
     times = np.array([
         k.transition_duration if k.transition_duration is not None else camera_path_default_transition_duration 
         for k in camera_path_keyframes], dtype=np.float32)
-    transition_times_cumsum = np.cumsum(np.roll(times, -1)) if camera_path_loop else np.cumsum(times[:-1])
-    transition_times_cumsum = np.insert(transition_times_cumsum, 0, 0.0)
-    del times
-
-    num_frames = int(transition_times_cumsum[-1] * camera_path_framerate)
-    if num_frames <= 0 or len(camera_path_keyframes) < 2:
-        return None
-
-    orientation_spline = splines.quaternion.KochanekBartels(
-        [
-            splines.quaternion.UnitQuaternion.from_unit_xyzw(np.roll(k.wxyz, shift=-1))
-            for k in camera_path_keyframes
-        ],
-        tcb=(camera_path_tension, 0.0, 0.0),
-        endconditions="closed" if camera_path_loop else "natural",
-    )
-    position_spline = splines.KochanekBartels(
-        [k.position for k in camera_path_keyframes],
-        tcb=(camera_path_tension, 0.0, 0.0),
-        endconditions="closed" if camera_path_loop else "natural",
-    )
-    fov_spline = splines.KochanekBartels(
-        [
-            k.fov if k.fov is not None else render_fov
-            for k in camera_path_keyframes
-        ],
-        tcb=(camera_path_tension, 0.0, 0.0),
-        endconditions="closed" if camera_path_loop else "natural",
-    )
-    weight_spline = splines.KochanekBartels(
-        [
-            _onehot(i, len(camera_path_keyframes)) for i in range(len(camera_path_keyframes))
-        ],
-        tcb=(camera_path_tension, 0.0, 0.0),
-        endconditions="closed" if camera_path_loop else "natural",
-    )
-
-    # Get time splines
-    spline_indices = np.arange(transition_times_cumsum.shape[0])
-    gtime = np.linspace(0, transition_times_cumsum[-1], num_frames)
-    if camera_path_loop:
-        # In the case of a loop, we pad the spline to match the start/end
-        # slopes.
-        interpolator = interpolate.PchipInterpolator(
-            x=np.concatenate(
-                [
-                    [-(transition_times_cumsum[-1] - transition_times_cumsum[-2])],
-                    transition_times_cumsum,
-                    transition_times_cumsum[-1:] + transition_times_cumsum[1:2],
-                ],
-                axis=0,
-            ),
-            y=np.concatenate([[-1], spline_indices, [spline_indices[-1] + 1]], axis=0),
-        )
-    else:
-        interpolator = interpolate.PchipInterpolator(x=transition_times_cumsum, y=spline_indices)
-    gtime_splines = np.clip(interpolator(gtime), 0, spline_indices[-1])
-
-    # Update visualized spline.
-    points_array = position_spline.evaluate(gtime_splines)
-    orientation_array = orientation_spline.evaluate(gtime_splines)
-    orientation_array = np.stack([np.array([quat.scalar, *quat.vector]) for quat in orientation_array])
-    fovs = fov_spline.evaluate(gtime_splines)
-    weights = weight_spline.evaluate(gtime_splines)
-    return points_array, orientation_array, fovs, weights
+    # The interpolator keeps the previous result and only re-evaluates
+    # the frames affected by the changed keyframes.
+    return _camera_path_interpolator(
+        np.array([k.position for k in camera_path_keyframes], dtype=np.float64),
+        np.array([k.wxyz for k in camera_path_keyframes], dtype=np.float64),
+        np.array([k.fov if k.fov is not None else render_fov for k in camera_path_keyframes], dtype=np.float64),
+        times,
+        tension=camera_path_tension,
+        is_cycle=camera_path_loop,
+        framerate=camera_path_framerate)
 
 
 def _add_spline_to_camera_path(server: ViserServer, state: ViewerState, interpolated_camera_path):
@@ -1110,15 +1055,129 @@ class BindableViserServer(ViserServer):
         return _add_gui
 
 
+class AdaptiveResolutionController:
+    """Chooses the viewport render resolution from the measured render cost.
+
+    The cost model is a moving average of the method's throughput in rays per second.
+    Frames rendered while the camera is moving are scaled to fit ``motion_latency``,
+    still frames are scaled to fit ``still_latency`` (``None`` means full resolution).
+    To avoid flickering, the resolution is only changed when the desired scale
+    differs from the current one by more than ``hysteresis`` (relative).
+    """
+    def __init__(self,
+                 motion_latency: float = 1 / 12,
+                 still_latency: Optional[float] = None,
+                 hysteresis: float = 0.15,
+                 smoothing: float = 0.3,
+                 min_height: int = 30):
+        self.motion_latency = motion_latency
+        self.still_latency = still_latency
+        self.hysteresis = hysteresis
+        self.smoothing = smoothing
+        self.min_height = min_height
+        self.rays_per_second: Optional[float] = None
+        self._scales: Dict[bool, float] = {}
+        self._last_decision: Dict[str, Any] = {}
+
+    def update(self, num_rays: int, elapsed: float):
+        """Updates the cost model with a measured render."""
+        if elapsed <= 0 or num_rays <= 0:
+            return
+        rays_per_second = num_rays / elapsed
+        if self.rays_per_second is None:
+            self.rays_per_second = rays_per_second
+        else:
+            self.rays_per_second += self.smoothing * (rays_per_second - self.rays_per_second)
+
+    def get_full_resolution_fps(self, num_rays_total: int) -> Optional[float]:
+        if self.rays_per_second is None:
+            return None
+        return self.rays_per_second / num_rays_total
+
+    def get_resolution(self, w_total: int, h_total: int, *, moving: bool) -> Tuple[int, int]:
+        """Returns the resolution (w, h) to render at, given the full resolution."""
+        num_rays_total = w_total * h_total
+        latency = self.motion_latency if moving else self.still_latency
+        # Before the first measurement, we assume a full frame takes one second
+        rays_per_second = self.rays_per_second if self.rays_per_second is not None else float(num_rays_total)
+        scale = 1.0
+        if latency is not None:
+            scale = min(1.0, (rays_per_second * latency / num_rays_total) ** 0.5)
+
+        # Hysteresis
+        last_scale = self._scales.get(moving)
+        if last_scale is not None and abs(scale - last_scale) <= self.hysteresis * last_scale and (scale < 1.0 or last_scale >= 1.0):
+            scale = last_scale
+        self._scales[moving] = scale
+
+        w, h = w_total, h_total
+        if scale < 1.0:
+            aspect = w_total / h_total
+            h = int(round(h_total * scale, -1))
+            h = max(min(h_total, h), self.min_height)
+            w = int(h * aspect)
+            if w > w_total:
+                w = w_total
+                h = int(w / aspect)
+        self._last_decision = {
+            "moving": moving,
+            "scale": scale,
+            "resolution": (w, h),
+            "estimated_latency": w * h / rays_per_second,
+        }
+        return w, h
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return dict(rays_per_second=self.rays_per_second, **self._last_decision)
+
+    def format_metrics(self) -> str:
+        if self.rays_per_second is None or not self._last_decision:
+            return ""
+        w, h = self._last_decision["resolution"]
+        return (f"{self.rays_per_second / 1e6:.3g} Mrays/s, "
+                f"{'motion' if self._last_decision['moving'] else 'still'}: {w}x{h} "
+                f"({self._last_decision['estimated_latency'] * 1000:.0f} ms)")
+
+
+def _get_render_cache_key(camera, embedding, pose_quantization: float):
+    """Computes a hashable key for the raw render outputs of a camera.
+
+    Poses are quantized to ``pose_quantization`` so that sub-pixel jitter
+    of the client camera still hits the cache.
+    """
+    camera = camera.item()
+    poses = np.round(np.asarray(camera.poses, dtype=np.float64) / pose_quantization).astype(np.int64)
+    embedding_key = None
+    if embedding is not None:
+        embedding = np.ascontiguousarray(embedding)
+        embedding_key = (embedding.shape, embedding.dtype.str, embedding.tobytes())
+    return (
+        poses.tobytes(),
+        np.round(np.asarray(camera.intrinsics, dtype=np.float64), 3).tobytes(),
+        int(camera.camera_models),
+        np.asarray(camera.distortion_parameters, dtype=np.float64).tobytes(),
+        tuple(int(x) for x in camera.image_sizes),
+        embedding_key,
+    )
+
+
 class ViewerRenderer:
     def __init__(self,
                  method: Optional[Method],
-                 expected_depth_scale=0.5):
+                 expected_depth_scale=0.5,
+                 cache_size: int = 16,
+                 pose_quantization: float = 1e-4,
+                 progressive_refinement: bool = True):
         self.method = method
         self._expected_depth_scale = expected_depth_scale
         self._cancellation_token = None
         self._output_type_options = ()
         self._task_queue = []
+        self._cache_size = cache_size
+        self._pose_quantization = pose_quantization
+        self._render_cache: "OrderedDict[Any, RenderOutput]" = OrderedDict()
+        self.progressive_refinement = progressive_refinement
+        self._refinement_queue: "OrderedDict[Any, Tuple[Cameras, Optional[np.ndarray]]]" = OrderedDict()
         if self.method is not None:
             method_info = self.method.get_info()
             self._output_types = {
@@ -1175,6 +1234,78 @@ class ViewerRenderer:
     def output_type_options(self):
         return self._output_type_options
 
+    def cancel(self):
+        """Cancels the currently running cancellable render (if any)."""
+        token = self._cancellation_token
+        if token is not None:
+            token.cancel()
+
+    def clear_cache(self):
+        self._render_cache.clear()
+        self._refinement_queue.clear()
+
+    def is_cached(self, camera, embedding=None) -> bool:
+        return _get_render_cache_key(camera, embedding, self._pose_quantization) in self._render_cache
+
+    def add_refinement_task(self, camera, embedding=None):
+        """Schedules a full-resolution render of ``camera`` to be done when the viewer is idle.
+
+        The result is only stored in the render cache, so that returning to the
+        pose later shows the full-resolution frame immediately.
+        """
+        if not self.progressive_refinement or self.method is None:
+            return
+        key = _get_render_cache_key(camera, embedding, self._pose_quantization)
+        if key in self._render_cache:
+            return
+        self._refinement_queue[key] = (camera, embedding)
+        self._refinement_queue.move_to_end(key)
+        while len(self._refinement_queue) > self._cache_size:
+            self._refinement_queue.popitem(last=False)
+
+    def refine(self) -> bool:
+        """Renders the most recently scheduled refinement task (if any).
+
+        Returns:
+            True if a frame was refined, False if there was nothing to do or the render was cancelled.
+        """
+        while self._refinement_queue:
+            key, (camera, embedding) = self._refinement_queue.popitem(last=True)
+            if key in self._render_cache:
+                continue
+            return self._render_raw(camera, embedding, allow_cancel=True) is not None
+        return False
+
+    def _render_raw(self, camera, embedding, allow_cancel) -> Optional[RenderOutput]:
+        assert self.method is not None, "No method to render"
+        key = _get_render_cache_key(camera, embedding, self._pose_quantization)
+        outputs = self._render_cache.get(key)
+        if outputs is not None:
+            self._render_cache.move_to_end(key)
+            return outputs
+
+        try:
+            if allow_cancel:
+                scope = self._cancellation_token = CancellationToken()
+            else:
+                scope = contextlib.nullcontext()
+            with scope:
+                options: RenderOptions = { "output_type_dtypes": { "color": "uint8" }, 
+                                           "embedding": embedding }
+                outputs = self.method.render(camera, options=options)
+        except CancelledException:
+            return None
+        finally:
+            self._cancellation_token = None
+        assert outputs is not None, "Method did not return any outputs"
+
+        self._refinement_queue.pop(key, None)
+        if self._cache_size > 0:
+            self._render_cache[key] = outputs
+            while len(self._render_cache) > self._cache_size:
+                self._render_cache.popitem(last=False)
+        return outputs
+
     def render(self, 
                camera, *, 
                embedding=None, 
@@ -1188,21 +1319,12 @@ class ViewerRenderer:
             # No need to render anything
             return None
 
-        try:
-            if allow_cancel:
-                scope = self._cancellation_token = CancellationToken()
-            else:
-                scope = contextlib.nullcontext()
-            with scope:
-                options: RenderOptions = { "output_type_dtypes": { "color": "uint8" }, 
-                                           "embedding": embedding }
-                outputs = self.method.render(camera, options=options)
-            self._cancellation_token = None
-            
-        except CancelledException:
+        # Raw outputs are cached, so that switching output types,
+        # split views or background color does not re-render the scene.
+        outputs = self._render_raw(camera, embedding, allow_cancel)
+        if outputs is None:
             # if we got interrupted, don't send the output to the viewer
             return None
-        assert outputs is not None, "Method did not return any outputs"
 
         def render_single(name):
             assert outputs is not None, "Method did not return any outputs"
@@ -1231,6 +1353,8 @@ class ViewerRenderer:
             assert render.shape == split_render.shape, f"Output shapes do not match: {render.shape} vs {split_render.shape}"
             split_percentage_ = split_percentage if split_percentage is not None else 0.5
             split_point = int(render.shape[1] * split_percentage_)
+            # The render can be a view of the cached outputs
+            render = np.array(render, copy=True)
             render[:, split_point:] = split_render[:, split_point:]
 
         if output_aspect_ratio is not None:
@@ -1290,9 +1414,12 @@ class ViserViewer:
             else:
                 logging.info("Does not support appearance from train embeddings")
         self._render_state = {}
+        self._pending_refinements = {}
         self._last_poses = {}
         self._update_state_callbacks = []
-        self._render_times = deque(maxlen=3)
+        self._resolution_controller = AdaptiveResolutionController(
+            motion_latency=1.0 / self.state.motion_target_fps,
+            still_latency=self.state.still_max_latency or None)
         self._preview_camera: Any = None
         self.server = BindableViserServer(viser.ViserServer(port=self.port))
         self.server.world_axes.visible = True
@@ -1599,6 +1726,22 @@ class ViserViewer:
                 hint="The output to render",
             )
             server.add_gui_rgb("Background color", state.b.background_color, hint="Color of the background")
+            server.add_gui_slider(
+                "Motion FPS",
+                min=1.0,
+                max=60.0,
+                step=1.0,
+                initial_value=state.b.motion_target_fps,
+                hint="Target FPS while the camera is moving. The preview resolution is scaled to reach it.",
+            )
+            server.add_gui_slider(
+                "Still latency",
+                min=0.0,
+                max=10.0,
+                step=0.1,
+                initial_value=state.b.still_max_latency,
+                hint="Maximum time (in seconds) to render a still frame. Zero means always render at full resolution.",
+            )
 
         # split options
         with server.add_gui_folder("Split Screen"):#, visible=state.b.output_type_options.map(lambda x: len(x) > 1)):
@@ -1634,6 +1777,8 @@ class ViserViewer:
             brand_color=(255, 211, 105),
         )
         self.server.add_gui_text("FPS", initial_value=self.state.b.fps, disabled=True)
+        self.server.add_gui_text("Render stats", initial_value=self.state.b.render_stats, disabled=True,
+                                 hint="Measured render throughput and the resolution chosen by the adaptive resolution controller")
 
         tabs = self.server.add_gui_tab_group()
         with tabs.add_tab("Control", viser.Icon.SETTINGS):
@@ -1700,6 +1845,14 @@ class ViserViewer:
         self.state.b.resolution.on_update(lambda _: self._reset_render())
         self.state.b.output_split.on_update(lambda _: self._reset_render())
         self.state.b.split_output_type.on_update(lambda _: self._reset_render())
+        self.state.b.split_percentage.on_update(lambda _: self._reset_render())
+
+        def _update_resolution_controller(args):
+            motion_target_fps, still_max_latency = args
+            self._resolution_controller.motion_latency = 1.0 / max(motion_target_fps, 1e-3)
+            self._resolution_controller.still_latency = still_max_latency or None
+            self._reset_render()
+        self.state.b.map(("motion_target_fps", "still_max_latency")).on_update(_update_resolution_controller)
         self.state.b.background_color.on_update(lambda _: self._reset_render())
 
         pc = None
@@ -1946,6 +2099,7 @@ class ViserViewer:
         token, self._cancellation_token = self._cancellation_token, None
         if token is not None:
             token.cancel()
+        self.renderer.cancel()
 
     def run(self):
         while True:
@@ -1990,9 +2144,11 @@ class ViserViewer:
     def _update(self):
         self.renderer.update()
 
+        is_idle = True
         for client in self.server.get_clients().values():
             render_state = self._render_state.get(client.client_id, 0)
             if render_state < 2:
+                is_idle = False
                 start = perf_counter()
 
                 if self._preview_camera is not None:
@@ -2033,31 +2189,35 @@ class ViserViewer:
                 c2w = get_c2w(cam_pos, cam_wxyz)
                 c2w = apply_transform(self._inv_transform, c2w)
 
+                def _make_camera(w, h):
+                    return new_cameras(
+                        poses=c2w[None, :3, :4],
+                        intrinsics=np.array([[focal * w/w_total, focal* h/h_total, w / 2, h / 2]], dtype=np.float32),
+                        camera_models=np.array([0], dtype=np.int32),
+                        distortion_parameters=np.zeros((1, 8), dtype=np.float32),
+                        image_sizes=np.array([[w, h]], dtype=np.int32),
+                        nears_fars=None,
+                    )
+
+                # If the full resolution frame is cached, we skip the low resolution preview
+                full_camera = _make_camera(w_total, h_total)
+                full_cached = self.renderer.is_cached(full_camera, cam_embedding)
+                if render_state == 0 and full_cached:
+                    render_state = 1
+
                 # In state 0, we render a low resolution image to display it fast
+                controller = self._resolution_controller
                 if render_state == 0:
-                    target_fps = 12
-                    fps = 1 if not self._render_times else 1.0 / np.mean(self._render_times)
-                    if fps >= target_fps:
+                    w, h = controller.get_resolution(w_total, h_total, moving=True)
+                    if (w, h) == (w_total, h_total):
                         render_state = 1
-                    else:
-                        h = (fps * num_rays_total / target_fps / cam_aspect) ** 0.5
-                        h = int(round(h, -1))
-                        h = max(min(h_total, h), 30)
-                        w = int(h * cam_aspect)
-                        if w > w_total:
-                            w = w_total
-                            h = int(w / cam_aspect)
-                        num_rays = w * h
+                if render_state == 1:
+                    w, h = (w_total, h_total) if full_cached else controller.get_resolution(w_total, h_total, moving=False)
+                num_rays = w * h
                 self._render_state[client.client_id] = render_state + 1
 
-                nb_camera = new_cameras(
-                    poses=c2w[None, :3, :4],
-                    intrinsics=np.array([[focal * w/w_total, focal* h/h_total, w / 2, h / 2]], dtype=np.float32),
-                    camera_models=np.array([0], dtype=np.int32),
-                    distortion_parameters=np.zeros((1, 8), dtype=np.float32),
-                    image_sizes=np.array([[w, h]], dtype=np.int32),
-                    nears_fars=None,
-                )
+                nb_camera = full_camera if (w, h) == (w_total, h_total) else _make_camera(w, h)
+                is_cached = self.renderer.is_cached(nb_camera, cam_embedding)
                     
                 output_aspect = None
                 if self._preview_camera is not None:
@@ -2083,12 +2243,31 @@ class ViserViewer:
                 client.set_background_image(render, format="jpeg")
                 self._render_state[client.client_id] = min(self._render_state.get(client.client_id, 0), render_state + 1)
 
-                if render_state == 1 or len(self._render_times) < assert_not_none(self._render_times.maxlen):
-                    self._render_times.append(interval / num_rays * num_rays_total)
+                if (w, h) != (w_total, h_total):
+                    # The full resolution render can be interrupted before it finishes,
+                    # we upgrade the frame in the background when the viewer is idle.
+                    self.renderer.add_refinement_task(full_camera, cam_embedding)
+                    self._pending_refinements[client.client_id] = (full_camera, cam_embedding)
+                else:
+                    self._pending_refinements.pop(client.client_id, None)
+
+                # Cached frames do not tell us anything about the render speed
+                if not is_cached:
+                    controller.update(num_rays, interval)
+
+                # Update FPS and render stats
+                fps = controller.get_full_resolution_fps(num_rays_total)
+                if fps is not None:
+                    self.state.fps = f"{fps:.3g}"
+                self.state.render_stats = controller.format_metrics()
                 del render
 
-        # Update FPS and output options
-        self.state.fps = f"{1.0 / np.mean(self._render_times):.3g}"
+        if is_idle and self.renderer.refine():
+            # Send the refined frames to the clients which are still showing the lower resolution
+            for client_id, (full_camera, cam_embedding) in list(self._pending_refinements.items()):
+                if self.renderer.is_cached(full_camera, cam_embedding):
+                    del self._pending_refinements[client_id]
+                    self._render_state.pop(client_id, None)
 
 
 def run_viser_viewer(method: Optional[Method] = None, 
@@ -5,7 +5,7 @@ from typing import Optional, Tuple
 from contextlib import contextmanager
 import logging
 import subprocess
-import copy
+import hashlib
 import tempfile
 from functools import partial
 import math
@@ -153,7 +153,9 @@ def _get_method_data(data, method: str):
 
 
 def get_dataset_data(raw_data):
-    data = copy.deepcopy(raw_data)
+    # The raw data is not modified, we only copy the parts which are changed
+    data = dict(raw_data)
+    data["methods"] = list(raw_data["methods"])
     default_metric = data.get("default_metric") or data["metrics"][0]["id"]
     sign = next((1 if m.get("ascending") else -1 for m in data["metrics"] if m["id"] == default_metric), None)
     if sign is None:
@@ -253,33 +255,131 @@ def get_all_routes(input_path, data):
         yield (route, fname, {})
 
 
-def _generate_pages(data, input_path, output, configuration):
+_BUILD_MANIFEST = ".nb-build-manifest.json"
+_PARALLEL_RENDER_MIN_ROUTES = 16
+_render_env = None
+
+
+def _get_templates_hash(input_path):
+    # Pages include layout, macros and partials, any change to them invalidates all pages
+    sha = hashlib.sha256()
+    templates_path = os.path.join(input_path, "templates")
+    for root, dirs, files in os.walk(templates_path):
+        dirs.sort()
+        for fname in sorted(files):
+            if root == templates_path and not fname.startswith("_"):
+                continue
+            with open(os.path.join(root, fname), "rb") as f:
+                sha.update(os.path.relpath(os.path.join(root, fname), templates_path).encode("utf8"))
+                sha.update(f.read())
+    return sha.hexdigest()
+
+
+def _get_route_hash(input_path, template, data, base_path, templates_hash):
+    sha = hashlib.sha256()
+    sha.update(templates_hash.encode("utf8"))
+    with open(os.path.join(input_path, "templates", template), "rb") as f:
+        sha.update(f.read())
+    sha.update(base_path.encode("utf8"))
+    sha.update(json.dumps(data, sort_keys=True, default=repr).encode("utf8"))
+    return sha.hexdigest()
+
+
+def _init_render_env(input_path):
+    global _render_env
     from jinja2 import Environment, FileSystemLoader, select_autoescape
 
+    _render_env = Environment(
+        loader=FileSystemLoader(os.path.join(input_path, "templates")),
+        autoescape=select_autoescape()
+    )
+
+
+def _render_page(output_path, template, data, base_path):
+    assert _render_env is not None, "Render environment not initialized"
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w", encoding="utf8") as f:
+        f.write(_render_env.get_template(template).render(**data, base_path=base_path))
+
+
+def _load_build_manifest(output):
+    try:
+        with open(os.path.join(output, _BUILD_MANIFEST), "r", encoding="utf8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logging.warning(f"Failed to read the build manifest, rebuilding all pages: {e}")
+        return {}
+
+
+def _save_build_manifest(output, manifest):
+    with open(os.path.join(output, _BUILD_MANIFEST), "w", encoding="utf8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def _generate_pages(data, input_path, output, configuration, manifest=None):
+    """
+    Renders all pages. If a manifest (route -> hash of the template and data) is passed,
+    only pages with changed inputs are rendered and the manifest is updated in place.
+    """
     base_path = configuration.get("base_path", "")
     base_path = base_path.strip("/")
     if base_path:
         base_path = f"/{base_path}"
-    env = Environment(
-        loader=FileSystemLoader(os.path.join(input_path, "templates")),
-        autoescape=select_autoescape()
-    )
     data["has_docs"] = configuration.get("include_docs") is not None
+    templates_hash = _get_templates_hash(input_path)
+    old_pages = (manifest or {}).get("pages", {})
+    pages = {}
+    tasks = []
     for route, template, data in get_all_routes(input_path, data):
         if route.endswith("/"):
             route += "index"
-        os.makedirs(os.path.dirname(output + route), exist_ok=True)
-        with open(f"{output}{route}.html", "w", encoding="utf8") as f:
-            template = env.get_template(template)
-            f.write(template.render(**data, base_path=base_path))
+        output_path = f"{output}{route}.html"
+        route_hash = _get_route_hash(input_path, template, data, base_path, templates_hash)
+        pages[route] = route_hash
+        if old_pages.get(route) == route_hash and os.path.exists(output_path):
+            continue
+        tasks.append((output_path, template, data, base_path))
+
+    # Remove pages which no longer exist
+    for route in set(old_pages).difference(pages):
+        if os.path.exists(f"{output}{route}.html"):
+            os.remove(f"{output}{route}.html")
+
+    logging.info(f"Rendering {len(tasks)} pages ({len(pages) - len(tasks)} unchanged)")
+    if len(tasks) >= _PARALLEL_RENDER_MIN_ROUTES:
+        # Routes are independent, we render them in parallel
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(initializer=_init_render_env, initargs=(input_path,)) as executor:
+            for future in [executor.submit(_render_page, *task) for task in tasks]:
+                future.result()
+    else:
+        _init_render_env(input_path)
+        for task in tasks:
+            _render_page(*task)
+    if manifest is not None:
+        manifest["pages"] = pages
+
+
+def _copy_if_changed(source, target):
+    # Files are copied (not hard-linked), the output must never share inodes with the package sources
+    if os.path.exists(target):
+        source_stat, target_stat = os.stat(source), os.stat(target)
+        if (not os.path.samefile(source, target) and
+                source_stat.st_size == target_stat.st_size and
+                int(source_stat.st_mtime) == int(target_stat.st_mtime)):
+            return
+        # The target is removed first, so that an existing hard link is not written through
+        os.remove(target)
+    shutil.copy2(source, target)
 
 
 def _copy_static_files(input_path, output):
     os.makedirs(output, exist_ok=True)
     for fname in os.listdir(os.path.join(input_path, "public")):
-        with open(os.path.join(input_path, f"public/{fname}"), "rb") as f:
-            with open(f"{output}/{fname}", "wb") as f2:
-                f2.write(f.read())
+        _copy_if_changed(os.path.join(input_path, f"public/{fname}"), f"{output}/{fname}")
 
 
 def _sort_versions(versions, *, reverse=True):
@@ -412,9 +512,22 @@ def _generate_demo_pages(output, configuration):
     os.remove(os.path.join(output, "demos", "mesh", "params.json"))
 
 
-def _build(input_path, output, raw_data, configuration):
-    if os.path.exists(output):
+def _get_demos_hash():
+    from nerfbaselines import __version__
+    from nerfbaselines.methods import _gaussian_splatting_demo, _mesh_demo
+    from . import _multidemo
+
+    sha = hashlib.sha256(__version__.encode("utf8"))
+    for module in (_gaussian_splatting_demo, _mesh_demo, _multidemo):
+        with open(str(module.__file__), "rb") as f:
+            sha.update(f.read())
+    return sha.hexdigest()
+
+
+def _build(input_path, output, raw_data, configuration, incremental=False):
+    if os.path.exists(output) and not incremental:
         raise FileExistsError(f"Output directory {output} already exists.")
+    manifest = _load_build_manifest(output) if incremental else {}
 
     # Build docs
     if configuration.get("include_docs") is not None:
@@ -424,15 +537,21 @@ def _build(input_path, output, raw_data, configuration):
     # Generate all routes
     logging.info("Generating pages")
     data = get_data(raw_data)
-    _generate_pages(data, input_path, output, configuration)
+    _generate_pages(data, input_path, output, configuration, manifest=manifest)
 
     # Copy static files
     logging.info("Copying static files")
     _copy_static_files(input_path, output)
 
     # Add demos
-    logging.info("Generating demo pages")
-    _generate_demo_pages(output, configuration)
+    demos_hash = _get_demos_hash()
+    if manifest.get("demos") == demos_hash and os.path.exists(os.path.join(output, "demos")):
+        logging.info("Demo pages are up to date")
+    else:
+        logging.info("Generating demo pages")
+        _generate_demo_pages(output, configuration)
+        manifest["demos"] = demos_hash
+    _save_build_manifest(output, manifest)
 
 
 def _reload_data_loading():
@@ -457,11 +576,23 @@ def build(output: str,
           data: Optional[str] = None,
           datasets: Optional[Tuple[str, ...]] = None,
           include_docs: Literal["all", "docs", None] = None,
-          base_path: str = ""):
+          base_path: str = "",
+          incremental: bool = False):
+    """
+    Builds the static website.
+
+    Args:
+        output: Output directory.
+        data: Path to the data directory. If None, data is generated from the NerfBaselines repository.
+        datasets: Datasets to include.
+        include_docs: Whether to include the documentation for all versions, the latest, or none.
+        base_path: Base path of the website.
+        incremental: Update an existing build. Only pages whose template or data changed are re-rendered.
+    """
     input_path = os.path.dirname(os.path.abspath(__file__))
     with _prepare_data(data, datasets, include_docs=include_docs) as (raw_data, configuration):
         configuration["base_path"] = base_path
-        _build(input_path, output, raw_data, configuration)
+        _build(input_path, output, raw_data, configuration, incremental=incremental)
 
 
 def start_dev_server(data: Optional[str] = None,
@@ -109,15 +109,14 @@ def blender_dataset_path(tmp_path):
 
 @pytest.fixture(autouse=True)
 def patch_prefix(tmp_path):
-    _ns_prefix_backup = os.environ.get("NS_PREFIX", None)
-    try:
-        os.environ["NS_PREFIX"] = prefix = str(tmp_path)
-        yield prefix
-    finally:
-        if _ns_prefix_backup is not None:
-            os.environ["NS_PREFIX"] = _ns_prefix_backup
-        else:
-            os.environ.pop("NS_PREFIX", None)
+    environ = {
+        "NS_PREFIX": str(tmp_path),
+        "NERFBASELINES_UNDISTORTED_CACHE": str(tmp_path / "undistorted-cache"),
+        "NERFBASELINES_REGISTRY_CACHE": str(tmp_path / "registry-index.json"),
+        "NERFBASELINES_HTTP_CACHE": str(tmp_path / "http-cache"),
+    }
+    with mock.patch.dict(os.environ, environ):
+        yield environ["NS_PREFIX"]
 
 
 def is_gpu_error(e: Exception) -> bool:
@@ -79,6 +79,9 @@ def test_camera_undistort(camera_type):
         nears_fars=None,
     )
     undistorted_cams = cameras.undistort_camera(cams)
+    # The input cameras are not modified
+    np.testing.assert_array_equal(cams.camera_models, camera_model_to_int(camera_type))
+    np.testing.assert_array_equal(cams.image_sizes, image_sizes)
     images = np.random.rand(num_cam, 200, 100, 3)
     cameras.warp_image_between_cameras(cams, undistorted_cams, images)
 
@@ -311,3 +314,130 @@ def test_project_shapes():
     uv = cameras.project(cam, xyz)
     assert uv.shape == (2, 12 * 15, 2)
     assert uv.dtype == np.float32
+
+
+@pytest.mark.parametrize("camera_type", ["opencv", "opencv_fisheye", "full_opencv"])
+@pytest.mark.parametrize("tangential", [False, True])
+def test_undistortion_fast_paths(camera_type, tangential):
+    np.random.seed(42)
+    params = np.random.rand(1, 8) * 0.05
+    params[..., 5:] *= 0.2
+    if not tangential:
+        params[..., 2:4] = 0
+    xy = (np.random.rand(10000, 2) * 2 - 1) * 0.8
+    distortion = cameras._DISTORTIONS[camera_type]
+    xy_distorted = xy + distortion(params, xy, xnp=np)
+
+    reference = cameras._iterative_undistortion(distortion, xy_distorted, params, xnp=np, compaction_interval=None)
+    np.testing.assert_allclose(reference, xy, atol=1e-6, rtol=0)
+    masked = cameras._iterative_undistortion(distortion, xy_distorted, params, xnp=np, compaction_interval=1)
+    np.testing.assert_allclose(masked, reference, atol=1e-8, rtol=0)
+    # Uses the radial fast path if possible
+    out = cameras._undistort_camera_model(camera_type, xy_distorted, params, xnp=np)
+    np.testing.assert_allclose(out, reference, atol=1e-8, rtol=0)
+
+    # Per-point parameters
+    params = np.repeat(params, len(xy), 0)
+    masked = cameras._iterative_undistortion(distortion, xy_distorted, params, xnp=np, compaction_interval=1)
+    np.testing.assert_allclose(masked, reference, atol=1e-8, rtol=0)
+
+
+class _ImmutableArray(np.ndarray):
+    # Behaves like jax arrays which do not support in-place updates
+    def __setitem__(self, key, value):
+        raise TypeError("Immutable array does not support item assignment")
+
+    def __isub__(self, other):
+        return self - other
+
+
+def test_iterative_undistortion_jax_no_item_assignment():
+    from types import SimpleNamespace
+
+    np.random.seed(42)
+    params = np.random.rand(1, 8) * 0.05
+    xy = (np.random.rand(1000, 2) * 2 - 1) * 0.8
+    distortion = cameras._DISTORTIONS["full_opencv"]
+    xy_distorted = xy + distortion(params, xy, xnp=np)
+    reference = cameras._iterative_undistortion(distortion, xy_distorted, params, xnp=np, compaction_interval=None)
+
+    xnp = SimpleNamespace(**{k: getattr(np, k) for k in dir(np) if not k.startswith("__")})
+    xnp.__name__ = "jax.numpy"
+    xnp.copy = lambda x: np.copy(x).view(_ImmutableArray)
+    out = cameras._iterative_undistortion(distortion, xy_distorted.view(_ImmutableArray), params.view(_ImmutableArray), xnp=xnp, compaction_interval=1)
+    np.testing.assert_allclose(np.asarray(out), reference, atol=1e-8, rtol=0)
+
+
+def test_warp_image_between_cameras_remap_cache():
+    from nerfbaselines.utils import convert_image_dtype
+
+    np.random.seed(42)
+    camera = _build_camera("opencv_fisheye", 
+                           np.array([300, 310, 160, 120], dtype=np.float32), 
+                           np.array([0.05, 0.01, 0, 0, 0.001, 0, 0, 0], dtype=np.float32),
+                           np.array([320, 240], dtype=np.int32))
+    undistorted_camera = cameras.undistort_camera(camera[None])[0]
+    assert undistorted_camera.image_sizes is not None
+    w, h = undistorted_camera.image_sizes
+    images = (np.random.rand(2, 240, 320, 3) * 255).astype(np.uint8)
+
+    cameras._remap_cache.clear()
+    outputs = [cameras.warp_image_between_cameras(camera, undistorted_camera, image) for image in images]
+    assert len(cameras._remap_cache) == 1
+    for image, output in zip(images, outputs):
+        np.testing.assert_array_equal(output, _warp_image_reference(camera, undistorted_camera, image))
+
+
+@pytest.mark.extras
+def test_warp_image_between_cameras_torch():
+    torch = pytest.importorskip("torch")
+
+    np.random.seed(42)
+    camera = _build_camera("opencv", 
+                           np.array([300, 310, 160, 120], dtype=np.float32), 
+                           np.array([0.05, 0.01, 0, 0, 0.001, 0, 0, 0], dtype=np.float32),
+                           np.array([320, 240], dtype=np.int32))
+    undistorted_camera = cameras.undistort_camera(camera[None])[0]
+    images = (np.random.rand(2, 240, 320, 3) * 255).astype(np.uint8)
+    expected = cameras.warp_image_between_cameras(camera[None].apply(lambda x, _: x.repeat(2, 0)), 
+                                                  undistorted_camera[None].apply(lambda x, _: x.repeat(2, 0)), 
+                                                  images)
+
+    # Both torch images and torch cameras are supported
+    torch_camera = camera.apply(lambda x, _: torch.from_numpy(x))
+    output = cameras.warp_image_between_cameras(torch_camera, undistorted_camera, torch.from_numpy(images[0]))
+    assert isinstance(output, torch.Tensor)
+    assert output.dtype == torch.uint8
+    np.testing.assert_array_equal(output.numpy(), expected[0])
+
+
+def _warp_image_reference(camera, target_camera, image):
+    from nerfbaselines.utils import convert_image_dtype
+
+    w, h = target_camera.image_sizes
+    xy = cameras.get_image_pixels(target_camera.image_sizes).astype(np.float32) + 0.5
+    empty_pose = np.eye(4, dtype=np.float32)[:3, :4]
+    _, points = cameras.unproject(target_camera.replace(poses=empty_pose)[None], xy)
+    source_xy = cameras.project(camera.replace(poses=empty_pose)[None], points) - 0.5
+    expected = cameras.interpolate_bilinear(convert_image_dtype(image, np.float32), source_xy).reshape(h, w, -1)
+    return convert_image_dtype(expected, image.dtype)
+
+
+def test_warp_image_between_cameras_batched():
+    np.random.seed(42)
+    intrinsics = np.array([[300, 310, 160, 120], [300, 310, 160, 120], [280, 290, 150, 110], [300, 310, 160, 120]], dtype=np.float32)
+    distortion_parameters = np.array([[0.05, 0.01, 0, 0, 0.001, 0, 0, 0]] * 3 + [[0.02, 0, 0, 0, 0, 0, 0, 0]], dtype=np.float32)
+    image_sizes = np.array([[320, 240], [320, 240], [300, 220], [320, 240]], dtype=np.int32)
+    cams = _build_camera("opencv_fisheye", intrinsics, distortion_parameters, image_sizes)
+    cams = cams.replace(poses=np.repeat(cams.poses[None], len(intrinsics), 0), camera_models=np.repeat(cams.camera_models[None], len(intrinsics), 0))
+    undistorted_cams = cameras.undistort_camera(cams)
+    images = (np.random.rand(4, 240, 320) * 255).astype(np.uint8)
+
+    cameras._remap_cache.clear()
+    outputs = cameras.warp_image_between_cameras(cams, undistorted_cams, images)
+    assert len(cameras._remap_cache) == 3
+    for cam, undistorted_cam, image, output in zip(cams, undistorted_cams, images, outputs):
+        expected = _warp_image_reference(cam, undistorted_cam, image)
+        h, w = expected.shape[:2]
+        np.testing.assert_array_equal(output[:h, :w], expected)
+        assert np.all(output[h:] == 0) and np.all(output[:, w:] == 0)
@@ -0,0 +1,36 @@
+import pytest
+import numpy as np
+from nerfbaselines import cameras
+
+
+def _iterative_undistortion_unmasked(camera_type, uv, params, xnp):
+    return cameras._iterative_undistortion(cameras._DISTORTIONS[camera_type], uv, params, xnp=xnp, compaction_interval=None)
+
+
+def _iterative_undistortion_masked(camera_type, uv, params, xnp):
+    return cameras._iterative_undistortion(cameras._DISTORTIONS[camera_type], uv, params, xnp=xnp)
+
+
+@pytest.mark.benchmark(group="undistortion")
+@pytest.mark.parametrize("camera_type", ["opencv", "opencv_fisheye", "full_opencv"])
+@pytest.mark.parametrize("undistort", [
+    _iterative_undistortion_unmasked,
+    _iterative_undistortion_masked,
+    cameras._undistort_camera_model], ids=["newton", "masked-newton", "default"])
+@pytest.mark.parametrize("wide", [False, True], ids=["normal", "wide"])
+def test_undistortion(benchmark, camera_type, undistort, wide):
+    np.random.seed(42)
+    params = np.random.rand(1, 8) * 0.05
+    params[..., 2:4] = 0
+    if not wide:
+        # Points of a 640x480 image
+        xy = np.stack(np.meshgrid(np.linspace(-0.8, 0.8, 640), np.linspace(-0.6, 0.6, 480), indexing="xy"), -1).reshape(-1, 2)
+    else:
+        # Strong distortion, some points are outside of the invertible region and never converge
+        params[..., 0] = -0.3
+        xy = np.stack(np.meshgrid(np.linspace(-1.6, 1.6, 160), np.linspace(-1.2, 1.2, 120), indexing="xy"), -1).reshape(-1, 2)
+    xy_distorted = xy + cameras._DISTORTIONS[camera_type](params, xy, xnp=np)
+    with np.errstate(all="ignore"):
+        out = benchmark(undistort, camera_type, xy_distorted, params, xnp=np)
+    if not wide:
+        np.testing.assert_allclose(out, xy, atol=1e-5, rtol=0)
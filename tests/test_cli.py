@@ -9,6 +9,7 @@ from unittest import mock
     "train --data data --method zipnerf --checkpoint checkpoint --output output".split(),
     "render --data data --checkpoint checkpoint --output output".split(),
     "render-trajectory --checkpoint checkpoint --output output --trajectory trajectory".split(),
+    "merge-frames shard1 shard2 --output output".split(),
     "evaluate predictions --output output".split(),
     "build-docker-image".split(),
     "download-dataset dataset".split(),
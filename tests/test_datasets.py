@@ -1,6 +1,8 @@
 import numpy as np
 import json
 import os
+import hashlib
+import shutil
 from unittest import mock
 import contextlib
 import pytest
@@ -197,3 +199,392 @@ def test_all_dataset_tested():
             dataset = k[5:-8]
             untested_datasets.remove(dataset)
     assert len(untested_datasets) == 0, f"Untested datasets: {untested_datasets}"
+
+
+def test_undistorted_dataset_cache(colmap_dataset_path, tmp_path):
+    from nerfbaselines import cameras
+    from nerfbaselines.datasets import load_dataset, _common
+
+    cache_path = tmp_path / "undistorted-cache"
+    with mock.patch.dict(os.environ, {"NERFBASELINES_UNDISTORTED_CACHE": str(cache_path)}):
+        dataset = load_dataset(colmap_dataset_path, split="train", supported_camera_models=frozenset(("pinhole",)))
+        assert len(list(cache_path.glob("*/*.npz"))) == len(dataset["images"])
+
+        # Second load uses the cache (the source images are not decoded)
+        with mock.patch.object(cameras, "warp_image_between_cameras", side_effect=AssertionError("cache not used")), \
+                mock.patch.object(_common, "_read_image", side_effect=AssertionError("image decoded")):
+            cached_dataset = load_dataset(colmap_dataset_path, split="train", supported_camera_models=frozenset(("pinhole",)))
+        assert cached_dataset["image_paths"] == dataset["image_paths"]
+        assert cached_dataset["image_paths_root"] == dataset["image_paths_root"]
+        np.testing.assert_array_equal(cached_dataset["cameras"].camera_models, 0)
+        np.testing.assert_array_equal(cached_dataset["cameras"].intrinsics, dataset["cameras"].intrinsics)
+        np.testing.assert_array_equal(cached_dataset["cameras"].image_sizes, dataset["cameras"].image_sizes)
+        np.testing.assert_array_equal(cached_dataset["cameras"].poses, dataset["cameras"].poses)
+        for image, cached_image in zip(dataset["images"], cached_dataset["images"]):
+            np.testing.assert_array_equal(image, cached_image)
+
+    # The cache can be disabled
+    with mock.patch.dict(os.environ, {"NERFBASELINES_UNDISTORTED_CACHE": ""}), \
+            mock.patch.object(cameras, "warp_image_between_cameras", wraps=cameras.warp_image_between_cameras) as warp:
+        load_dataset(colmap_dataset_path, split="train", supported_camera_models=frozenset(("pinhole",)))
+        assert warp.call_count >= len(dataset["images"])
+
+    # The cache size is bounded, the least recently used entries are removed
+    entry_size = max(x.stat().st_size for x in cache_path.glob("*/*.npz"))
+    small_cache_path = tmp_path / "small-undistorted-cache"
+    with mock.patch.dict(os.environ, {"NERFBASELINES_UNDISTORTED_CACHE": str(small_cache_path),
+                                      "NERFBASELINES_UNDISTORTED_CACHE_SIZE": str(3 * entry_size)}):
+        load_dataset(colmap_dataset_path, split="train", supported_camera_models=frozenset(("pinhole",)))
+    entries = list(small_cache_path.glob("*/*.npz"))
+    assert 0 < len(entries) < len(dataset["images"])
+    assert sum(x.stat().st_size for x in entries) <= 3 * entry_size
+
+
+def test_lazy_images_undistorted_cache(colmap_dataset_path, tmp_path):
+    from nerfbaselines import cameras
+    from nerfbaselines.datasets import load_dataset, _common
+
+    supported_camera_models = frozenset(("pinhole",))
+    cache_path = tmp_path / "undistorted-cache"
+    with mock.patch.dict(os.environ, {"NERFBASELINES_UNDISTORTED_CACHE": str(cache_path)}):
+        lazy_dataset = load_dataset(colmap_dataset_path, split="train", supported_camera_models=supported_camera_models, lazy_images=True)
+        # NOTE: type checking can access the first image
+        assert len(list(cache_path.glob("*/*.npz"))) <= 1
+        lazy_images = list(lazy_dataset["images"])
+
+        # Lazily undistorted images are stored in the cache
+        assert len(list(cache_path.glob("*/*.npz"))) == len(lazy_images)
+        with mock.patch.object(cameras, "warp_image_between_cameras", side_effect=AssertionError("cache not used")), \
+                mock.patch.object(_common, "_read_image", wraps=_common._read_image) as read_image:
+            dataset = load_dataset(colmap_dataset_path, split="train", supported_camera_models=supported_camera_models)
+            lazy_dataset = load_dataset(colmap_dataset_path, split="train", supported_camera_models=supported_camera_models, lazy_images=True)
+            # The lazy images are loaded from the cache as well
+            for image, lazy_image, cached_image in zip(dataset["images"], lazy_images, lazy_dataset["images"]):
+                np.testing.assert_array_equal(image, lazy_image)
+                np.testing.assert_array_equal(image, cached_image)
+        assert read_image.call_count <= 1
+
+
+@pytest.mark.parametrize("supported_camera_models", [None, frozenset(("pinhole",))])
+def test_load_dataset_lazy_images(colmap_dataset_path, supported_camera_models):
+    import pickle
+    from nerfbaselines.datasets import load_dataset, dataset_index_select, LazyImages
+
+    dataset = load_dataset(colmap_dataset_path, split="train", supported_camera_models=supported_camera_models)
+    with mock.patch.dict(os.environ, {"NERFBASELINES_LAZY_IMAGES_CACHE_SIZE": "2"}):
+        lazy_dataset = load_dataset(colmap_dataset_path, split="train", supported_camera_models=supported_camera_models, lazy_images=True)
+    images = lazy_dataset["images"]
+    assert isinstance(images, LazyImages)
+    assert len(images) == len(dataset["images"])
+    assert lazy_dataset["image_paths"] == dataset["image_paths"]
+    np.testing.assert_array_equal(lazy_dataset["cameras"].intrinsics, dataset["cameras"].intrinsics)
+    np.testing.assert_array_equal(lazy_dataset["cameras"].camera_models, dataset["cameras"].camera_models)
+    np.testing.assert_array_equal(lazy_dataset["cameras"].image_sizes, dataset["cameras"].image_sizes)
+    for image, lazy_image in zip(dataset["images"], images):
+        np.testing.assert_array_equal(image, lazy_image)
+    assert images[-1] is images[len(images) - 1]
+
+    # The number of decoded images is bounded
+    assert len(images._cache.images) <= 2
+
+    # Index select keeps the images lazy
+    subset = dataset_index_select(lazy_dataset, [2, 0])["images"]
+    assert isinstance(subset, LazyImages)
+    np.testing.assert_array_equal(subset[0], dataset["images"][2])
+    np.testing.assert_array_equal(subset[1], dataset["images"][0])
+
+    # Images are pickled by paths
+    data = pickle.dumps(images)
+    assert len(data) < 10_000
+    unpickled = pickle.loads(data)
+    assert len(unpickled._cache.images) == 0
+    np.testing.assert_array_equal(unpickled[1], dataset["images"][1])
+
+
+def test_load_dataset_splits(colmap_dataset_path):
+    from nerfbaselines.datasets import load_dataset, load_dataset_splits
+    from nerfbaselines.datasets import _common, _colmap_utils
+
+    features = frozenset(("color", "points3D_xyz"))
+    with mock.patch.object(_common, "_load_unknown_dataset", wraps=_common._load_unknown_dataset) as detect, \
+            mock.patch.object(_colmap_utils, "read_images_binary", wraps=_colmap_utils.read_images_binary) as read_images:
+        datasets = load_dataset_splits(colmap_dataset_path, splits=("train", "test"), features=features)
+        # The format is detected and the COLMAP model is parsed only once
+        assert detect.call_count == 1
+        assert read_images.call_count == 1
+
+    assert set(datasets.keys()) == {"train", "test"}
+    for split, dataset in datasets.items():
+        expected = load_dataset(colmap_dataset_path, split=split, features=features)
+        assert dataset["image_paths"] == expected["image_paths"]
+        assert dataset["metadata"].keys() == expected["metadata"].keys()
+        np.testing.assert_array_equal(dataset["cameras"].poses, expected["cameras"].poses)
+        np.testing.assert_array_equal(dataset["points3D_xyz"], expected["points3D_xyz"])
+        for image, expected_image in zip(dataset["images"], expected["images"]):
+            np.testing.assert_array_equal(image, expected_image)
+
+
+def test_lazy_images_prefetch(tmp_path):
+    from PIL import Image
+    from nerfbaselines.datasets import LazyImages
+
+    paths = []
+    for i in range(10):
+        paths.append(str(tmp_path / f"{i}.png"))
+        Image.fromarray(np.full((4, 5, 3), i, dtype=np.uint8)).save(paths[-1])
+    images = LazyImages(paths, cache_size=10, prefetch=3)
+    images[3]
+    images[0]
+    assert len(images._cache.pending) == 0
+    images[1]
+    images[2]
+    # Sequential access prefetches the next images
+    for future in list(images._cache.pending.values()):
+        future.result()
+    assert set(images._cache.images.keys()) == {0, 1, 2, 3, 4, 5}
+    np.testing.assert_array_equal(images[5], 5)
+
+    # Explicitly assigned images are kept in memory
+    images[7] = np.zeros((2, 2, 3), dtype=np.uint8)
+    assert images[7].shape == (2, 2, 3)
+    assert images[-3].shape == (2, 2, 3)
+    with pytest.raises(IndexError):
+        images[10]
+
+
+@contextlib.contextmanager
+def _serve_files(files, fail_after=None, support_ranges=True, headers=None, fail_once=()):
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    requests_log = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            data = files.get(self.path)
+            if data is None:
+                self.send_error(404)
+                return
+            range_header = self.headers.get("Range")
+            requests_log.append((self.path, range_header))
+            if self.path in fail_once and [x[0] for x in requests_log].count(self.path) == 1:
+                self.send_error(404)
+                return
+            etag = '"' + hashlib.md5(data).hexdigest() + '"'
+            if self.headers.get("If-Range", etag) != etag:
+                # The partial file is outdated, the full content is sent
+                range_header = None
+            start = 0
+            if support_ranges and range_header is not None:
+                start = int(range_header[len("bytes="):].split("-")[0])
+                if start >= len(data):
+                    self.send_error(416)
+                    return
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", str(len(data) - start))
+            self.send_header("ETag", etag)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            end = len(data)
+            if fail_after is not None and len(requests_log) == 1:
+                # Simulate a broken connection
+                end = min(end, start + fail_after)
+            self.wfile.write(data[start:end])
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", requests_log
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _make_archive(file_type, files):
+    import io
+    import tarfile
+    import zipfile
+
+    buffer = io.BytesIO()
+    if file_type == "zip":
+        with zipfile.ZipFile(buffer, "w") as z:
+            for name, data in files.items():
+                z.writestr(name, data)
+    else:
+        with tarfile.open(fileobj=buffer, mode="w:gz") as z:
+            for name, data in files.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                z.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("file_type", ["zip", "tar.gz"])
+@pytest.mark.parametrize("support_ranges", [True, False])
+def test_download_archive_dataset_resume(tmp_path, file_type, support_ranges):
+    from nerfbaselines.datasets._common import download_archive_dataset
+
+    rng = np.random.default_rng(42)
+    files = {
+        "scene/images/a.bin": rng.bytes(1_500_000),
+        "scene/images/b.bin": rng.bytes(1_500_000),
+        "other/c.bin": b"c",
+    }
+    archive = _make_archive(file_type, files)
+    output = str(tmp_path / "scene")
+    with mock.patch("nerfbaselines.datasets._common.time.sleep"), \
+            _serve_files({"/scene": archive}, fail_after=len(archive) // 2, support_ranges=support_ranges) as (url, requests_log):
+        download_archive_dataset(f"{url}/scene", output,
+                                 archive_prefix="scene/",
+                                 nb_info={"id": "test"},
+                                 file_type=file_type,
+                                 sha256=hashlib.sha256(archive).hexdigest())
+    assert len(requests_log) == 2
+    if support_ranges:
+        # Only the missing part was downloaded again
+        assert requests_log[1][1] is not None
+        assert 0 < int(requests_log[1][1][len("bytes="):-1]) <= len(archive) // 2
+    assert sorted(os.listdir(output)) == ["images", "nb-info.json"]
+    for name in ("a.bin", "b.bin"):
+        with open(os.path.join(output, "images", name), "rb") as f:
+            assert f.read() == files[f"scene/images/{name}"]
+    assert not os.path.exists(output + ".part")
+    assert not os.path.exists(output + ".tmp")
+
+
+def test_download_archive_dataset_checksum_mismatch(tmp_path):
+    from nerfbaselines.datasets._common import download_archive_dataset
+
+    archive = _make_archive("zip", {"scene/a.txt": b"a"})
+    output = str(tmp_path / "scene")
+    with _serve_files({"/scene.zip": archive}) as (url, _):
+        with pytest.raises(RuntimeError, match="Checksum mismatch"):
+            download_archive_dataset(f"{url}/scene.zip", output,
+                                     archive_prefix="scene/",
+                                     nb_info={},
+                                     sha256="0" * 64)
+    assert not os.path.exists(output)
+    assert not os.path.exists(output + ".part")
+
+
+@pytest.mark.parametrize("file_type", ["zip", "tar.gz"])
+@pytest.mark.parametrize("validator", [None, "outdated"])
+def test_download_archive_dataset_changed_remote_file(tmp_path, file_type, validator):
+    from nerfbaselines.datasets._common import download_archive_dataset
+
+    old_archive = _make_archive(file_type, {"scene/a.bin": b"old" * 100_000})
+    archive = _make_archive(file_type, {"scene/a.bin": b"new" * 100_000})
+    output = str(tmp_path / "scene")
+    with open(output + ".part", "wb") as f:
+        f.write(old_archive[:len(old_archive) // 2])
+    if validator is not None:
+        with open(output + ".part.json", "w") as f:
+            json.dump({"etag": '"outdated"', "size": len(old_archive)}, f)
+    with _serve_files({"/scene": archive}) as (url, requests_log):
+        download_archive_dataset(f"{url}/scene", output,
+                                 archive_prefix="scene/",
+                                 nb_info={},
+                                 file_type=file_type)
+    if validator is None:
+        # The partial file cannot be validated, the download starts from zero
+        assert requests_log == [("/scene", None)]
+    else:
+        assert len(requests_log) == 1
+    with open(os.path.join(output, "a.bin"), "rb") as f:
+        assert f.read() == b"new" * 100_000
+    assert not os.path.exists(output + ".part")
+    assert not os.path.exists(output + ".part.json")
+
+
+def test_download_archive_dataset_server_checksum(tmp_path):
+    from nerfbaselines.datasets._common import download_archive_dataset
+
+    archive = _make_archive("zip", {"scene/a.txt": b"a"})
+    output = str(tmp_path / "scene")
+    with _serve_files({"/scene.zip": archive}, headers={"X-Linked-Etag": '"' + hashlib.sha256(archive).hexdigest() + '"'}) as (url, _):
+        download_archive_dataset(f"{url}/scene.zip", output, archive_prefix="scene/", nb_info={})
+    assert sorted(os.listdir(output)) == ["a.txt", "nb-info.json"]
+
+    shutil.rmtree(output)
+    with _serve_files({"/scene.zip": archive}, headers={"X-Linked-Etag": '"' + "0" * 64 + '"'}) as (url, _):
+        with pytest.raises(RuntimeError, match="Checksum mismatch"):
+            download_archive_dataset(f"{url}/scene.zip", output, archive_prefix="scene/", nb_info={})
+    assert not os.path.exists(output)
+    assert not os.path.exists(output + ".part")
+    assert not os.path.exists(output + ".part.json")
+
+
+def test_download_mipnerf360_dataset_shared_archives(tmp_path):
+    from nerfbaselines.datasets import mipnerf360
+
+    res = mipnerf360._scenes360_res
+    extra_scenes = ["flowers", "treehill"]
+    archives = {
+        "/360_v2.zip": _make_archive("zip", {f"{x}/images_{res[x]}/a.txt": x.encode() for x in res if x not in extra_scenes}),
+        "/360_extra_scenes.zip": _make_archive("zip", {f"{x}/images_{res[x]}/a.txt": x.encode() for x in extra_scenes}),
+    }
+    output = str(tmp_path / "mipnerf360")
+    with _serve_files(archives, fail_once=("/360_extra_scenes.zip",)) as (url, requests_log), \
+            mock.patch.object(mipnerf360, "_URLS", {"base": f"{url}/360_v2.zip", "extra": f"{url}/360_extra_scenes.zip"}), \
+            mock.patch.object(mipnerf360, "_save_colmap_splits"):
+        mipnerf360.download_mipnerf360_dataset("mipnerf360", output)
+
+    # The shared archive was downloaded once, only the failed archive was downloaded again
+    assert sorted(x[0] for x in requests_log) == ["/360_extra_scenes.zip", "/360_extra_scenes.zip", "/360_v2.zip"]
+    assert sorted(os.listdir(output)) == sorted(mipnerf360.SCENES)
+    for scene in mipnerf360.SCENES:
+        assert sorted(os.listdir(os.path.join(output, scene))) == [f"images_{res[scene]}", "nb-info.json"]
+        with open(os.path.join(output, scene, "nb-info.json"), "r", encoding="utf8") as f:
+            assert json.load(f)["scene"] == scene
+
+
+def test_download_dataset_wrapper_parallel(tmp_path):
+    import threading
+    import time
+    from nerfbaselines.datasets._common import download_dataset_wrapper
+
+    lock = threading.Lock()
+    calls = []
+    running = [0, 0]
+
+    @download_dataset_wrapper(["a", "b", "c", "d"], "test")
+    def download(path, output):
+        with lock:
+            calls.append(path)
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        if path == "test/b" and calls.count(path) == 1:
+            raise RuntimeError("Connection error")
+        os.makedirs(output)
+
+    with mock.patch.dict(os.environ, {"NERFBASELINES_DOWNLOAD_WORKERS": "4"}):
+        download("test", str(tmp_path / "test"))
+    assert running[1] > 1
+    # Only the failed scene was downloaded again
+    assert sorted(calls) == ["test/a", "test/b", "test/b", "test/c", "test/d"]
+    assert sorted(os.listdir(tmp_path / "test")) == ["a", "b", "c", "d"]
+
+
+def test_download_dataset_wrapper_failure_isolation(tmp_path):
+    from nerfbaselines.datasets._common import download_dataset_wrapper
+
+    @download_dataset_wrapper(["a", "b", "c"], "test")
+    def download(path, output):
+        if path == "test/b":
+            raise RuntimeError("Not found")
+        os.makedirs(output)
+
+    with pytest.raises(RuntimeError, match="Failed to download scenes b of test"):
+        download("test", str(tmp_path / "test"))
+    assert sorted(os.listdir(tmp_path / "test")) == ["a", "c"]
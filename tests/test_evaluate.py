@@ -1,3 +1,4 @@
+import hashlib
 import sys
 from unittest import mock
 import pytest
@@ -82,3 +83,75 @@ def test_evaluate_command_extras(tmp_path, mock_torch):
         results = json.load(f)
         assert "ssim" in results["metrics"]
         assert "lpips" in results["metrics"]
+
+
+@pytest.mark.parametrize("image_names", [False, True], ids=["all-buffered", "incremental"])
+@pytest.mark.parametrize("color_space", ["srgb", "linear"])
+def test_predictions_evaluator_matches_evaluate(tmp_path, monkeypatch, color_space, image_names):
+    from nerfbaselines import new_cameras, new_dataset, metrics
+    from nerfbaselines.evaluation import render_all_images, PredictionsEvaluator
+
+    num_images = 12
+    rng = np.random.default_rng(42)
+    method = mock.MagicMock()
+    method.get_info.return_value = {"supported_camera_models": frozenset(("pinhole",))}
+    method.render.side_effect = lambda *args, **kwargs: {
+        "color": rng.random((50, 60, 4), dtype=np.float32),
+    }
+    dataset = new_dataset(
+        images=[rng.integers(0, 256, (50, 60, 3), dtype=np.uint8) for _ in range(num_images)],
+        # Rendering order differs from the sorted order used by evaluate
+        image_paths=[str(tmp_path / f"image_{i}.png") for i in reversed(range(num_images))],
+        image_paths_root=str(tmp_path),
+        cameras=new_cameras(
+            poses=np.eye(4)[None, ...].repeat(num_images, axis=0)[..., :3, :4],
+            intrinsics=np.array([[50, 50, 30, 25]] * num_images, dtype=np.float32),
+            camera_models=np.zeros(num_images, dtype=np.int32),
+            image_sizes=np.array([[60, 50]] * num_images, dtype=np.int32),
+        ),
+        metadata={
+            "evaluation_protocol": "default",
+            "color_space": color_space,
+            "background_color": np.array([255, 0, 128], dtype=np.uint8),
+        })
+    # Avoid downloading the LPIPS weights
+    monkeypatch.setattr(metrics, "lpips", lambda a, b: np.asarray(metrics.mse(a, b)) * 2)
+
+    evaluator = PredictionsEvaluator(image_names=[f"image_{i}.png" for i in range(num_images)] if image_names else None)
+    list(render_all_images(method, dataset, output=str(tmp_path / "predictions.tar.gz"), on_saved=evaluator.add_file))
+    results = evaluator.save(str(tmp_path / "results.json"))
+    with pytest.raises(FileExistsError):
+        evaluator.save(str(tmp_path / "results.json"))
+
+    expected = evaluate(str(tmp_path / "predictions.tar.gz"), output=str(tmp_path / "results-expected.json"))
+    with (tmp_path / "results.json").open("r", encoding="utf8") as f:
+        results = json.load(f)
+    with (tmp_path / "results-expected.json").open("r", encoding="utf8") as f:
+        expected = json.load(f)
+    results.pop("evaluate_datetime")
+    expected.pop("evaluate_datetime")
+    assert len(results["metrics"]) > 0
+    assert results == expected
+
+
+def test_predictions_evaluator_incremental_sha():
+    from nerfbaselines.evaluation import PredictionsEvaluator
+
+    # The images are hashed in the sorted path order (image_10 < image_2)
+    image_names = ["image_1.png", "image_2.png", "image_10.png", "a/image_3.png"]
+    evaluator = PredictionsEvaluator(mock.MagicMock(), image_names=image_names)
+    evaluator.add_file("info.json", b'{"evaluation_protocol": "default"}')
+    image = np.zeros((2, 2, 3), dtype=np.uint8)
+    max_buffered = 0
+    for name in ["image_1.png", "image_10.png", "a/image_3.png", "image_2.png"]:
+        evaluator.add_file(f"gt-color/{name}", f"gt-{name}".encode(), image)
+        evaluator.add_file(f"color/{name}", name.encode(), image)
+        max_buffered = max(max_buffered, len(evaluator._encoded["color"]))
+    # Only the images written out of the sorted order are kept in memory
+    assert max_buffered == 2
+    assert evaluator._encoded == {"color": {}, "gt-color": {}}
+
+    expected = hashlib.sha256()
+    for name in ["a/image_3.png", "image_1.png", "image_10.png", "image_2.png"]:
+        expected.update(name.encode())
+    assert evaluator._sha["color"].hexdigest() == expected.hexdigest()
@@ -0,0 +1,208 @@
+import os
+import numpy as np
+import pytest
+
+
+def _random_gaussians(num_points, sh_degree=3, seed=42):
+    rng = np.random.default_rng(seed)
+    quaternions = rng.normal(size=(num_points, 4)).astype(np.float32)
+    quaternions /= np.linalg.norm(quaternions, axis=-1, keepdims=True)
+    return {
+        "xyz": rng.uniform(-20, 20, size=(num_points, 3)).astype(np.float32),
+        "scales": np.exp(rng.normal(-3, 1, size=(num_points, 3))).astype(np.float32),
+        "opacities": rng.uniform(0.01, 1, size=(num_points, 1)).astype(np.float32),
+        "quaternions": quaternions,
+        "spherical_harmonics": rng.uniform(-1, 1, size=(num_points, 3, (sh_degree + 1) ** 2)).astype(np.float32),
+    }
+
+
+def test_generate_ply_file(tmp_path):
+    from nerfbaselines.methods._gaussian_splatting_demo import generate_ply_file
+
+    gaussians = _random_gaussians(100)
+    generate_ply_file(str(tmp_path / "scene.ply"), **gaussians)
+    data = (tmp_path / "scene.ply").read_bytes()
+    header, body = data.split(b"end_header\n", 1)
+    properties = [x.split()[-1].decode() for x in header.splitlines() if x.startswith(b"property")]
+    assert b"element vertex 100" in header
+    assert len(properties) == 62
+    vertices = np.frombuffer(body, dtype="<f4").reshape(100, len(properties))
+    np.testing.assert_allclose(vertices[:, :3], gaussians["xyz"])
+    np.testing.assert_allclose(vertices[:, properties.index("f_rest_0")], gaussians["spherical_harmonics"][:, 0, 1])
+    np.testing.assert_allclose(vertices[:, properties.index("f_rest_15")], gaussians["spherical_harmonics"][:, 1, 1])
+    np.testing.assert_allclose(vertices[:, properties.index("opacity")], np.log(gaussians["opacities"][:, 0] / (1 - gaussians["opacities"][:, 0])), rtol=1e-5, atol=1e-5)
+    np.testing.assert_allclose(vertices[:, properties.index("scale_0")], np.log(gaussians["scales"][:, 0]), rtol=1e-6)
+    np.testing.assert_allclose(vertices[:, -4:], gaussians["quaternions"])
+
+
+@pytest.mark.parametrize("compression_level", [0, 1, 2])
+@pytest.mark.parametrize("sh_degree", [0, 1, 2])
+def test_generate_ksplat_file_round_trip(tmp_path, compression_level, sh_degree):
+    from nerfbaselines.methods._gaussian_splatting_demo import generate_ksplat_file, _read_ksplat_file
+
+    gaussians = _random_gaussians(3000)
+    gaussians["opacities"][:10] = 0.001
+    path = str(tmp_path / "scene.ksplat")
+    generate_ksplat_file(path, **gaussians,
+                         compression_level=compression_level,
+                         spherical_harmonics_degree=sh_degree,
+                         bucket_size=64)
+    bytes_per_splat = {0: 44, 1: 24, 2: 24}[compression_level] + {0: 4, 1: 2, 2: 1}[compression_level] * 3 * [0, 3, 8][sh_degree]
+    out = _read_ksplat_file(path)
+
+    # Transparent Gaussians are removed and the rest may be reordered
+    assert len(out["xyz"]) == 2990
+    mask = np.ones(len(gaussians["xyz"]), dtype=bool)
+    mask[:10] = False
+    expected = {k: v[mask] for k, v in gaussians.items()}
+    # Match the Gaussians by their positions
+    distances = np.square(out["xyz"][:, None, :] - expected["xyz"][None, :, :]).sum(-1)
+    expected_order = np.argmin(distances, 1)
+    assert len(np.unique(expected_order)) == len(expected_order)
+
+    atol = 1e-6 if compression_level == 0 else 1e-3
+    np.testing.assert_allclose(out["xyz"], expected["xyz"][expected_order], atol=atol * 10)
+    np.testing.assert_allclose(out["scales"], expected["scales"][expected_order], rtol=1e-3, atol=atol)
+    np.testing.assert_allclose(out["quaternions"], expected["quaternions"][expected_order], atol=atol)
+    np.testing.assert_allclose(out["opacities"], expected["opacities"][expected_order, 0], atol=0.5 / 255 + 1e-6)
+    colors = np.clip(0.5 + 0.28209479177387814 * expected["spherical_harmonics"][:, :, 0], 0, 1)
+    np.testing.assert_allclose(out["colors"], colors[expected_order], atol=0.5 / 255 + 1e-6)
+    num_coefficients = [0, 3, 8][sh_degree]
+    sh_atol = {0: 1e-6, 1: 1e-3, 2: 3 / 255}[compression_level]
+    np.testing.assert_allclose(out["spherical_harmonics"],
+                               expected["spherical_harmonics"][expected_order, :, 1:num_coefficients + 1], atol=sh_atol)
+
+    # Check the file size matches the splat layout of the GaussianSplats3D viewer
+    file_size = (tmp_path / "scene.ksplat").stat().st_size
+    assert file_size - 4096 - 1024 >= 2990 * bytes_per_splat
+    if compression_level == 0:
+        assert file_size == 4096 + 1024 + 2990 * bytes_per_splat
+
+
+@pytest.mark.parametrize("compression_level", [0, 1])
+def test_generate_ksplat_file_header(tmp_path, compression_level):
+    import struct
+    from nerfbaselines.methods._gaussian_splatting_demo import generate_ksplat_file
+
+    gaussians = _random_gaussians(1000)
+    gaussians["opacities"][:] = 0.5
+    path = tmp_path / "scene.ksplat"
+    generate_ksplat_file(str(path), **gaussians,
+                         compression_level=compression_level,
+                         spherical_harmonics_degree=1,
+                         block_size=5.0,
+                         bucket_size=64)
+    data = path.read_bytes()
+
+    # Offsets of the SplatBuffer header of the GaussianSplats3D viewer
+    assert struct.unpack_from("<BB", data, 0) == (0, 1)
+    max_sections, sections, max_splats, splats = struct.unpack_from("<4I", data, 4)
+    assert (max_sections, sections, max_splats, splats) == (1, 1, 1000, 1000)
+    assert struct.unpack_from("<H", data, 20)[0] == compression_level
+    scene_center = struct.unpack_from("<3f", data, 24)
+    np.testing.assert_allclose(scene_center, (gaussians["xyz"].min(0) + gaussians["xyz"].max(0)) / 2, rtol=1e-6)
+    assert struct.unpack_from("<2f", data, 36) == (-1.5, 1.5)
+
+    # Section header
+    section = 4096
+    u32 = lambda i: struct.unpack_from("<I", data, section + 4 * i)[0]
+    u16 = lambda i: struct.unpack_from("<H", data, section + 2 * i)[0]
+    f32 = lambda i: struct.unpack_from("<f", data, section + 4 * i)[0]
+    bytes_per_splat = {0: 44 + 4 * 9, 1: 24 + 2 * 9}[compression_level]
+    assert (u32(0), u32(1)) == (1000, 1000)
+    assert u16(20) == 1
+    storage_size = u32(7)
+    assert len(data) == 4096 + 1024 + storage_size
+    if compression_level == 0:
+        assert (u32(2), u32(3), f32(4), u16(10), u32(6), u32(8), u32(9)) == (0, 0, 0.0, 0, 0, 0, 0)
+        assert storage_size == 1000 * bytes_per_splat
+    else:
+        bucket_size, bucket_count, full_buckets, partial_buckets = u32(2), u32(3), u32(8), u32(9)
+        assert bucket_size == 64
+        assert f32(4) == 5.0
+        assert u16(10) == 12
+        assert u32(6) == 32767
+        assert full_buckets + partial_buckets == bucket_count
+        assert storage_size == 4 * partial_buckets + 12 * bucket_count + 1000 * bytes_per_splat
+        partial_lengths = np.frombuffer(data, dtype="<u4", count=partial_buckets, offset=4096 + 1024)
+        assert full_buckets * bucket_size + partial_lengths.sum() == 1000
+        assert np.all((partial_lengths > 0) & (partial_lengths < bucket_size))
+
+
+def test_export_demo_lod(tmp_path):
+    import json
+    from unittest import mock
+    from nerfbaselines.methods import _gaussian_splatting_demo
+
+    gaussians = _random_gaussians(2000, sh_degree=0)
+    with mock.patch.object(_gaussian_splatting_demo, "wget") as wget:
+        _gaussian_splatting_demo.export_demo(str(tmp_path), **gaussians, options={
+            "lod_levels": 2,
+            "chunk_size": 1000,
+            "dataset_metadata": {
+                "viewer_transform": np.eye(4),
+                "viewer_initial_pose": np.eye(4),
+            },
+        })
+    assert wget.call_count > 0
+    assert (tmp_path / "index.html").exists()
+    assert not (tmp_path / "scene.ksplat").exists()
+
+    # The page loads the manifest relative to params.json and the chunks relative to the manifest
+    params = json.loads((tmp_path / "params.json").read_text())
+    assert params["sceneUri"] is None
+    manifest_path = tmp_path / params["sceneManifestUri"]
+    manifest = json.loads(manifest_path.read_text())
+    assert manifest["compressionLevel"] == 1
+    assert [x["numGaussians"] for x in manifest["levels"]] == [500, 1500]
+    for level in manifest["levels"]:
+        for chunk in level["chunks"]:
+            assert not os.path.isabs(chunk["uri"])
+            chunk_path = manifest_path.parent / chunk["uri"]
+            assert chunk_path.exists()
+            # Chunks are ksplat files with compression level 1
+            data = chunk_path.read_bytes()
+            assert data[:2] == bytes((0, 1))
+            assert np.frombuffer(data, dtype="<u2", count=1, offset=20)[0] == 1
+            assert np.frombuffer(data, dtype="<u4", count=1, offset=16)[0] == chunk["numGaussians"]
+
+
+def test_generate_chunked_scene(tmp_path):
+    import json
+    from nerfbaselines.methods._gaussian_splatting_demo import generate_chunked_scene, _read_ksplat_file
+
+    gaussians = _random_gaussians(5000, sh_degree=1)
+    gaussians["opacities"][:100] = 0.005
+    manifest = generate_chunked_scene(str(tmp_path), **gaussians,
+                                      num_levels=3,
+                                      chunk_size=1000,
+                                      prune_opacity=0.01,
+                                      spherical_harmonics_degree=1)
+    assert json.loads((tmp_path / "scene.json").read_text()) == manifest
+    assert manifest["numGaussians"] == 4900
+    assert [x["numGaussians"] for x in manifest["levels"]] == [307, 918, 3675]
+
+    importance = gaussians["opacities"][:, 0] * np.prod(gaussians["scales"], -1) ** (2 / 3)
+    level_importance = []
+    for level in manifest["levels"]:
+        assert sum(x["numGaussians"] for x in level["chunks"]) == level["numGaussians"]
+        assert all(x["numGaussians"] <= 1000 for x in level["chunks"])
+        xyz = []
+        for chunk in level["chunks"]:
+            data = _read_ksplat_file(str(tmp_path / chunk["uri"]))
+            assert len(data["xyz"]) == chunk["numGaussians"]
+            assert data["spherical_harmonics"].shape[-1] == 3
+            np.testing.assert_array_less(np.array(chunk["min"]) - 1e-3, data["xyz"].min(0))
+            np.testing.assert_array_less(data["xyz"].max(0), np.array(chunk["max"]) + 1e-3)
+            xyz.append(data["xyz"])
+        xyz = np.concatenate(xyz)
+        indices = np.argmin(np.square(xyz[:, None] - gaussians["xyz"][None]).sum(-1), 1)
+        assert np.all(gaussians["opacities"][indices, 0] >= 0.01)
+        level_importance.append(importance[indices])
+
+    # Coarse levels contain the most important Gaussians
+    assert level_importance[0].min() >= level_importance[1].max() >= level_importance[2].max()
+
+    # Chunks of the finest level are spatially compact (Morton order)
+    chunk_extents = [np.prod(np.array(x["max"]) - np.array(x["min"])) for x in manifest["levels"][-1]["chunks"]]
+    assert np.mean(chunk_extents) < 0.5 * np.prod(np.array(manifest["max"]) - np.array(manifest["min"]))
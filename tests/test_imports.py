@@ -0,0 +1,42 @@
+import sys
+import subprocess
+import pytest
+
+
+def _get_import_times(statement):
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], check=True, capture_output=True)
+    times = {}
+    for line in out.stderr.decode("utf8").splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative.strip())
+    return times
+
+
+def test_import_nerfbaselines_is_lightweight():
+    times = _get_import_times("import nerfbaselines")
+    assert "nerfbaselines" in times
+    for module in ("numpy", "requests", "PIL", "matplotlib", "nerfbaselines._registry", "importlib.metadata"):
+        assert module not in times, f"import nerfbaselines should not import {module}"
+    # Generous budget (in microseconds) to avoid flakiness on slow machines
+    assert times["nerfbaselines"] < 100_000, f"import nerfbaselines took {times['nerfbaselines'] / 1000:.1f}ms"
+
+
+@pytest.mark.parametrize("module", ["nerfbaselines.cli", "nerfbaselines.io"])
+def test_import_does_not_load_optional_dependencies(module):
+    times = _get_import_times(f"import {module}")
+    for dependency in ("requests", "PIL", "matplotlib"):
+        assert dependency not in times, f"import {module} should not import {dependency}"
+
+
+def test_lazy_attributes():
+    import nerfbaselines
+    from nerfbaselines import _types, _registry
+
+    assert nerfbaselines.Cameras is _types.Cameras
+    assert nerfbaselines.get_method_spec is _registry.get_method_spec
+    assert "new_cameras" in dir(nerfbaselines)
+    with pytest.raises(AttributeError):
+        nerfbaselines.this_attribute_does_not_exist  # type: ignore
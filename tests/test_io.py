@@ -47,3 +47,45 @@ def test_open_any_directory(tmp_path):
 
     with open_any(tmp_path / "data.zip/obj.tar.gz/test/test.zip/ok/pass.zip/data.txt", "r") as f:
         assert f.read() == b"Hello world2"
+
+
+def test_http_get_cached(tmp_path):
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from nerfbaselines.io import _http_get_cached
+
+    content = {"data": b'{"psnr": 1}', "etag": '"v1"'}
+    responses = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.headers.get("If-None-Match") == content["etag"]:
+                responses.append(304)
+                self.send_response(304)
+                self.end_headers()
+                return
+            responses.append(200)
+            self.send_response(200)
+            self.send_header("ETag", content["etag"])
+            self.send_header("Content-Length", str(len(content["data"])))
+            self.end_headers()
+            self.wfile.write(content["data"])
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/results.json"
+        assert _http_get_cached(url) == b'{"psnr": 1}'
+        assert _http_get_cached(url) == b'{"psnr": 1}'
+        assert responses == [200, 304]
+
+        # Changed file is downloaded again
+        content.update(data=b'{"psnr": 2}', etag='"v2"')
+        assert _http_get_cached(url) == b'{"psnr": 2}'
+        assert responses == [200, 304, 200]
+    finally:
+        server.shutdown()
+        server.server_close()
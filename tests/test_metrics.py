@@ -1,4 +1,5 @@
 import sys
+from unittest import mock
 from typing import cast
 import numpy as np
 import pytest
@@ -120,6 +121,51 @@ def test_psnr():
         np.testing.assert_allclose(val, val2, atol=1e-5, rtol=0)
 
 
+def test_mse_mae_uint8():
+    from nerfbaselines.utils import convert_image_dtype
+
+    np.random.seed(42)
+    for bs in [(3,), (2, 2), ()]:
+        a = np.random.randint(0, 256, size=(*bs, 47, 31, 4), dtype=np.uint8)[..., :3]
+        b = np.random.randint(0, 256, size=(*bs, 47, 31, 3), dtype=np.uint8)
+        mse, mae = metrics.mse_mae_uint8(a, b)
+        assert np.shape(mse) == bs and np.shape(mae) == bs
+        assert mse.dtype == np.float32 and mae.dtype == np.float32
+
+        # The values are exactly the same as for the float32 path
+        a_f, b_f = convert_image_dtype(a, np.float32), convert_image_dtype(b, np.float32)
+        np.testing.assert_array_equal(mse, metrics.mse(a_f, b_f))
+        np.testing.assert_array_equal(mae, metrics.mae(b_f, a_f))
+        np.testing.assert_allclose(mse, ((a.astype(np.float64) - b) ** 2).mean((-3, -2, -1)) / 255 ** 2, rtol=1e-5)
+
+        # Different shape raises error
+        with pytest.raises(Exception):
+            metrics.mse_mae_uint8(a, b[..., :-1, :])
+
+    # All pairs of values
+    a, b = np.meshgrid(np.arange(256, dtype=np.uint8), np.arange(256, dtype=np.uint8))
+    a, b = a.reshape(1, 256, 256, 1), b.reshape(1, 256, 256, 1)
+    a_f, b_f = convert_image_dtype(a, np.float32), convert_image_dtype(b, np.float32)
+    mse, mae = metrics.mse_mae_uint8(a, b)
+    np.testing.assert_array_equal(mse, metrics.mse(a_f, b_f))
+    np.testing.assert_array_equal(mae, metrics.mae(a_f, b_f))
+
+
+def test_compute_metrics_uint8():
+    from nerfbaselines.evaluation import compute_metrics
+    from nerfbaselines.utils import convert_image_dtype
+
+    np.random.seed(42)
+    a = np.random.randint(0, 256, size=(2, 64, 48, 3), dtype=np.uint8)
+    b = np.random.randint(0, 256, size=(2, 64, 48, 3), dtype=np.uint8)
+    with mock.patch.object(metrics, "lpips", lambda x, y: np.zeros(len(x), dtype=np.float32)):
+        out = compute_metrics(a, b, reduce=False)
+        out_f = compute_metrics(convert_image_dtype(a, np.float32), convert_image_dtype(b, np.float32), reduce=False)
+    assert out.keys() == out_f.keys()
+    for k in out:
+        np.testing.assert_array_equal(out[k], out_f[k])
+
+
 @pytest.mark.extras
 @pytest.mark.filterwarnings("ignore:The parameter 'pretrained' is deprecated since 0.13")
 @pytest.mark.filterwarnings("ignore:Importing `spectral_angle_mapper` from `torchmetrics.functional` was deprecated")
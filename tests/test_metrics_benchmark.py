@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+from nerfbaselines import metrics
+from nerfbaselines.utils import convert_image_dtype
+
+
+@pytest.mark.benchmark(group="mse-mae-uint8")
+@pytest.mark.parametrize("implementation", ["float32", "lookup"])
+def test_mse_mae_4k(benchmark, implementation):
+    rng = np.random.default_rng(42)
+    a = rng.integers(0, 256, size=(1, 2160, 3840, 3), dtype=np.uint8)
+    b = rng.integers(0, 256, size=(1, 2160, 3840, 3), dtype=np.uint8)
+
+    def float32_mse_mae(a, b):
+        a, b = convert_image_dtype(a, np.float32), convert_image_dtype(b, np.float32)
+        return metrics.mse(a, b), metrics.mae(a, b)
+
+    fn = metrics.mse_mae_uint8 if implementation == "lookup" else float32_mse_mae
+    benchmark.pedantic(fn, args=(a, b), rounds=3, iterations=1)
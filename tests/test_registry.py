@@ -1,3 +1,4 @@
+import json
 import pytest
 import os
 import sys
@@ -416,3 +417,76 @@ register({{
         assert "test3i" in registry.get_supported_methods()
         assert registry.get_method_spec("test3").get("metadata", {}).get("test") == 1
         assert registry.get_method_spec("test3i").get("metadata", {}).get("test") == 2
+
+
+def _registry_snapshot():
+    from nerfbaselines import _registry as registry
+    return [dict(x) for x in (
+        registry.methods_registry, 
+        registry.datasets_registry, 
+        registry.dataset_loaders_registry, 
+        registry.evaluation_protocols_registry,
+        registry.loggers_registry)]
+
+
+def test_registry_index_cache(tmp_path):
+    from nerfbaselines import _registry as registry
+
+    (tmp_path / "test1.py").write_text(f"""
+from nerfbaselines import register
+register({{
+    "id": "@@unique-nerf",
+    "method_class": "{_TestMethod.__module__}:{_TestMethod.__name__}",
+    "backends_order": ["python"],
+    "metadata": {{ "@@test": (1, 2) }},
+}})
+""")
+    index_path = tmp_path / "registry-index.json"
+    environ = dict(os.environ)
+    environ["NERFBASELINES_REGISTER"] = str(tmp_path/"test1.py")
+    environ["NERFBASELINES_REGISTRY_CACHE"] = str(index_path)
+    with mock.patch("os.environ", environ):
+        with _patch_registry():
+            registry._auto_register()
+            expected = _registry_snapshot()
+        assert index_path.exists()
+
+        # The index is used instead of executing the spec files
+        with _patch_registry(), \
+                mock.patch.object(registry, "_load_builtin_specs", side_effect=AssertionError("index not used")), \
+                mock.patch.object(registry, "_discover_specs", side_effect=AssertionError("index not used")):
+            registry._auto_register()
+            assert _registry_snapshot() == expected
+            assert registry.methods_registry["@@unique-nerf"].get("metadata", {}).get("@@test") == (1, 2)
+
+        # Changing the spec file invalidates the index
+        (tmp_path / "test1.py").write_text((tmp_path / "test1.py").read_text().replace("(1, 2)", "3"))
+        os.utime(tmp_path / "test1.py", ns=(0, 0))
+        with _patch_registry():
+            registry._auto_register()
+            assert registry.methods_registry["@@unique-nerf"].get("metadata", {}).get("@@test") == 3
+
+
+def test_registry_import_time_budget(tmp_path):
+    import subprocess
+
+    # Spec files are not executed (and datasets are not imported) when the registry index is valid
+    script = """
+import sys, time, json
+start = time.perf_counter()
+import nerfbaselines
+nerfbaselines.get_method_spec("gaussian-splatting")
+nerfbaselines.get_dataset_spec("blender")
+print(json.dumps({"time": time.perf_counter() - start, "datasets_imported": "nerfbaselines.datasets" in sys.modules}))
+"""
+    env = dict(os.environ)
+    env["NERFBASELINES_REGISTRY_CACHE"] = str(tmp_path / "registry-index.json")
+    env.pop("NERFBASELINES_REGISTER", None)
+    outputs = []
+    for _ in range(2):
+        out = subprocess.check_output([sys.executable, "-c", script], env=env)
+        outputs.append(json.loads(out.decode("utf8").strip().splitlines()[-1]))
+    cold, warm = outputs
+    assert not warm["datasets_imported"]
+    # Generous budget to avoid flakiness on slow machines
+    assert warm["time"] < 2.0, f"Registry with a warm index took {warm['time']:.3f}s (cold {cold['time']:.3f}s)"
@@ -502,3 +502,212 @@ def test_render_frames_mp4_multi_format_command(tmp_path):
     _test_render_trajectory_command(tmp_path, "{output}.mp4", "--output-names", ",".join(all_output_names))
     path = str(tmp_path/"{output}.mp4")
     _verify_mp4_multi_format(path, all_output_names, num_cams)
+
+
+class _IndexedFakeMethod(FakeMethod):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.num_renders = 0
+
+    def render(self, camera, options=None):
+        out = super().render(camera, options=options)
+        out = {k: np.full_like(v, (self.num_renders % 10) / 10) for k, v in out.items()}
+        self.num_renders += 1
+        return out
+
+
+@pytest.mark.parametrize("output", ["out.tar.gz", "out.zip", "out"])
+def test_render_frames_pipelined(tmp_path, output):
+    all_output_names = tuple(x if isinstance(x, str) else x["name"] for x in FakeMethod().get_info()["supported_outputs"])
+    num_frames = 7
+    evaluation.render_frames(_IndexedFakeMethod(), _mock_cameras(num_frames),
+                             output=tmp_path/("sequential-" + output),
+                             fps=1,
+                             output_names=all_output_names)
+    evaluation.render_frames(_IndexedFakeMethod(), _mock_cameras(num_frames),
+                             output=tmp_path/("pipelined-" + output),
+                             fps=1,
+                             output_names=all_output_names,
+                             num_workers=3,
+                             queue_size=2)
+
+    def _read_all(path):
+        out = {}
+        if output.endswith(".tar.gz"):
+            with tarfile.open(path) as tar:
+                for member in tar.getmembers():
+                    out[member.name] = _assert_not_none(tar.extractfile(member)).read()
+        elif output.endswith(".zip"):
+            with zipfile.ZipFile(path) as zip:
+                for name in zip.namelist():
+                    out[name] = zip.read(name)
+        else:
+            for root, _, files in os.walk(path):
+                for file in files:
+                    with open(os.path.join(root, file), "rb") as f:
+                        out[os.path.relpath(os.path.join(root, file), path)] = f.read()
+        return out
+
+    sequential = _read_all(tmp_path/("sequential-" + output))
+    pipelined = _read_all(tmp_path/("pipelined-" + output))
+    assert len(sequential) == num_frames * len(all_output_names)
+    assert sequential == pipelined
+
+
+def test_render_frames_pipelined_error(tmp_path):
+    method = FakeMethod()
+
+    def _fail(*args, **kwargs):
+        raise RuntimeError("test error")
+
+    with mock.patch.object(evaluation, "_encode_png", _fail), pytest.raises(RuntimeError, match="test error"):
+        evaluation.render_frames(method, _mock_cameras(5),
+                                 output=tmp_path/"out.tar.gz",
+                                 fps=1,
+                                 output_names=("color",),
+                                 num_workers=2)
+
+
+@pytest.mark.parametrize("output", ["out.zip", "out"])
+def test_render_frames_sharded_resume_merge(tmp_path, output):
+    all_output_names = ("color", "depth")
+    num_frames = 6
+    cameras = _mock_cameras(num_frames)
+    evaluation.render_frames(_IndexedFakeMethod(), cameras,
+                             output=tmp_path/("full-" + output),
+                             fps=1,
+                             output_names=all_output_names)
+
+    # Render two shards, the second one is interrupted and resumed
+    evaluation.render_frames(_IndexedFakeMethod(), cameras,
+                             output=tmp_path/("shard1-" + output),
+                             fps=1,
+                             output_names=all_output_names,
+                             frames=range(0, 3))
+    method = _IndexedFakeMethod()
+    method.num_renders = 3
+    evaluation.render_frames(method, cameras,
+                             output=tmp_path/("shard2-" + output),
+                             fps=1,
+                             output_names=all_output_names,
+                             frames=[3])
+    method = _IndexedFakeMethod()
+    method.num_renders = 4
+    evaluation.render_frames(method, cameras,
+                             output=tmp_path/("shard2-" + output),
+                             fps=1,
+                             output_names=all_output_names,
+                             frames=range(3, 6),
+                             resume=True)
+    assert method.num_renders == 6
+    frames = evaluation._list_frames(str(tmp_path/("shard2-" + output)))
+    assert set(frames.keys()) == set(all_output_names)
+    assert set(frames["color"].keys()) == {3, 4, 5}
+
+    # Missing frames are reported
+    with pytest.raises(ValueError, match="Missing"):
+        evaluation.merge_frames([tmp_path/("shard2-" + output)], tmp_path/"merged-fail", fps=1)
+
+    evaluation.merge_frames([tmp_path/("shard1-" + output), tmp_path/("shard2-" + output)], tmp_path/"merged", fps=1)
+    for name in all_output_names:
+        for i in range(num_frames):
+            merged = np.array(Image.open(tmp_path/"merged"/name/f"{i:05d}.png"))
+            if output.endswith(".zip"):
+                with zipfile.ZipFile(tmp_path/("full-" + output)) as zip, zip.open(f"{name}/{i:05d}.png") as f:
+                    full = np.array(Image.open(f))
+            else:
+                full = np.array(Image.open(tmp_path/("full-" + output)/name/f"{i:05d}.png"))
+            np.testing.assert_array_equal(merged, full)
+
+
+def test_render_frames_resume_killed_zip(tmp_path):
+    all_output_names = ("color", "depth")
+    cameras = _mock_cameras(6)
+    evaluation.render_frames(_IndexedFakeMethod(), cameras,
+                             output=tmp_path/"full.zip",
+                             fps=1,
+                             output_names=all_output_names)
+
+    # Simulate a killed process: the central directory is missing and the last entry is incomplete
+    with zipfile.ZipFile(tmp_path/"full.zip") as zip:
+        last = zip.infolist()[-1]
+        assert last.filename == "depth/00005.png"
+        full = {name: zip.read(name) for name in zip.namelist()}
+    with open(tmp_path/"full.zip", "rb") as f:
+        data = f.read()
+    with open(tmp_path/"out.zip", "wb") as f:
+        f.write(data[:last.header_offset + 40])
+    assert not zipfile.is_zipfile(tmp_path/"out.zip")
+
+    method = _IndexedFakeMethod()
+    method.num_renders = 5
+    evaluation.render_frames(method, cameras,
+                             output=tmp_path/"out.zip",
+                             fps=1,
+                             output_names=all_output_names,
+                             resume=True)
+    # Only the last frame is rendered again and the existing color image is not duplicated
+    assert method.num_renders == 6
+    with zipfile.ZipFile(tmp_path/"out.zip") as zip:
+        names = zip.namelist()
+        assert len(names) == len(set(names))
+        assert {name: zip.read(name) for name in names} == full
+
+
+def test_recover_zip(tmp_path):
+    rng = np.random.default_rng(42)
+    contents = {
+        "stored.bin": rng.bytes(3000),
+        "deflated.bin": bytes(5000) + rng.bytes(3000),
+        "truncated.bin": rng.bytes(3000),
+    }
+    with zipfile.ZipFile(tmp_path/"full.zip", "w") as zip:
+        zip.writestr("stored.bin", contents["stored.bin"], compress_type=zipfile.ZIP_STORED)
+        zip.writestr("deflated.bin", contents["deflated.bin"], compress_type=zipfile.ZIP_DEFLATED)
+        zip.writestr("truncated.bin", contents["truncated.bin"], compress_type=zipfile.ZIP_DEFLATED)
+        last = zip.infolist()[-1]
+    with open(tmp_path/"full.zip", "rb") as f:
+        data = f.read()
+    with open(tmp_path/"out.zip", "wb") as f:
+        f.write(data[:last.header_offset + 100])
+
+    # Read the entries in small chunks to exercise the streaming
+    with mock.patch.object(evaluation._iter_zip_entry_content, "__defaults__", (512,)):
+        assert evaluation._recover_zip(str(tmp_path/"out.zip")) == 2
+    with zipfile.ZipFile(tmp_path/"out.zip") as zip:
+        assert zip.namelist() == ["stored.bin", "deflated.bin"]
+        assert zip.getinfo("deflated.bin").compress_type == zipfile.ZIP_DEFLATED
+        assert zip.read("stored.bin") == contents["stored.bin"]
+        assert zip.read("deflated.bin") == contents["deflated.bin"]
+
+
+def test_merge_frames_num_frames(tmp_path):
+    evaluation.render_frames(_IndexedFakeMethod(), _mock_cameras(3), output=tmp_path/"shard", fps=1)
+    evaluation.merge_frames([tmp_path/"shard"], tmp_path/"merged", fps=1)
+    assert len(os.listdir(tmp_path/"merged")) == 3
+
+    # The missing tail frames are reported when the number of frames is known
+    with pytest.raises(ValueError, match="Missing 2 frames"):
+        evaluation.merge_frames([tmp_path/"shard"], tmp_path/"merged-fail", fps=1, num_frames=5)
+
+
+def test_parse_frames():
+    from nerfbaselines.cli._render import _parse_frames
+
+    assert _parse_frames("1:3", 5) == [1, 2]
+    assert _parse_frames("3:", 5) == [3, 4]
+    assert _parse_frames(":2", 5) == [0, 1]
+    for frames in ("5", "a:b", "1:2:3", "-1:", "3:2", "0:6", ""):
+        with pytest.raises(ValueError, match="Invalid frame range"):
+            _parse_frames(frames, 5)
+
+
+def test_render_frames_resume_targz_unsupported(tmp_path):
+    evaluation.render_frames(FakeMethod(), _mock_cameras(2), output=tmp_path/"out.tar.gz", fps=1)
+    with pytest.raises(ValueError, match="Cannot append"):
+        evaluation.render_frames(FakeMethod(), _mock_cameras(2), output=tmp_path/"out.tar.gz", fps=1, resume=True)
+
+
+def test_render_trajectory_frames_command(tmp_path):
+    _test_render_trajectory_command(tmp_path, "out", "--frames", "1:")
+    assert sorted(os.listdir(tmp_path/"out")) == [f"{i:05d}.png" for i in range(1, num_cams)]
@@ -89,6 +89,25 @@ def test_get_method_info_from_spec(method):
     assert method_info["method_id"] == method
 
 
+def test_get_method_info_from_spec_fresh_process():
+    # Other tests may have already imported the real dependencies, therefore,
+    # we get the method info in a fresh interpreter.
+    import subprocess
+
+    code = (
+        "import json\n"
+        "from nerfbaselines import get_supported_methods, get_method_spec\n"
+        "from nerfbaselines.results import get_method_info_from_spec\n"
+        "out = {}\n"
+        "for method in get_supported_methods():\n"
+        "    out[method] = get_method_info_from_spec(get_method_spec(method))['method_id']\n"
+        "print(json.dumps(out))\n"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], text=True)
+    method_ids = json.loads(output.splitlines()[-1])
+    assert method_ids == {method: method for method in get_supported_methods()}
+
+
 @pytest.mark.parametrize("dataset", get_supported_datasets())
 def test_compile_dataset_results(tmp_path, dataset):
     from nerfbaselines.results import compile_dataset_results
@@ -223,3 +242,16 @@ def test_render_markdown_dataset_results_table(dataset_results):
     assert len(lines) == 4
     for line in lines:
         assert len(line) == len(lines[0])
+
+
+def test_get_method_info_from_spec_memoized():
+    from nerfbaselines import get_method_spec
+    from nerfbaselines import results
+
+    spec = get_method_spec(next(iter(get_supported_methods())))
+    results._method_info_cache.clear()
+    with mock.patch.object(results, "_get_method_info_from_spec", wraps=results._get_method_info_from_spec) as build:
+        info1 = results.get_method_info_from_spec(spec)
+        info2 = results.get_method_info_from_spec(spec)
+    assert build.call_count == 1
+    assert info1 == info2 and info1 is not info2
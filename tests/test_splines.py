@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+
+def _random_quaternions(rng, n):
+    q = rng.normal(size=(n, 4))
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
+
+
+@pytest.mark.parametrize("num_vertices", [2, 3, 6])
+@pytest.mark.parametrize("closed", [False, True])
+@pytest.mark.parametrize("tension", [0.0, 0.5, -0.3])
+def test_kochanek_bartels_spline(num_vertices, closed, tension):
+    splines = pytest.importorskip("splines")
+    import splines.quaternion
+    from nerfbaselines._splines import KochanekBartelsSpline
+
+    rng = np.random.default_rng(42)
+    vertices = rng.normal(size=(num_vertices, 5))
+    quaternions = _random_quaternions(rng, num_vertices)
+    num_segments = num_vertices if closed else num_vertices - 1
+    t = np.linspace(0, num_segments, 101)
+    endconditions = "closed" if closed else "natural"
+
+    reference = splines.KochanekBartels(list(vertices), tcb=(tension, 0, 0), endconditions=endconditions).evaluate(t)
+    spline = KochanekBartelsSpline(vertices, tcb=(tension, 0, 0), closed=closed)
+    np.testing.assert_allclose(spline.evaluate(t), reference, atol=1e-10)
+
+    reference_rotations = splines.quaternion.KochanekBartels(
+        [splines.quaternion.UnitQuaternion.from_unit_xyzw(np.roll(q, -1)) for q in quaternions],
+        tcb=(tension, 0, 0), endconditions=endconditions).evaluate(t)
+    reference = np.array([[q.scalar, *q.vector] for q in reference_rotations])
+    spline = KochanekBartelsSpline(quaternions, tcb=(tension, 0, 0), closed=closed, rotation=True)
+    np.testing.assert_allclose(spline.evaluate(t), reference, atol=1e-10)
+
+
+@pytest.mark.parametrize("is_cycle", [False, True])
+def test_kochanek_bartels_camera_path_incremental(is_cycle):
+    from nerfbaselines._splines import KochanekBartelsCameraPath, interpolate_kochanek_bartels_camera_path
+
+    rng = np.random.default_rng(42)
+    positions = rng.normal(size=(8, 3))
+    wxyz = _random_quaternions(rng, 8)
+    fovs = rng.uniform(30, 70, size=(8,))
+    durations = rng.uniform(0.5, 2.0, size=(8,))
+
+    path = KochanekBartelsCameraPath()
+    out = path(positions, wxyz, fovs, durations, tension=0.2, is_cycle=is_cycle)
+    assert out is not None
+    assert out[3].shape == (len(out[0]), 8)
+
+    # Move a single keyframe
+    positions[3] += 1.0
+    wxyz[5] = _random_quaternions(rng, 1)[0]
+    incremental = path(positions, wxyz, fovs, durations, tension=0.2, is_cycle=is_cycle)
+    full = interpolate_kochanek_bartels_camera_path(positions, wxyz, fovs, durations, tension=0.2, is_cycle=is_cycle)
+    assert incremental is not None and full is not None
+    for a, b, c in zip(out, incremental, full):
+        np.testing.assert_array_equal(b, c)
+    # Only part of the path was changed
+    assert 0 < np.sum(np.any(out[0] != incremental[0], -1)) < len(out[0])
+
+
+def test_rotation_matrix_to_quaternion():
+    from nerfbaselines._splines import rotation_matrix_to_quaternion, quaternion_to_rotation_matrix
+    from nerfbaselines.datasets._colmap_utils import rotmat2qvec
+
+    rng = np.random.default_rng(42)
+    R = quaternion_to_rotation_matrix(_random_quaternions(rng, 10))
+    np.testing.assert_allclose(rotation_matrix_to_quaternion(R), np.stack([rotmat2qvec(x) for x in R]), atol=1e-6)
+    np.testing.assert_allclose(quaternion_to_rotation_matrix(rotation_matrix_to_quaternion(R)), R, atol=1e-6)
+
+
+def test_trajectory_get_cameras_from_keyframes():
+    from nerfbaselines.evaluation import trajectory_get_cameras
+    from nerfbaselines._splines import quaternion_to_rotation_matrix
+
+    rng = np.random.default_rng(42)
+    poses = np.concatenate([quaternion_to_rotation_matrix(_random_quaternions(rng, 3)), rng.normal(size=(3, 3, 1))], -1)
+    trajectory = {
+        "camera_model": "pinhole",
+        "image_size": (64, 48),
+        "fps": 10.0,
+        "frames": [],
+        "source": {
+            "type": "interpolation",
+            "interpolation": "kochanek-bartels",
+            "is_cycle": False,
+            "tension": 0.0,
+            "keyframes": [{"pose": pose, "fov": 60.0} for pose in poses],
+            "default_fov": 60.0,
+            "default_transition_duration": 1.0,
+        },
+    }
+    cameras = trajectory_get_cameras(trajectory)  # type: ignore
+    assert len(cameras) == 20
+    np.testing.assert_allclose(cameras.poses[0], poses[0], atol=1e-5)
+    np.testing.assert_allclose(cameras.poses[-1], poses[-1], atol=1e-5)
+    np.testing.assert_allclose(cameras.intrinsics[0, 0], 24 / np.tan(np.pi / 6), rtol=1e-5)
@@ -288,13 +288,15 @@ def test_train_command_extras(tmp_path):
         registry.pop("_test", None)
 
 
-def test_train_command_undistort(tmp_path, wandb_init_run, mock_extras):
+@pytest.mark.parametrize("lazy_images", [False, True])
+def test_train_command_undistort(tmp_path, wandb_init_run, mock_extras, lazy_images):
     del mock_extras, wandb_init_run
     metrics._LPIPS_CACHE.clear()
     metrics._LPIPS_GPU_AVAILABLE = None
     sys.modules.pop("nerfbaselines._metrics_lpips", None)
     from nerfbaselines.cli._train import train_command
     from nerfbaselines import MethodSpec
+    from nerfbaselines.datasets import LazyImages
     from nerfbaselines._registry import methods_registry as registry
 
     assert train_command.callback is not None
@@ -311,6 +313,7 @@ def test_train_command_undistort(tmp_path, wandb_init_run, mock_extras):
             nonlocal setup_data_was_called
             setup_data_was_called = True
             assert all(train_dataset["cameras"].camera_models == 0)
+            assert isinstance(train_dataset["images"], LazyImages) == lazy_images
             super().__init__(*args, train_dataset=train_dataset, **kwargs)
 
         def render(self, camera, *args, **kwargs):
@@ -339,7 +342,8 @@ def test_train_command_undistort(tmp_path, wandb_init_run, mock_extras):
         # train_command.callback(method, checkpoint, data, output, no_wandb, backend, eval_single_iters, eval_all_iters)
         make_dataset(tmp_path / "data", num_images=10)
         (tmp_path / "output").mkdir()
-        train_command.callback("_test", None, str(tmp_path / "data"), str(tmp_path / "output"), "python", Indices.every_iters(9), Indices([1]), Indices([]), logger="none")
+        train_command.callback("_test", None, str(tmp_path / "data"), str(tmp_path / "output"), "python", Indices.every_iters(9), Indices([1]), Indices([]), logger="none", lazy_images=lazy_images)
+        assert setup_data_was_called
         assert render_was_called
     finally:
         os.chdir(cwd)
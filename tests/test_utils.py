@@ -1,5 +1,7 @@
+import os
 from unittest import mock
 import pytest
+import numpy as np
 from time import sleep, perf_counter
 from nerfbaselines.utils import Indices
 from nerfbaselines.utils import CancellationToken, CancelledException
@@ -78,6 +80,86 @@ def test_get_resources_utilization_info():
     assert isinstance(info, dict)
 
 
+def _make_fake_procfs(path, processes, *, children_files=False):
+    for pid, (ppid, rss, hwm) in processes.items():
+        (path / str(pid) / "task" / str(pid)).mkdir(parents=True)
+        (path / str(pid) / "stat").write_text(f"{pid} (python (x) y) S {ppid} 1 1 0 -1\n")
+        (path / str(pid) / "status").write_text(f"Name:\tpython\nVmHWM:\t{hwm} kB\nVmRSS:\t{rss} kB\nThreads:\t1\n")
+        if children_files:
+            children = " ".join(str(c) for c, (p, *_) in processes.items() if p == pid)
+            (path / str(pid) / "task" / str(pid) / "children").write_text(children)
+
+
+@pytest.mark.parametrize("children_files", [False, True])
+def test_resources_utilization_sampler_procfs(tmp_path, children_files):
+    from nerfbaselines.training import ResourcesUtilizationSampler
+
+    # pid: (ppid, VmRSS, VmHWM)
+    _make_fake_procfs(tmp_path, {
+        100: (1, 2048, 8192),
+        101: (100, 1024, 1024),
+        102: (101, 1025, 1025),
+        200: (1, 4096, 4096),
+    }, children_files=children_files)
+    sampler = ResourcesUtilizationSampler(100, proc=str(tmp_path), gpu=False)
+    current = sampler.sample()
+    assert current == {"memory": 5}
+    # The peak RSS reported by the kernel is included
+    assert sampler.get_info() == {"memory": 8}
+
+    (tmp_path / "100" / "status").write_text("VmHWM:\t8192 kB\nVmRSS:\t20480 kB\n")
+    assert sampler.sample()["memory"] == 23
+    (tmp_path / "100" / "status").write_text("VmHWM:\t8192 kB\nVmRSS:\t1024 kB\n")
+    assert sampler.sample()["memory"] == 4
+    assert sampler.get_info() == {"memory": 23}
+    assert [x[1] for x in sampler.samples] == [5, 23, 4]
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="procfs is not available")
+def test_resources_utilization_sampler():
+    from nerfbaselines.training import ResourcesUtilizationSampler
+
+    with ResourcesUtilizationSampler(interval=0.01, gpu=False) as sampler:
+        start = perf_counter()
+        while len(sampler.samples) < 3 and perf_counter() - start < 10:
+            sleep(0.01)
+        assert len(sampler.samples) >= 3
+        assert sampler.get_info()["memory"] > 0
+        memory = sampler.sample()["memory"]
+
+        # Short-lived allocations are not missed between the samples
+        data = np.ones((256, 1024, 1024), dtype=np.uint8)
+        del data
+    assert sampler.get_info()["memory"] >= memory + 200
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="procfs is not available")
+def test_resources_utilization_sampler_nvidia_smi_interval():
+    from nerfbaselines import training
+    from nerfbaselines.training import ResourcesUtilizationSampler
+
+    with mock.patch.object(training, "_NvmlGpuReader", side_effect=ImportError("pynvml")), \
+            mock.patch.object(training.shutil, "which", return_value="/usr/bin/nvidia-smi"), \
+            mock.patch.object(training, "_get_gpu_utilization_nvidia_smi", return_value=(100, {"GPU": 1})) as nvidia_smi:
+        sampler = ResourcesUtilizationSampler(interval=100, gpu=True)
+        sampler.start()
+        for _ in range(5):
+            assert sampler.sample()["gpu_memory"] == 100
+        # Without NVML, nvidia-smi is not spawned for every sample
+        assert nvidia_smi.call_count == 1
+
+        nvidia_smi.return_value = (200, {"GPU": 1})
+        sampler.stop()
+        assert nvidia_smi.call_count == 2
+        assert sampler.get_info()["gpu_memory"] == 200
+
+        with mock.patch.dict(os.environ, {"NERFBASELINES_NVIDIA_SMI_SAMPLING_INTERVAL": "0"}):
+            sampler = ResourcesUtilizationSampler(interval=100, gpu=True)
+            for _ in range(3):
+                sampler.sample()
+        assert nvidia_smi.call_count == 5
+
+
 def test_tuple_click_type():
     import click
     from nerfbaselines.cli._common import TupleClickType
@@ -108,3 +190,159 @@ def test_tuple_click_type():
             assert val == ("1","2")
         cmd()
     assert excinfo.value.code == 0
+
+
+def _rotate_spherical_harmonics_reference(R, y):
+    import math
+    import numpy as np
+    from nerfbaselines.utils import _wigner_D_matrix
+
+    D = _wigner_D_matrix(R, int(math.sqrt(y.shape[-1])) - 1)
+    output = np.zeros_like(y)
+    for ell in range(int(math.sqrt(y.shape[-1]))):
+        ls = 2 * ell + 1
+        offset = ((2 * ell - 1) * ell * (4 * ell + 2)) // 6
+        d_part = D[offset:offset + ls**2].reshape(ls, ls).T
+        output[..., ell**2:ell**2 + ls] = np.matmul(d_part, y[..., ell**2:ell**2 + ls, None])[..., 0].real
+    return output
+
+
+@pytest.mark.parametrize("degree", [0, 1, 3])
+def test_rotate_spherical_harmonics(degree):
+    import numpy as np
+    from nerfbaselines import utils
+    from nerfbaselines.utils import rotate_spherical_harmonics, quaternion_to_rotation_matrix
+
+    rng = np.random.default_rng(42)
+    q = rng.normal(size=(2, 4))
+    R = quaternion_to_rotation_matrix(q / np.linalg.norm(q, axis=-1, keepdims=True))
+    y = rng.normal(size=(100, 3, (degree + 1) ** 2))
+    expected = _rotate_spherical_harmonics_reference(R[0], y)
+    np.testing.assert_allclose(rotate_spherical_harmonics(R[0], y, chunk_size=7), expected, atol=1e-10)
+    out = rotate_spherical_harmonics(R[0], y.astype(np.float32))
+    assert out.dtype == np.float32
+    np.testing.assert_allclose(out, expected, atol=1e-4)
+
+    # The rotation matrix is cached
+    with mock.patch.object(utils, "_wigner_D_matrix", side_effect=AssertionError):
+        np.testing.assert_allclose(rotate_spherical_harmonics(R[0], y), expected, atol=1e-10)
+
+    # Batched rotations
+    out = rotate_spherical_harmonics(R[:, None], y[:2])
+    np.testing.assert_allclose(out[1], _rotate_spherical_harmonics_reference(R[1], y[1]), atol=1e-10)
+
+
+def _image_to_srgb_reference(tensor, dtype, color_space=None, allow_alpha=False, background_color=None):
+    from nerfbaselines.utils import _convert_image_dtype_reference, _linear_to_srgb
+
+    if color_space is None:
+        color_space = "srgb"
+    if tensor.shape[-1] == 4 and not allow_alpha:
+        if tensor.dtype == np.uint8:
+            tensor = _convert_image_dtype_reference(tensor, np.float32)
+        alpha = tensor[..., -1:]
+        tensor = tensor[..., :3] * tensor[..., -1:]
+        if background_color is not None:
+            tensor += (1 - alpha) * _convert_image_dtype_reference(background_color, np.float32)
+    if color_space == "linear":
+        tensor = _convert_image_dtype_reference(tensor, np.float32)
+        tensor = _linear_to_srgb(tensor)
+    tensor = _convert_image_dtype_reference(tensor, np.uint8)
+    return _convert_image_dtype_reference(tensor, dtype)
+
+
+@pytest.mark.filterwarnings("ignore:invalid value encountered in power")
+@pytest.mark.parametrize("input_dtype", ["uint8", "float16", "float32", "float64"])
+@pytest.mark.parametrize("channels", [3, 4])
+@pytest.mark.parametrize("color_space", ["srgb", "linear"])
+@pytest.mark.parametrize("background_color", [None, [0.3, 0.5, 1.0], [10, 200, 255]])
+def test_image_to_srgb(input_dtype, channels, color_space, background_color):
+    from nerfbaselines.utils import image_to_srgb
+
+    rng = np.random.default_rng(42)
+    if input_dtype == "uint8":
+        # All (color, alpha) combinations
+        values = np.stack(np.meshgrid(np.arange(256), np.arange(256), indexing="ij"), -1).astype(np.uint8)
+        tensor = np.concatenate([values[..., :1]] * (channels - 1) + [values[..., 1:]], -1)
+    else:
+        tensor = rng.uniform(-0.1, 1.1, size=(64, 80, channels)).astype(input_dtype)
+    if background_color is not None:
+        background_color = np.array(background_color, dtype=np.uint8 if isinstance(background_color[0], int) else np.float32)
+
+    for dtype in (np.uint8, np.float32, np.float64):
+        for allow_alpha in (False, True):
+            expected = _image_to_srgb_reference(tensor.copy(), dtype, color_space, allow_alpha, background_color)
+            output = image_to_srgb(tensor.copy(), dtype, color_space, allow_alpha, background_color)
+            assert output.dtype == expected.dtype
+            assert output.shape == expected.shape
+            np.testing.assert_array_equal(output, expected)
+
+
+@pytest.mark.parametrize("dtype", ["uint8", "float16", "float32", "float64"])
+def test_convert_image_dtype(dtype):
+    from nerfbaselines.utils import convert_image_dtype, _convert_image_dtype_reference
+
+    rng = np.random.default_rng(42)
+    images = [np.arange(256, dtype=np.uint8), rng.uniform(-0.1, 1.1, size=(64, 80, 3)).astype(np.float32)]
+    for image in images:
+        output = convert_image_dtype(image, dtype)
+        expected = _convert_image_dtype_reference(image, np.dtype(dtype))
+        assert output.dtype == expected.dtype
+        np.testing.assert_array_equal(output, expected)
+
+
+@pytest.mark.parametrize("pallete", ["viridis", "coolwarm"])
+def test_static_colormaps_match_matplotlib(pallete):
+    from nerfbaselines.utils import _build_colormap_lut
+    from nerfbaselines._colormaps import COLORMAPS
+
+    pytest.importorskip("matplotlib")
+    with mock.patch.dict(COLORMAPS, clear=True):
+        expected = _build_colormap_lut(pallete)
+    np.testing.assert_array_equal(_build_colormap_lut(pallete), expected)
+
+
+def _visualize_depth_reference(depth, expected_scale=None, near_far=None, pallete="viridis"):
+    from nerfbaselines.utils import _zipnerf_power_transformation, _get_colormap_lut
+
+    eps = np.finfo(np.float32).eps
+    if near_far is not None:
+        depth_squashed = (depth - near_far[0]) / (near_far[1] - near_far[0])
+    elif expected_scale is not None:
+        depth = depth / max(0.3 * expected_scale, eps)
+        depth_squashed = _zipnerf_power_transformation(depth, -1.5) / (5 / 3)
+    else:
+        depth_squashed = depth
+    depth_squashed = depth_squashed.clip(0, 1)
+    pallete_array = _get_colormap_lut(pallete).astype(np.float32) / 255
+    array_long = (depth_squashed * 255).astype(np.int32).clip(0, 255)
+    return np.round(pallete_array[array_long] * 255).astype(np.uint8)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"expected_scale": 3.0}, {"near_far": np.array([0.5, 8.0])}, {"pallete": "coolwarm"}])
+def test_visualize_depth(kwargs):
+    from nerfbaselines.utils import visualize_depth
+
+    depth = np.random.default_rng(42).uniform(0, 10, size=(40, 50)).astype(np.float32)
+    depth_copy = depth.copy()
+    output = visualize_depth(depth, **kwargs)
+    np.testing.assert_array_equal(depth, depth_copy)
+    assert output.shape == (40, 50, 3)
+    assert output.dtype == np.uint8
+    np.testing.assert_array_equal(output, _visualize_depth_reference(depth, **kwargs))
+
+
+def test_apply_colormap():
+    from nerfbaselines.utils import apply_colormap, _get_colormap_lut
+
+    array = np.linspace(-0.1, 1.1, 100, dtype=np.float32)
+    output = apply_colormap(array, pallete="coolwarm")
+    assert output.shape == (100, 3)
+    assert output.dtype == np.uint8
+    np.testing.assert_array_equal(output[0], _get_colormap_lut("coolwarm")[0])
+    np.testing.assert_array_equal(output[-1], _get_colormap_lut("coolwarm")[-1])
+    inverted = apply_colormap(array, pallete="coolwarm", invert=True)
+    np.testing.assert_array_equal(inverted[0], output[-1])
+    np.testing.assert_array_equal(inverted[-1], output[0])
+    # Palettes are cached
+    assert _get_colormap_lut("coolwarm") is _get_colormap_lut("coolwarm")
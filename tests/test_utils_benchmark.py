@@ -0,0 +1,47 @@
+import pytest
+import numpy as np
+from nerfbaselines.utils import rotate_spherical_harmonics, quaternion_to_rotation_matrix
+from .test_utils import _rotate_spherical_harmonics_reference
+
+
+@pytest.mark.benchmark(group="rotate-spherical-harmonics")
+@pytest.mark.parametrize("rotate", [
+    _rotate_spherical_harmonics_reference,
+    rotate_spherical_harmonics], ids=["per-degree", "batched"])
+def test_rotate_spherical_harmonics(benchmark, rotate):
+    # Scene with 3M Gaussians and SH degree 3
+    rng = np.random.default_rng(42)
+    q = rng.normal(size=(4,))
+    R = quaternion_to_rotation_matrix(q / np.linalg.norm(q))
+    y = rng.normal(size=(3_000_000, 3, 16)).astype(np.float32)
+    benchmark.pedantic(rotate, args=(R, y), rounds=3, iterations=1)
+
+
+@pytest.mark.benchmark(group="image-to-srgb")
+@pytest.mark.parametrize("implementation", ["reference", "fused"])
+@pytest.mark.parametrize("image_type", ["uint8-rgba", "float32-linear"])
+def test_image_to_srgb(benchmark, implementation, image_type):
+    from nerfbaselines.utils import image_to_srgb
+    from .test_utils import _image_to_srgb_reference
+
+    rng = np.random.default_rng(42)
+    background_color = np.array([1.0, 1.0, 1.0], dtype=np.float32)
+    if image_type == "uint8-rgba":
+        image = rng.integers(0, 256, size=(1080, 1920, 4), dtype=np.uint8)
+        color_space = "srgb"
+    else:
+        image = rng.uniform(0, 1, size=(1080, 1920, 3)).astype(np.float32)
+        color_space = "linear"
+    fn = image_to_srgb if implementation == "fused" else _image_to_srgb_reference
+    benchmark(fn, image, np.uint8, color_space=color_space, background_color=background_color)
+
+
+@pytest.mark.benchmark(group="visualize-depth")
+@pytest.mark.parametrize("implementation", ["reference", "fused"])
+def test_visualize_depth(benchmark, implementation):
+    from nerfbaselines.utils import visualize_depth
+    from .test_utils import _visualize_depth_reference
+
+    depth = np.random.default_rng(42).uniform(0, 10, size=(1080, 1920)).astype(np.float32)
+    fn = visualize_depth if implementation == "fused" else _visualize_depth_reference
+    benchmark(fn, depth, expected_scale=3.0)
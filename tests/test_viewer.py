@@ -0,0 +1,162 @@
+import numpy as np
+from unittest.mock import MagicMock
+from nerfbaselines import Method, new_cameras
+
+
+class FakeMethod(MagicMock):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs, spec=Method)
+        self.num_renders = 0
+
+    @staticmethod
+    def get_method_info():
+        return dict(
+            supported_camera_models=("pinhole",),
+            supported_outputs=("color", "depth", "accumulation"),
+        )
+
+    def get_info(self):
+        return self.get_method_info()
+
+    def render(self, camera, options=None):
+        del options
+        self.num_renders += 1
+        w, h = camera.item().image_sizes
+        return {
+            "color": np.full((h, w, 3), 0.5, dtype=np.float32),
+            "depth": np.ones((h, w), dtype=np.float32),
+            "accumulation": np.ones((h, w), dtype=np.float32),
+        }
+
+
+def _make_camera(w=20, h=10, offset=0.0):
+    poses = np.eye(4, dtype=np.float32)[None, :3, :4].copy()
+    poses[0, 0, 3] = offset
+    return new_cameras(
+        poses=poses,
+        intrinsics=np.array([[w, w, w / 2, h / 2]], dtype=np.float32),
+        camera_models=np.array([0], dtype=np.int32),
+        distortion_parameters=np.zeros((1, 8), dtype=np.float32),
+        image_sizes=np.array([[w, h]], dtype=np.int32),
+    )
+
+
+def test_viewer_renderer_cache():
+    from nerfbaselines.viewer._viser import ViewerRenderer
+
+    method = FakeMethod()
+    renderer = ViewerRenderer(method, cache_size=2)
+    camera = _make_camera()
+    out = renderer.render(camera, output_type="color", background_color=(0, 0, 0))
+    assert out.shape == (10, 20, 3)
+    assert method.num_renders == 1
+
+    # Switching outputs and splits re-uses the raw outputs
+    renderer.render(camera, output_type="depth", background_color=(0, 0, 0))
+    renderer.render(_make_camera(offset=1e-6), output_type="color", split_output_type="accumulation", background_color=(255, 0, 0))
+    assert method.num_renders == 1
+
+    # Different pose, resolution or embedding misses the cache
+    renderer.render(_make_camera(offset=1.0), output_type="color", background_color=(0, 0, 0))
+    renderer.render(camera, embedding=np.ones(3, dtype=np.float32), output_type="color", background_color=(0, 0, 0))
+    assert method.num_renders == 3
+
+    # LRU eviction
+    renderer.render(camera, output_type="color", background_color=(0, 0, 0))
+    assert method.num_renders == 4
+
+
+def test_viewer_renderer_progressive_refinement():
+    from nerfbaselines.viewer._viser import ViewerRenderer
+
+    method = FakeMethod()
+    renderer = ViewerRenderer(method)
+    full_camera = _make_camera(40, 20)
+    renderer.render(_make_camera(20, 10), output_type="color", background_color=(0, 0, 0))
+    renderer.add_refinement_task(full_camera)
+    assert not renderer.is_cached(full_camera)
+    assert renderer.refine()
+    assert renderer.is_cached(full_camera)
+    assert not renderer.refine()
+
+    num_renders = method.num_renders
+    renderer.render(full_camera, output_type="color", background_color=(0, 0, 0))
+    assert method.num_renders == num_renders
+
+
+def test_adaptive_resolution_controller():
+    from nerfbaselines.viewer._viser import AdaptiveResolutionController
+
+    controller = AdaptiveResolutionController(motion_latency=0.1, still_latency=None, hysteresis=0.2)
+    # Before measuring, a full frame is assumed to take one second
+    w, h = controller.get_resolution(400, 200, moving=True)
+    assert h < 200 and w == int(h * 2)
+    assert controller.get_resolution(400, 200, moving=False) == (400, 200)
+
+    # Fast method renders full resolution even in motion
+    controller.update(400 * 200 * 100, 1.0)
+    assert controller.get_resolution(400, 200, moving=True) == (400, 200)
+    assert controller.get_metrics()["rays_per_second"] == 400 * 200 * 100
+
+    # Slow method scales down
+    controller = AdaptiveResolutionController(motion_latency=0.1, still_latency=0.5, hysteresis=0.2, smoothing=1.0)
+    controller.update(400 * 200, 1.0)
+    w1, h1 = controller.get_resolution(400, 200, moving=True)
+    assert h1 < 100
+    w, h = controller.get_resolution(400, 200, moving=False)
+    assert h1 < h < 200
+    assert "still" in controller.format_metrics()
+
+    # Small changes in the measured speed do not change the resolution
+    controller.update(int(400 * 200 * 1.1), 1.0)
+    assert controller.get_resolution(400, 200, moving=True) == (w1, h1)
+    controller.update(400 * 200 * 4, 1.0)
+    assert controller.get_resolution(400, 200, moving=True)[1] > h1
+
+
+def test_viser_viewer_sends_refined_frame():
+    from types import SimpleNamespace
+    from nerfbaselines.viewer._viser import ViewerRenderer, ViserViewer, AdaptiveResolutionController
+
+    method = FakeMethod()
+    viewer = object.__new__(ViserViewer)
+    viewer.method = method
+    viewer.renderer = ViewerRenderer(method)
+    viewer.state = SimpleNamespace(background_color=(0, 0, 0), output_type="color", output_split=False)
+    viewer.resolution_slider = SimpleNamespace(value=400)
+    viewer._inv_transform = np.eye(4, dtype=np.float32)[:3, :4]
+    viewer._preview_camera = None
+    viewer._current_embedding = None
+    viewer._render_state = {}
+    viewer._pending_refinements = {}
+    # The method is slow, the still frames are rendered at a lower resolution
+    viewer._resolution_controller = controller = AdaptiveResolutionController(motion_latency=0.1, still_latency=0.5)
+    controller.update(400 * 200, 10.0)
+    controller.update = MagicMock()
+    client = MagicMock(client_id=0)
+    client.camera = SimpleNamespace(position=np.zeros(3), wxyz=np.array([1.0, 0, 0, 0]), fov=1.0, aspect=2.0)
+    viewer.server = MagicMock()
+    viewer.server.get_clients.return_value = {0: client}
+
+    def _sent_sizes():
+        return [call.args[0].shape[:2] for call in client.set_background_image.call_args_list]
+
+    # Render the preview and the still frame
+    viewer._update()
+    viewer._update()
+    assert all(h < 200 for h, _ in _sent_sizes())
+    num_sent = len(_sent_sizes())
+
+    # When idle, the full resolution frame is refined and sent to the client
+    viewer._update()
+    assert len(_sent_sizes()) == num_sent
+    viewer._update()
+    assert _sent_sizes()[-1] == (200, 400)
+
+    # The client does not render again until the camera moves
+    num_renders = method.num_renders
+    num_sent = len(_sent_sizes())
+    viewer._update()
+    viewer._update()
+    assert method.num_renders == num_renders
+    assert len(_sent_sizes()) == num_sent
@@ -0,0 +1,114 @@
+import os
+from unittest import mock
+import pytest
+
+
+def _make_input(tmp_path):
+    input_path = tmp_path / "input"
+    (input_path / "templates").mkdir(parents=True)
+    (input_path / "public").mkdir()
+    (input_path / "templates" / "_layout.html").write_text(
+        "<html>{{ base_path }}{% block content %}{% endblock %}</html>")
+    (input_path / "templates" / "[dataset].html").write_text(
+        '{% extends "_layout.html" %}{% block content %}{{ id }}: {{ value }}{% endblock %}')
+    (input_path / "templates" / "about.html").write_text(
+        '{% extends "_layout.html" %}{% block content %}about{% endblock %}')
+    (input_path / "public" / "styles.css").write_text("body {}")
+    return str(input_path)
+
+
+def _make_data(num_datasets, values=None):
+    values = values or {}
+    return {
+        "datasets": [{"id": f"d{i}", "value": values.get(i, i)} for i in range(num_datasets)],
+        "methods": [],
+    }
+
+
+def _list_pages(output):
+    return sorted(x for x in os.listdir(output) if x.endswith(".html"))
+
+
+def test_generate_pages_incremental(tmp_path):
+    pytest.importorskip("jinja2")
+    from nerfbaselines.web import _web
+
+    input_path = _make_input(tmp_path)
+    output = str(tmp_path / "output")
+    manifest = {}
+    _web._generate_pages(_make_data(3), input_path, output, {}, manifest=manifest)
+    assert _list_pages(output) == ["about.html", "d0.html", "d1.html", "d2.html"]
+    with open(os.path.join(output, "d1.html"), "r", encoding="utf8") as f:
+        assert f.read() == "<html>d1: 1</html>"
+
+    # Nothing changed, nothing is rendered
+    mtimes = {x: os.stat(os.path.join(output, x)).st_mtime_ns for x in _list_pages(output)}
+    with mock.patch.object(_web, "_render_page", wraps=_web._render_page) as render_page:
+        _web._generate_pages(_make_data(3), input_path, output, {}, manifest=manifest)
+    assert render_page.call_count == 0
+    assert mtimes == {x: os.stat(os.path.join(output, x)).st_mtime_ns for x in _list_pages(output)}
+
+    # Only the changed page is rendered
+    with mock.patch.object(_web, "_render_page", wraps=_web._render_page) as render_page:
+        _web._generate_pages(_make_data(3, {1: 42}), input_path, output, {}, manifest=manifest)
+    assert [os.path.basename(x.args[0]) for x in render_page.call_args_list] == ["d1.html"]
+    with open(os.path.join(output, "d1.html"), "r", encoding="utf8") as f:
+        assert f.read() == "<html>d1: 42</html>"
+
+    # Removed routes are removed from the output
+    _web._generate_pages(_make_data(2, {1: 42}), input_path, output, {}, manifest=manifest)
+    assert _list_pages(output) == ["about.html", "d0.html", "d1.html"]
+
+    # Changing the layout re-renders all pages
+    with open(os.path.join(input_path, "templates", "_layout.html"), "w", encoding="utf8") as f:
+        f.write("<body>{% block content %}{% endblock %}</body>")
+    with mock.patch.object(_web, "_render_page", wraps=_web._render_page) as render_page:
+        _web._generate_pages(_make_data(2, {1: 42}), input_path, output, {}, manifest=manifest)
+    assert render_page.call_count == 3
+
+
+def test_generate_pages_parallel(tmp_path):
+    pytest.importorskip("jinja2")
+    from nerfbaselines.web import _web
+
+    input_path = _make_input(tmp_path)
+    data = _make_data(5)
+    _web._generate_pages(data, input_path, str(tmp_path / "serial"), {"base_path": "web"})
+    with mock.patch.object(_web, "_PARALLEL_RENDER_MIN_ROUTES", 2):
+        _web._generate_pages(data, input_path, str(tmp_path / "parallel"), {"base_path": "web"})
+
+    assert _list_pages(tmp_path / "parallel") == _list_pages(tmp_path / "serial")
+    assert len(_list_pages(tmp_path / "parallel")) == 6
+    for fname in _list_pages(tmp_path / "serial"):
+        assert (tmp_path / "parallel" / fname).read_text() == (tmp_path / "serial" / fname).read_text()
+    assert (tmp_path / "parallel" / "d3.html").read_text() == "<html>/webd3: 3</html>"
+
+
+def test_copy_static_files(tmp_path):
+    from nerfbaselines.web import _web
+
+    input_path = _make_input(tmp_path)
+    source = os.path.join(input_path, "public", "styles.css")
+    output = str(tmp_path / "output")
+    _web._copy_static_files(input_path, output)
+    target = os.path.join(output, "styles.css")
+    assert not os.path.samefile(source, target)
+
+    # Unchanged files are not copied again
+    inode = os.stat(target).st_ino
+    _web._copy_static_files(input_path, output)
+    assert os.stat(target).st_ino == inode
+
+    # Writing to the output does not modify the package sources
+    with open(target, "w", encoding="utf8") as f:
+        f.write("modified")
+    with open(source, "r", encoding="utf8") as f:
+        assert f.read() == "body {}"
+
+    # Hard links from older builds are replaced with copies
+    os.remove(target)
+    os.link(source, target)
+    _web._copy_static_files(input_path, output)
+    assert not os.path.samefile(source, target)
+    with open(target, "r", encoding="utf8") as f:
+        assert f.read() == "body {}"